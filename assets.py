@@ -0,0 +1,222 @@
+import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
+
+
+class AssetManager:  # Определяет класс AssetManager, который управляет загрузкой изображений.
+    """
+    Класс AssetManager загружает каждое изображение с диска один раз и раздает общие поверхности.
+
+    Поверхности кэшируются по ключу (путь, размер, угол поворота, учет прозрачности), поэтому
+    пули, враги и башни одного типа используют одну и ту же поверхность.
+
+    Атрибуты:
+        settings (Settings): Настройки игры.
+        surfaces (dict): Кэш загруженных и преобразованных поверхностей.
+        hits (int): Количество запросов, обслуженных из кэша.
+        misses (int): Количество запросов, потребовавших загрузки или преобразования.
+        rotations (dict): Кэши повернутых изображений по ключу (путь, исходный угол).
+    """
+
+    def __init__(self, settings):  # Конструктор класса AssetManager.
+        """
+        Инициализация объекта AssetManager.
+
+        Args:
+            settings (Settings): Настройки игры.
+        """
+        self.settings = settings  # Сохраняет настройки игры.
+        self.surfaces = {}  # Инициализирует пустой кэш поверхностей.
+        self.hits = 0  # Инициализирует счетчик попаданий в кэш.
+        self.misses = 0  # Инициализирует счетчик промахов кэша.
+        self.rotations = {}  # Инициализирует словарь кэшей повернутых изображений.
+
+    def get_image(self, path, size=None, angle=0, alpha=True):  # Метод для получения изображения из кэша.
+        """
+        Возвращает общую поверхность для изображения с заданным преобразованием.
+
+        Args:
+            path (str): Путь к изображению.
+            size (tuple): Размер, до которого масштабируется изображение (None - без масштабирования).
+            angle (float): Угол поворота изображения в градусах.
+            alpha (bool): True - convert_alpha(), False - convert().
+
+        Returns:
+            pygame.Surface: Общая поверхность. Ее нельзя изменять на месте.
+        """
+        key = (path, size, angle, alpha)  # Формирует ключ кэша.
+        surface = self.surfaces.get(key)  # Ищет поверхность в кэше.
+        if surface is not None:  # Если поверхность уже есть в кэше.
+            self.hits += 1  # Увеличивает счетчик попаданий.
+            return surface  # Возвращает поверхность из кэша.
+
+        self.misses += 1  # Увеличивает счетчик промахов.
+        surface = self._load(path, alpha)  # Загружает исходное изображение.
+        if size is not None:  # Проверяет, нужно ли масштабирование.
+            surface = pygame.transform.scale(surface, size)  # Масштабирует изображение.
+        if angle:  # Проверяет, нужен ли поворот.
+            surface = pygame.transform.rotate(surface, angle)  # Поворачивает изображение.
+        self.surfaces[key] = surface  # Сохраняет поверхность в кэше.
+        return surface  # Возвращает поверхность.
+
+    def _load(self, path, alpha):  # Метод для загрузки исходного изображения с диска.
+        """
+        Загружает исходное изображение с диска, если оно еще не загружено.
+
+        Args:
+            path (str): Путь к изображению.
+            alpha (bool): True - convert_alpha(), False - convert().
+
+        Returns:
+            pygame.Surface: Исходная поверхность.
+        """
+        key = (path, None, 0, alpha)  # Формирует ключ исходного изображения.
+        surface = self.surfaces.get(key)  # Ищет исходное изображение в кэше.
+        if surface is None:  # Если исходное изображение еще не загружено.
+            surface = pygame.image.load(path)  # Загружает изображение с диска.
+            surface = surface.convert_alpha() if alpha else surface.convert()  # Конвертирует изображение.
+            self.surfaces[key] = surface  # Сохраняет исходное изображение в кэше.
+        return surface  # Возвращает исходное изображение.
+
+    def get_rotations(self, path, angle=0):  # Метод для получения кэша повернутых изображений.
+        """
+        Возвращает общий для всех башен одного типа кэш повернутых изображений.
+
+        Args:
+            path (str): Путь к изображению.
+            angle (float): Исходный угол поворота изображения в градусах.
+
+        Returns:
+            RotationCache: Кэш повернутых изображений.
+        """
+        key = (path, angle)  # Формирует ключ кэша.
+        rotations = self.rotations.get(key)  # Ищет кэш повернутых изображений.
+        if rotations is None:  # Если кэш еще не создан.
+            rotations = RotationCache(self.get_image(path, angle=angle),
+                                      self.settings.rotation_steps)  # Создает кэш повернутых изображений.
+            if self.settings.prebuild_rotations:  # Проверяет, нужно ли построить все повороты заранее.
+                rotations.prebuild()  # Строит все повороты.
+            self.rotations[key] = rotations  # Сохраняет кэш.
+        return rotations  # Возвращает кэш.
+
+    def preload(self):  # Метод для предварительной загрузки изображений из настроек.
+        """
+        Предварительно загружает изображения башен, врага и пули, указанные в настройках.
+        """
+        for path in self.settings.tower_sprites.values():  # Перебирает изображения башен.
+            self.get_image(path)  # Загружает изображение башни.
+        self.get_image(self.settings.enemy_sprite)  # Загружает изображение врага.
+        self.get_image(self.settings.bullet_sprite)  # Загружает изображение пули.
+
+    def stats(self):  # Метод для получения статистики кэша.
+        """
+        Возвращает статистику использования кэша.
+
+        Returns:
+            dict: Количество попаданий, промахов и поверхностей в кэше.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'surfaces': len(self.surfaces)}  # Возвращает статистику.
+
+    def rotation_stats(self):  # Метод для получения статистики кэшей поворотов.
+        """
+        Возвращает статистику всех кэшей повернутых изображений.
+
+        Returns:
+            dict: Статистика каждого кэша по ключу 'путь@угол' (у каждого кэша свой ключ).
+        """
+        return {f"{path}@{angle:g}": rotations.stats() for (path, angle), rotations in
+                self.rotations.items()}  # Возвращает статистику кэшей поворотов.
+
+
+class RotationCache:  # Определяет класс RotationCache, который хранит заранее повернутые изображения.
+    """
+    Класс RotationCache хранит изображение, повернутое на углы с заданным шагом.
+
+    Угол поворота округляется до ближайшего шага, поэтому поворот башни сводится к поиску в таблице.
+    Повороты строятся лениво при первом запросе или все сразу методом prebuild.
+
+    Атрибуты:
+        image (pygame.Surface): Исходное изображение.
+        steps (int): Количество шагов на полный оборот.
+        step_angle (float): Угол одного шага в градусах.
+        frames (list): Список повернутых изображений (None - еще не построено).
+        hits (int): Количество запросов, обслуженных из кэша.
+        misses (int): Количество построенных поворотов.
+    """
+
+    def __init__(self, image, steps=180):  # Конструктор класса RotationCache.
+        """
+        Инициализация объекта RotationCache.
+
+        Args:
+            image (pygame.Surface): Исходное изображение.
+            steps (int): Количество шагов на полный оборот (180 - шаг 2 градуса).
+        """
+        self.image = image  # Сохраняет исходное изображение.
+        self.steps = steps  # Сохраняет количество шагов.
+        self.step_angle = 360 / steps  # Вычисляет угол одного шага.
+        self.frames = [None] * steps  # Инициализирует список повернутых изображений.
+        self.hits = 0  # Инициализирует счетчик попаданий.
+        self.misses = 0  # Инициализирует счетчик промахов.
+
+    def get(self, angle):  # Метод для получения повернутого изображения.
+        """
+        Возвращает изображение, повернутое на угол, округленный до ближайшего шага.
+
+        Args:
+            angle (float): Угол поворота в градусах.
+
+        Returns:
+            pygame.Surface: Повернутое изображение.
+        """
+        index = round(angle / self.step_angle) % self.steps  # Вычисляет индекс шага.
+        frame = self.frames[index]  # Получает повернутое изображение.
+        if frame is None:  # Если поворот еще не построен.
+            self.misses += 1  # Увеличивает счетчик промахов.
+            frame = self._build(index)  # Строит поворот.
+        else:
+            self.hits += 1  # Увеличивает счетчик попаданий.
+        return frame  # Возвращает повернутое изображение.
+
+    def _build(self, index):  # Метод для построения одного поворота.
+        """
+        Строит и сохраняет изображение для заданного шага.
+
+        Args:
+            index (int): Индекс шага.
+
+        Returns:
+            pygame.Surface: Повернутое изображение.
+        """
+        frame = pygame.transform.rotate(self.image, index * self.step_angle)  # Поворачивает исходное изображение.
+        self.frames[index] = frame  # Сохраняет повернутое изображение.
+        return frame  # Возвращает повернутое изображение.
+
+    def prebuild(self):  # Метод для построения всех поворотов.
+        """
+        Строит все повороты заранее.
+        """
+        for index in range(self.steps):  # Перебирает все шаги.
+            if self.frames[index] is None:  # Если поворот еще не построен.
+                self._build(index)  # Строит поворот.
+
+    def memory_bytes(self):  # Метод для оценки занимаемой памяти.
+        """
+        Оценивает объем памяти, занимаемый построенными поворотами.
+
+        Returns:
+            int: Объем памяти в байтах.
+        """
+        return sum(frame.get_width() * frame.get_height() * frame.get_bytesize() for frame in self.frames if
+                   frame is not None)  # Суммирует размеры построенных поворотов.
+
+    def stats(self):  # Метод для получения статистики кэша.
+        """
+        Возвращает статистику кэша поворотов.
+
+        Returns:
+            dict: Количество попаданий, промахов, построенных поворотов, доля попаданий и объем памяти.
+        """
+        total = self.hits + self.misses  # Вычисляет общее количество запросов.
+        return {'hits': self.hits, 'misses': self.misses,
+                'frames': sum(frame is not None for frame in self.frames),
+                'hit_rate': self.hits / total if total else 0.0,
+                'memory_bytes': self.memory_bytes()}  # Возвращает статистику.
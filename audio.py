@@ -0,0 +1,116 @@
+import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
+
+
+class AudioManager:  # Определяет класс AudioManager, который управляет воспроизведением звуков.
+    """
+    Класс AudioManager декодирует звуки из настроек один раз и воспроизводит их на собственном наборе каналов.
+
+    Количество одновременно звучащих копий одного звука ограничено, а одинаковые запросы
+    в пределах одного тика объединяются в один. Если звук отключен, все методы ничего не делают.
+
+    Атрибуты:
+        enabled (bool): Флаг, указывающий, включен ли звук.
+        max_voices (int): Максимальное количество одновременно звучащих копий одного звука.
+        sounds (dict): Словарь декодированных звуков по имени.
+        channels (list): Список каналов микшера, принадлежащих менеджеру.
+        voices (dict): Словарь каналов, на которых сейчас звучит каждый звук.
+        triggered (set): Имена звуков, уже запущенных в текущем тике.
+        played (int): Количество воспроизведенных звуков.
+        dropped (int): Количество звуков, пропущенных из-за ограничения голосов.
+        coalesced (int): Количество звуков, объединенных с уже запущенными в этом тике.
+    """
+
+    SOUND_NAMES = ('shoot', 'enemy_spawn', 'upgrade', 'sell', 'enemy_hit')  # Имена звуков из настроек.
+
+    def __init__(self, settings, enabled=True, num_channels=16, max_voices=4):  # Конструктор класса AudioManager.
+        """
+        Инициализация объекта AudioManager.
+
+        Args:
+            settings (Settings): Настройки игры.
+            enabled (bool): Включен ли звук.
+            num_channels (int): Количество каналов микшера, принадлежащих менеджеру.
+            max_voices (int): Максимальное количество одновременно звучащих копий одного звука.
+        """
+        self.enabled = enabled and pygame.mixer.get_init() is not None  # Включает звук, только если микшер доступен.
+        self.max_voices = max_voices  # Сохраняет ограничение голосов на один звук.
+        self.sounds = {}  # Инициализирует словарь звуков.
+        self.channels = []  # Инициализирует список каналов.
+        self.voices = {}  # Инициализирует словарь звучащих каналов.
+        self.triggered = set()  # Инициализирует множество звуков текущего тика.
+        self.next_channel = 0  # Индекс канала, с которого начинается поиск свободного.
+        self.played = 0  # Инициализирует счетчик воспроизведенных звуков.
+        self.dropped = 0  # Инициализирует счетчик пропущенных звуков.
+        self.coalesced = 0  # Инициализирует счетчик объединенных звуков.
+
+        if not self.enabled:  # Если звук отключен.
+            return  # Не загружает звуки и не занимает каналы.
+
+        for name in self.SOUND_NAMES:  # Перебирает имена звуков.
+            self.sounds[name] = pygame.mixer.Sound(getattr(settings, f'{name}_sound'))  # Декодирует звук один раз.
+            self.voices[name] = []  # Инициализирует список каналов для звука.
+
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), num_channels))  # Выделяет нужное количество каналов.
+        pygame.mixer.set_reserved(num_channels)  # Резервирует каналы за менеджером.
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]  # Создает список собственных каналов.
+
+    def new_tick(self):  # Метод для начала нового тика.
+        """
+        Сбрасывает множество звуков, запущенных в текущем тике.
+        """
+        self.triggered.clear()  # Очищает множество звуков текущего тика.
+
+    def play(self, name):  # Метод для воспроизведения звука.
+        """
+        Воспроизводит звук с учетом ограничения голосов и объединения запросов в тике.
+
+        Args:
+            name (str): Имя звука ('shoot', 'enemy_spawn', 'upgrade', 'sell' или 'enemy_hit').
+        """
+        if not self.enabled:  # Проверяет, включен ли звук.
+            return  # Ничего не делает, если звук отключен.
+        if name in self.triggered:  # Проверяет, запускался ли звук в этом тике.
+            self.coalesced += 1  # Увеличивает счетчик объединенных звуков.
+            return  # Не запускает звук повторно.
+        self.triggered.add(name)  # Отмечает звук как запущенный в этом тике.
+
+        sound = self.sounds[name]  # Получает декодированный звук.
+        voices = [channel for channel in self.voices[name] if
+                  channel.get_sound() is sound]  # Оставляет только каналы, на которых звук еще звучит.
+        self.voices[name] = voices  # Сохраняет обновленный список каналов.
+        if len(voices) >= self.max_voices:  # Проверяет, достигнуто ли ограничение голосов.
+            self.dropped += 1  # Увеличивает счетчик пропущенных звуков.
+            return  # Не запускает звук.
+
+        channel = self._find_free_channel()  # Ищет свободный канал.
+        if channel is None:  # Если свободных каналов нет.
+            self.dropped += 1  # Увеличивает счетчик пропущенных звуков.
+            return  # Не запускает звук.
+        channel.play(sound)  # Воспроизводит звук на канале.
+        voices.append(channel)  # Добавляет канал в список звучащих.
+        self.played += 1  # Увеличивает счетчик воспроизведенных звуков.
+
+    def _find_free_channel(self):  # Метод для поиска свободного канала.
+        """
+        Находит свободный канал среди собственных каналов, начиная с последнего использованного.
+
+        Returns:
+            pygame.mixer.Channel: Свободный канал или None, если все каналы заняты.
+        """
+        count = len(self.channels)  # Получает количество каналов.
+        for offset in range(count):  # Перебирает каналы по кругу.
+            index = (self.next_channel + offset) % count  # Вычисляет индекс канала.
+            channel = self.channels[index]  # Получает канал.
+            if not channel.get_busy():  # Проверяет, свободен ли канал.
+                self.next_channel = (index + 1) % count  # Сдвигает начало следующего поиска.
+                return channel  # Возвращает свободный канал.
+        return None  # Возвращает None, если все каналы заняты.
+
+    def stats(self):  # Метод для получения статистики воспроизведения.
+        """
+        Возвращает статистику воспроизведения звуков.
+
+        Returns:
+            dict: Количество воспроизведенных, пропущенных и объединенных звуков.
+        """
+        return {'played': self.played, 'dropped': self.dropped, 'coalesced': self.coalesced}  # Возвращает статистику.
@@ -0,0 +1,369 @@
+import argparse  # Импортирует модуль argparse для разбора аргументов командной строки.
+import contextlib  # Импортирует модуль contextlib для перенаправления вывода.
+import io  # Импортирует модуль io для буфера вывода.
+import itertools  # Импортирует модуль itertools для бесконечного повтора волны.
+import json  # Импортирует модуль json для сохранения результатов.
+import multiprocessing  # Импортирует модуль multiprocessing для запуска сценариев в отдельных процессах.
+import random  # Импортирует модуль random для воспроизводимых случайных чисел.
+import sys  # Импортирует модуль sys для кода завершения.
+import time  # Импортирует модуль time для измерения времени.
+
+try:
+    import resource  # Импортирует модуль resource для измерения пиковой памяти (только Unix).
+except ImportError:  # Если модуль недоступен.
+    resource = None  # Пиковая память не будет измеряться.
+
+from audio import AudioManager  # Импортирует класс AudioManager из файла audio.py.
+from enemy import Enemy  # Импортирует класс Enemy из файла enemy.py.
+from headless import create_headless_game  # Импортирует функцию create_headless_game из файла headless.py.
+from targeting import numpy, parity_mismatches  # Импортирует проверку совпадения целей из файла targeting.py.
+from waves import WaveSource  # Импортирует класс WaveSource из файла waves.py.
+
+
+def spawn_synthetic_enemies(game, count, speed=0.5, health=10 ** 9):  # Функция для создания искусственных врагов.
+    """
+    Создает врагов, равномерно распределенных по первой половине текущего пути.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+        count (int): Количество врагов.
+        speed (float): Скорость врагов.
+        health (int): Здоровье врагов.
+    """
+    level = game.level  # Получает уровень.
+    path = level.current_path['path']  # Получает точки текущего пути.
+    for index in range(count):  # Создает врагов.
+        enemy = Enemy(path, speed=speed, health=health, image_path=game.settings.enemy_sprite, game=game)  # Создает врага.
+        place_on_path(enemy, 0.5 * index / count)  # Распределяет врагов по первой половине пути.
+        level.add_enemy(enemy)  # Добавляет врага на уровень.
+
+
+def place_on_path(enemy, fraction):  # Функция для перемещения врага на заданную долю пути.
+    """
+    Ставит врага на заданную долю длины его пути.
+
+    Args:
+        enemy (Enemy): Враг, еще не добавленный на уровень.
+        fraction (float): Доля длины пути от 0 до 1.
+    """
+    enemy.distance = enemy.track.total_length * fraction  # Устанавливает пройденное расстояние.
+    enemy.path_index = enemy.track.segment_at(enemy.distance)  # Находит отрезок пути врага.
+    enemy.position.update(enemy.track.position_at(enemy.distance, enemy.path_index))  # Устанавливает позицию врага.
+    enemy.rect.center = enemy.position  # Центрирует прямоугольник врага.
+
+
+def build_full_grid(game, tower_types=('basic', 'sniper')):  # Функция для застройки всех позиций башнями.
+    """
+    Размещает башни на всех позициях из Settings.tower_positions, чередуя типы.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+        tower_types (tuple): Чередуемые типы башен.
+    """
+    game.settings.starting_money = 10 ** 9  # Выдает достаточно денег для застройки.
+    for index, position in enumerate(game.settings.tower_positions):  # Перебирает позиции башен.
+        game.level.attempt_place_tower(position, tower_types[index % len(tower_types)])  # Размещает башню.
+
+
+def setup_wave10_full_grid(game, copies=20):  # Функция для подготовки сценария wave10_full_grid.
+    """
+    Волна 10 при полностью застроенной сетке башен.
+
+    Враги волны появляются сразу, а не с задержкой спавна, и в нескольких копиях, распределенных
+    по первой половине пути, иначе застроенная сетка уничтожает их по одному и уровень почти пуст.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+        copies (int): Количество копий состава волны.
+    """
+    build_full_grid(game)  # Застраивает все позиции башнями.
+    level = game.level  # Получает уровень.
+    for enemy in list(level.enemies):  # Перебирает врагов первой волны.
+        enemy.kill()  # Удаляет врага.
+    while level.wave_source.has_next():  # Пока есть следующие волны.
+        level.advance_wave()  # Переходит к следующей волне.
+    wave = [(enemy_type, count * copies) for enemy_type, count in level.wave]  # Умножает состав волны.
+    level.wave = wave  # Заменяет текущую волну умноженной.
+    level.wave_source = WaveSource(itertools.repeat(wave))  # Повторяет умноженную волну бесконечно.
+    level.spawn_delay = 0  # Спавнит следующие волны по врагу каждый шаг.
+    size = level.wave_size()  # Получает количество врагов волны.
+    path = level.current_path['path']  # Получает точки текущего пути.
+    for index in range(size):  # Создает всех врагов первой волны сразу.
+        enemy = level.enemy_pool.acquire(level.enemy_type_at(index), path)  # Получает врага из пула.
+        place_on_path(enemy, 0.5 * index / size)  # Распределяет врагов по первой половине пути.
+        level.add_enemy(enemy)  # Добавляет врага на уровень.
+    level.spawned_enemies = size  # Отмечает первую волну как полностью заспавненную.
+
+
+def setup_swarm_5000_path3(game):  # Функция для подготовки сценария swarm_5000_path3.
+    """
+    5000 искусственных врагов на пути 3 и застроенная сетка башен.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+    """
+    build_full_grid(game)  # Застраивает все позиции башнями.
+    spawn_synthetic_enemies(game, 5000)  # Создает 5000 врагов.
+
+
+def setup_sniper_spam(game):  # Функция для подготовки сценария sniper_spam.
+    """
+    Снайперские башни на всех позициях, стреляющие каждый шаг, по неуязвимым врагам.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+    """
+    build_full_grid(game, ('sniper',))  # Застраивает все позиции снайперскими башнями.
+    for tower in game.level.towers:  # Перебирает башни.
+        tower.rate_of_fire = 0  # Позволяет башне стрелять каждый шаг.
+    spawn_synthetic_enemies(game, 200)  # Создает 200 врагов.
+
+
+SCENARIOS = {  # Словарь сценариев: имя -> (номер пути, функция подготовки).
+    'wave10_full_grid': (1, setup_wave10_full_grid),
+    'swarm_5000_path3': (3, setup_swarm_5000_path3),
+    'sniper_spam': (1, setup_sniper_spam),
+}
+
+
+PARITY_INTERVAL = 60  # Количество шагов между проверками совпадения пакетного и скалярного выбора целей.
+
+
+def percentile(values, fraction):  # Функция для вычисления перцентиля.
+    """
+    Вычисляет перцентиль отсортированного списка.
+
+    Args:
+        values (list): Отсортированный список значений.
+        fraction (float): Доля от 0 до 1.
+
+    Returns:
+        float: Значение перцентиля.
+    """
+    if not values:  # Проверяет, есть ли значения.
+        return 0.0  # Возвращает 0.
+    return values[min(int(fraction * len(values)), len(values) - 1)]  # Возвращает перцентиль.
+
+
+def check_parity(game):  # Функция для сравнения пакетного и скалярного выбора целей.
+    """
+    Сравнивает цели пакетного выбора на NumPy с целями скалярного метода в текущем состоянии уровня.
+
+    Вызывается после продвижения часов и до шага, пока готовые к выстрелу башни еще не выстрелили.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+
+    Returns:
+        tuple: Количество несовпадений и количество сравненных башен (0, 0, если NumPy не установлен).
+    """
+    if numpy is None:  # Проверяет, доступен ли NumPy.
+        return 0, 0  # Пакетный выбор недоступен, сравнивать не с чем.
+    level = game.level  # Получает уровень.
+    current_time = game.sim_clock.get_ticks()  # Получает текущее время.
+    towers = list(level.towers)  # Фиксирует список башен.
+    enemies = list(level.enemies)  # Фиксирует список врагов.
+    level.enemy_index.rebuild(enemies)  # Перестраивает индекс по тем же врагам.
+    compared = sum(tower.targeting is not None and current_time - tower.last_shot_time > tower.rate_of_fire
+                   for tower in towers)  # Считает готовые к выстрелу башни.
+    mismatches = parity_mismatches(towers, enemies, level.enemy_index, current_time)  # Сравнивает выбор целей.
+    return len(mismatches), compared  # Возвращает количество несовпадений и сравненных башен.
+
+
+def run_scenario(name, ticks, seed=0, sound=False, render=False):  # Функция для запуска одного сценария.
+    """
+    Запускает сценарий в текущем процессе и измеряет время шагов.
+
+    Каждые PARITY_INTERVAL шагов (вне замера времени) цели пакетного выбора сравниваются со скалярными.
+
+    Args:
+        name (str): Имя сценария из SCENARIOS.
+        ticks (int): Количество шагов симуляции.
+        seed (int): Начальное значение генератора случайных чисел.
+        sound (bool): Воспроизводить ли звуки через фиктивный аудиодрайвер SDL (время шага включает звук).
+        render (bool): Отрисовывать ли кадр после каждого шага на фиктивном видеодрайвере (время шага включает отрисовку).
+
+    Returns:
+        dict: Результаты сценария.
+    """
+    random.seed(seed)  # Устанавливает начальное значение генератора случайных чисел.
+    path_number, setup = SCENARIOS[name]  # Получает путь и функцию подготовки сценария.
+    with contextlib.redirect_stdout(io.StringIO()):  # Подавляет вывод сообщений игры.
+        game = create_headless_game(path_number)  # Создает игру без окна.
+        if sound:  # Проверяет, нужно ли воспроизводить звуки.
+            game.audio = AudioManager(game.settings)  # Создает менеджер звука на фиктивном аудиодрайвере.
+        setup(game)  # Подготавливает сценарий.
+        level = game.level  # Получает уровень.
+        tick_times = []  # Инициализирует список времени шагов.
+        peak_enemies = len(level.enemies)  # Инициализирует пиковое количество врагов.
+        peak_bullets = 0  # Инициализирует пиковое количество пуль.
+        enemy_ticks = 0  # Инициализирует сумму количества врагов по шагам.
+        spatial = dict.fromkeys(level.enemy_index.stats(), 0)  # Инициализирует суммы статистики пространственного индекса.
+        parity_compared = 0  # Инициализирует количество сравненных башен.
+        mismatches = 0  # Инициализирует количество несовпадений целей.
+        parity_time = 0.0  # Инициализирует время проверок совпадения целей.
+        start = time.perf_counter()  # Запоминает время начала.
+        for tick in range(ticks):  # Выполняет шаги симуляции.
+            if tick % PARITY_INTERVAL == 0:  # Проверяет, пора ли сравнить выбор целей.
+                parity_start = time.perf_counter()  # Запоминает время начала проверки.
+                game.sim_clock.advance()  # Продвигает время симуляции до шага проверки.
+                tick_mismatches, tick_compared = check_parity(game)  # Сравнивает пакетный и скалярный выбор целей.
+                mismatches += tick_mismatches  # Добавляет несовпадения.
+                parity_compared += tick_compared  # Добавляет сравненные башни.
+                parity_time += time.perf_counter() - parity_start  # Исключает проверку из замера времени.
+            tick_start = time.perf_counter()  # Запоминает время начала шага.
+            game.audio.new_tick()  # Начинает новый тик для объединения одинаковых звуков.
+            if tick % PARITY_INTERVAL != 0:  # Проверяет, продвинуты ли уже часы проверкой.
+                game.sim_clock.advance()  # Продвигает время симуляции.
+            game.step()  # Выполняет шаг симуляции.
+            if render:  # Проверяет, нужно ли отрисовывать кадры.
+                game._draw()  # Отрисовывает кадр.
+            tick_times.append(time.perf_counter() - tick_start)  # Сохраняет время шага.
+            for key, value in level.enemy_index.stats().items():  # Перебирает статистику шага (сбрасывается при перестройке).
+                spatial[key] += value  # Добавляет статистику шага к сумме.
+            peak_enemies = max(peak_enemies, len(level.enemies))  # Обновляет пиковое количество врагов.
+            enemy_ticks += len(level.enemies)  # Добавляет количество врагов шага к сумме.
+            peak_bullets = max(peak_bullets, len(level.bullets))  # Обновляет пиковое количество пуль.
+        elapsed = time.perf_counter() - start - parity_time  # Вычисляет общее время без проверок выбора целей.
+
+    tick_times.sort()  # Сортирует время шагов.
+    return {  # Возвращает результаты сценария.
+        'scenario': name,  # Имя сценария.
+        'ticks': ticks,  # Количество шагов.
+        'ticks_per_sec': ticks / elapsed if elapsed else 0.0,  # Шагов в секунду.
+        'p50_ms': percentile(tick_times, 0.5) * 1000,  # Медиана времени шага.
+        'p99_ms': percentile(tick_times, 0.99) * 1000,  # 99-й перцентиль времени шага.
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,  # Пиковая память.
+        'towers': len(level.towers),  # Количество башен в конце.
+        'enemies': len(level.enemies),  # Количество врагов в конце.
+        'bullets': len(level.bullets),  # Количество пуль в конце.
+        'peak_enemies': peak_enemies,  # Пиковое количество врагов.
+        'mean_enemies': enemy_ticks / ticks if ticks else 0.0,  # Среднее количество врагов за шаг.
+        'peak_bullets': peak_bullets,  # Пиковое количество пуль.
+        'bullet_pool': level.bullet_pool.stats(),  # Статистика пула пуль.
+        'impacts': level.impacts.stats(),  # Статистика попаданий.
+        'spatial': spatial,  # Сумма статистики запросов пространственного индекса за все шаги.
+        'parity_compared': parity_compared,  # Количество башен, для которых сравнивался выбор целей.
+        'parity_mismatches': mismatches,  # Количество несовпадений целей.
+        'audio': game.audio.stats(),  # Статистика воспроизведения звуков.
+        'rotations': game.assets.rotation_stats(),  # Статистика кэшей повернутых изображений башен.
+        'text': game.text.stats(),  # Статистика кэша отрисованного текста.
+    }
+
+
+def run_isolated(name, ticks, seed=0, sound=False, render=False):  # Функция для запуска сценария в отдельном процессе.
+    """
+    Запускает сценарий в отдельном процессе, чтобы пиковая память и кэши не зависели от других сценариев.
+
+    Args:
+        name (str): Имя сценария из SCENARIOS.
+        ticks (int): Количество шагов симуляции.
+        seed (int): Начальное значение генератора случайных чисел.
+        sound (bool): Воспроизводить ли звуки через фиктивный аудиодрайвер SDL.
+        render (bool): Отрисовывать ли кадр после каждого шага.
+
+    Returns:
+        dict: Результаты сценария.
+    """
+    with multiprocessing.get_context('spawn').Pool(1) as pool:  # Создает процесс для сценария.
+        return pool.apply(run_scenario, (name, ticks, seed, sound, render))  # Запускает сценарий и возвращает результаты.
+
+
+def compare(results, baseline, threshold):  # Функция для сравнения результатов с эталоном.
+    """
+    Находит сценарии, скорость которых упала больше чем на threshold относительно эталона.
+
+    Args:
+        results (dict): Результаты по имени сценария.
+        baseline (dict): Эталонные результаты по имени сценария.
+        threshold (float): Допустимая доля замедления (0.1 - 10%).
+
+    Returns:
+        list: Список строк с описанием регрессий.
+    """
+    regressions = []  # Инициализирует список регрессий.
+    for name, result in results.items():  # Перебирает результаты.
+        reference = baseline.get(name)  # Получает эталонный результат.
+        if reference is None:  # Если эталона нет.
+            continue  # Переходит к следующему сценарию.
+        ratio = result['ticks_per_sec'] / reference['ticks_per_sec']  # Вычисляет отношение скоростей.
+        if ratio < 1 - threshold:  # Проверяет, превышено ли допустимое замедление.
+            regressions.append(f"{name}: {result['ticks_per_sec']:.1f} ticks/s vs baseline "
+                               f"{reference['ticks_per_sec']:.1f} ({ratio:.0%})")  # Добавляет описание регрессии.
+    return regressions  # Возвращает список регрессий.
+
+
+def main():  # Функция для запуска набора сценариев из командной строки.
+    """
+    Запускает сценарии, выводит и сохраняет результаты, сравнивает их с эталоном.
+    """
+    parser = argparse.ArgumentParser(description="Tower Defense performance benchmarks.")  # Создает разбор аргументов.
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS),
+                        help="scenarios to run (default: all)")  # Добавляет аргумент списка сценариев.
+    parser.add_argument('--ticks', type=int, default=600, help="simulation ticks per scenario")  # Количество шагов.
+    parser.add_argument('--seed', type=int, default=0, help="random seed")  # Начальное значение генератора.
+    parser.add_argument('--sound', action='store_true',
+                        help="play sounds through the dummy SDL audio driver and report audio counters")  # Звук.
+    parser.add_argument('--render', action='store_true',
+                        help="draw a frame after every tick and report text cache counters")  # Отрисовка.
+    parser.add_argument('--output', help="write results to this JSON file")  # Файл результатов.
+    parser.add_argument('--baseline', help="compare against this JSON file")  # Файл эталона.
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="allowed slowdown against the baseline (0.1 = 10%%)")  # Допустимое замедление.
+    args = parser.parse_args()  # Разбирает аргументы.
+
+    results = {}  # Инициализирует словарь результатов.
+    for name in args.scenarios:  # Перебирает сценарии.
+        result = run_isolated(name, args.ticks, args.seed, args.sound, args.render)  # Запускает сценарий.
+        results[name] = result  # Сохраняет результат.
+        print(f"{name:20} {result['ticks_per_sec']:10.1f} ticks/s  p50 {result['p50_ms']:7.3f} ms  "
+              f"p99 {result['p99_ms']:7.3f} ms  rss {result['peak_rss_kb']} KB  "
+              f"enemies {result['peak_enemies']} (mean {result['mean_enemies']:.0f})  bullets {result['peak_bullets']}  "
+              f"towers {result['towers']}")  # Выводит результат.
+        spatial = result['spatial']  # Получает статистику пространственного индекса.
+        queries = spatial['queries'] or 1  # Получает количество запросов (без деления на ноль).
+        print(f"{'':20} spatial: {spatial['queries']} queries  {spatial['cells_visited'] / queries:.1f} cells/query  "
+              f"{spatial['candidates'] / queries:.1f} candidates/query  "
+              f"{spatial['matches'] / queries:.1f} matches/query")  # Выводит статистику пространственного индекса.
+        impacts = result['impacts']  # Получает статистику попаданий.
+        print(f"{'':20} impacts: {impacts['impacts']} resolved  {impacts['pair_tests']} pair tests "
+              f"(naive {impacts['naive_pairs']})  hits {impacts['hits']}  "
+              f"fizzled {impacts['fizzled']}")  # Выводит статистику попаданий.
+        print(f"{'':20} targeting parity: {result['parity_mismatches']} mismatches in "
+              f"{result['parity_compared']} ready towers")  # Выводит результат сравнения выбора целей.
+        for key, rotations in result['rotations'].items():  # Перебирает кэши поворотов.
+            print(f"{'':20} rotations {key}: {rotations['frames']} frames  hit rate {rotations['hit_rate']:.1%}  "
+                  f"{rotations['memory_bytes'] // 1024} KB")  # Выводит статистику кэша поворотов.
+        if args.render:  # Проверяет, отрисовывались ли кадры.
+            text = result['text']  # Получает статистику кэша текста.
+            print(f"{'':20} text: {text['entries']} entries  hits {text['hits']}  "
+                  f"misses {text['misses']}")  # Выводит статистику кэша текста.
+        if args.sound:  # Проверяет, воспроизводились ли звуки.
+            audio = result['audio']  # Получает статистику звуков.
+            print(f"{'':20} audio: played {audio['played']}  dropped {audio['dropped']}  "
+                  f"coalesced {audio['coalesced']}")  # Выводит статистику звуков.
+
+    if args.output:  # Проверяет, нужно ли сохранить результаты.
+        with open(args.output, 'w') as file:  # Открывает файл результатов.
+            json.dump(results, file, indent=2)  # Сохраняет результаты.
+
+    failed = False  # Инициализирует флаг ошибки.
+    for name, result in results.items():  # Перебирает результаты.
+        if result['parity_mismatches']:  # Проверяет, совпали ли цели пакетного и скалярного выбора.
+            print("PARITY", f"{name}: {result['parity_mismatches']} targeting mismatches")  # Выводит несовпадение.
+            failed = True  # Отмечает ошибку.
+
+    if args.baseline:  # Проверяет, нужно ли сравнение с эталоном.
+        with open(args.baseline) as file:  # Открывает файл эталона.
+            baseline = json.load(file)  # Загружает эталон.
+        regressions = compare(results, baseline, args.threshold)  # Сравнивает результаты с эталоном.
+        for line in regressions:  # Перебирает регрессии.
+            print("REGRESSION", line)  # Выводит регрессию.
+        failed = failed or bool(regressions)  # Отмечает ошибку, если есть регрессии.
+
+    if failed:  # Проверяет, была ли ошибка.
+        sys.exit(1)  # Завершает программу с ошибкой.
+
+
+if __name__ == '__main__':  # Проверяет, запущен ли файл напрямую.
+    main()  # Запускает набор сценариев.
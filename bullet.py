@@ -1,3 +1,5 @@
+import heapq  # Импортирует модуль heapq для очереди попаданий.
+
 import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
 from pygame.math import Vector2  # Импортирует класс Vector2 из модуля math библиотеки Pygame для работы с векторами.
 
@@ -6,68 +8,278 @@ class Bullet(pygame.sprite.Sprite):  # Определяет класс Bullet, 
     """
     Класс Bullet представляет пулю, выпущенную башней.
 
+    Попадание рассчитывается при выстреле: пуля летит в точку перехвата цели и на заданном шаге
+    (см. ImpactQueue) наносит урон врагам, с которыми пересекается в этой точке. В кадре пуля только
+    перемещается между точкой выстрела и точкой попадания для отрисовки.
+
     Атрибуты:
         game (TowerDefenseGame): Ссылка на основной объект игры.
         image (pygame.Surface): Изображение пули.
-        rect (pygame.Rect): Прямоугольник для обработки коллизий.
-        position (Vector2): Текущая позиция пули.
-        target (Vector2): Целевая позиция, куда летит пуля.
-        speed (int): Скорость пули.
+        rect (pygame.Rect): Прямоугольник для отрисовки.
+        radius (float): Радиус пули для проверки пересечения с врагами.
+        position (Vector2): Текущая позиция пули (обновляется перед отрисовкой).
+        start (Vector2): Точка выстрела.
+        target (Vector2): Точка попадания.
         damage (int): Урон, наносимый пулей.
-        velocity (Vector2): Вектор скорости пули.
+        fire_tick (int): Шаг выстрела.
+        impact_tick (int): Шаг попадания.
+        pool (BulletPool): Пул, в который пуля возвращается после удаления (None - пуля не из пула).
+        in_use (bool): Флаг, указывающий, летит ли пуля.
     """
 
-    def __init__(self, start_pos, target_pos, damage, game):  # Конструктор класса Bullet.
+    __slots__ = ('game', 'image', 'rect', 'radius', 'position', 'start', 'target', 'damage', 'fire_tick',
+                 'impact_tick', 'pool', 'in_use')  # Фиксированный набор атрибутов пули.
+
+    def __init__(self, start_pos, target_pos, damage, game, pool=None, fire_tick=0,
+                 impact_tick=1):  # Конструктор класса Bullet.
         """
         Инициализация объекта Bullet.
 
         Args:
-            start_pos (tuple): Начальная позиция пули.
-            target_pos (tuple): Целевая позиция пули.
+            start_pos (tuple): Точка выстрела.
+            target_pos (tuple): Точка попадания.
             damage (int): Урон, наносимый пулей.
             game (TowerDefenseGame): Основной объект игры.
+            pool (BulletPool): Пул, в который пуля возвращается после удаления.
+            fire_tick (int): Шаг выстрела.
+            impact_tick (int): Шаг попадания.
         """
         super().__init__()  # Вызывает конструктор родительского класса (pygame.sprite.Sprite).
         self.game = game  # Сохраняет ссылку на основной объект игры.
-        self.image = pygame.image.load(
-            'assets/bullets/basic_bullet.png').convert_alpha()  # Загружает изображение пули и конвертирует его с учетом прозрачности.
+        self.pool = pool  # Сохраняет пул пули.
+        self.image = game.assets.get_image(game.settings.bullet_sprite)  # Получает общее изображение пули из кэша.
         self.rect = self.image.get_rect(
-            center=start_pos)  # Создает прямоугольник для обработки коллизий, центрируя его на начальной позиции.
-        self.position = Vector2(start_pos)  # Сохраняет начальную позицию пули как вектор.
-        self.target = Vector2(target_pos)  # Сохраняет целевую позицию пули как вектор.
-        self.speed = 5  # Устанавливает скорость пули.
+            center=start_pos)  # Создает прямоугольник для отрисовки, центрируя его на точке выстрела.
+        self.radius = self.rect.width / 2  # Устанавливает радиус пули для проверки пересечения с врагами.
+        self.position = Vector2()  # Создает вектор позиции пули.
+        self.start = Vector2()  # Создает вектор точки выстрела.
+        self.target = Vector2()  # Создает вектор точки попадания.
+        self.reset(start_pos, target_pos, damage, fire_tick, impact_tick)  # Устанавливает выстрел.
+
+    def reset(self, start_pos, target_pos, damage, fire_tick=0, impact_tick=1):  # Метод для повторного запуска пули.
+        """
+        Устанавливает точки выстрела и попадания, урон и шаги полета, не создавая новых объектов.
+
+        Args:
+            start_pos (tuple): Точка выстрела.
+            target_pos (tuple): Точка попадания.
+            damage (int): Урон, наносимый пулей.
+            fire_tick (int): Шаг выстрела.
+            impact_tick (int): Шаг попадания.
+        """
+        self.position.update(start_pos)  # Устанавливает позицию пули в точку выстрела.
+        self.start.update(start_pos)  # Устанавливает точку выстрела.
+        self.target.update(target_pos)  # Устанавливает точку попадания.
+        self.rect.center = start_pos  # Центрирует прямоугольник на точке выстрела.
         self.damage = damage  # Устанавливает урон, наносимый пулей.
-        self.velocity = self.calculate_velocity()  # Вычисляет вектор скорости пули.
+        self.fire_tick = fire_tick  # Устанавливает шаг выстрела.
+        self.impact_tick = impact_tick  # Устанавливает шаг попадания.
+        self.in_use = True  # Отмечает пулю как летящую.
 
-    def calculate_velocity(self):  # Метод для вычисления вектора скорости пули.
+    def kill(self):  # Метод для удаления пули.
+        """
+        Удаляет пулю из всех групп спрайтов и возвращает ее в пул.
         """
-        Вычисляет вектор скорости пули на основе целевой позиции.
+        super().kill()  # Удаляет пулю из всех групп спрайтов.
+        if self.in_use:  # Проверяет, не была ли пуля уже удалена.
+            self.in_use = False  # Отмечает пулю как свободную.
+            if self.pool is not None:  # Проверяет, принадлежит ли пуля пулу.
+                self.pool.release(self)  # Возвращает пулю в пул.
+
+    def impact(self, enemy_index):  # Метод для попадания пули.
+        """
+        Наносит урон всем врагам, с которыми пуля пересекается в точке попадания, и удаляет пулю.
+
+        Если цель жива, она находится в точке попадания; если цель уже уничтожена, урон получают
+        другие враги в этой точке. Поиск ведется в радиусе пули и наибольшего радиуса врага в индексе,
+        а пересечение проверяется по радиусу каждого найденного врага.
+
+        Args:
+            enemy_index (SpatialHash): Пространственный индекс врагов.
 
         Returns:
-            Vector2: Вектор скорости пули.
+            tuple: Количество врагов, получивших урон, и количество проверенных пар пуля-враг.
+        """
+        self.kill()  # Удаляет пулю.
+        hit = 0  # Инициализирует количество врагов, получивших урон.
+        candidates = enemy_index.query_radius(self.target,
+                                              self.radius + enemy_index.max_radius)  # Находит врагов рядом с точкой попадания.
+        for enemy, distance_sq in candidates:  # Перебирает врагов рядом с точкой попадания.
+            overlap = self.radius + enemy.radius  # Вычисляет сумму радиусов.
+            if enemy.in_use and distance_sq < overlap * overlap:  # Проверяет, пересекается ли пуля с живым врагом.
+                enemy.take_damage(self.damage)  # Наносит урон врагу.
+                hit += 1  # Увеличивает количество врагов, получивших урон.
+        return hit, len(candidates)  # Возвращает количество врагов, получивших урон, и проверенных пар.
+
+    def interpolate(self, tick):  # Метод для вычисления позиции пули для отрисовки.
+        """
+        Перемещает пулю на долю пути между точкой выстрела и точкой попадания, соответствующую шагу.
+
+        Args:
+            tick (float): Текущий шаг симуляции.
         """
-        direction = (self.target - self.position).normalize()  # Вычисляет направление к цели и нормализует его.
-        velocity = direction * self.speed  # Умножает нормализованное направление на скорость, чтобы получить вектор скорости.
-        return velocity  # Возвращает вектор скорости.
+        fraction = min(max((tick - self.fire_tick) / (self.impact_tick - self.fire_tick), 0.0), 1.0)  # Вычисляет долю полета.
+        self.position.update(self.start.lerp(self.target, fraction))  # Вычисляет позицию пули.
+        self.rect.center = self.position  # Центрирует прямоугольник на позиции пули.
+
+
+class ImpactQueue:  # Определяет класс ImpactQueue, который хранит запланированные попадания.
+    """
+    Класс ImpactQueue хранит пули в куче по шагу попадания и обрабатывает попадания, когда шаг наступает.
+
+    Атрибуты:
+        events (list): Куча (шаг попадания, порядковый номер, пуля).
+        sequence (int): Порядковый номер следующего события (сохраняет порядок выстрелов одного шага).
+        impacts (int): Количество обработанных попаданий (запросов к пространственному индексу).
+        pair_tests (int): Количество проверенных пар пуля-враг.
+        naive_pairs (int): Количество пар пуля-враг при полном переборе (для сравнения с pair_tests).
+        hits (int): Количество попаданий по врагам (пуля может задеть нескольких врагов).
+        fizzled (int): Количество пуль, не задевших ни одного врага.
+    """
 
-    def update(self):  # Метод для обновления состояния пули.
+    def __init__(self):  # Конструктор класса ImpactQueue.
         """
-        Обновляет позицию пули и проверяет, достигла ли она цели или вышла за пределы экрана.
+        Инициализация объекта ImpactQueue.
         """
-        self.position += self.velocity  # Обновляет позицию пули на основе её скорости.
-        self.rect.center = self.position  # Обновляет прямоугольник пули, чтобы он соответствовал новой позиции.
-        if self.position.distance_to(self.target) < 10 or not self.game.is_position_inside(
-                self.position):  # Проверяет, достигла ли пуля цели или вышла за пределы экрана.
-            self.kill()  # Удаляет пулю из группы спрайтов.
+        self.events = []  # Инициализирует кучу событий.
+        self.sequence = 0  # Инициализирует порядковый номер событий.
+        self.impacts = 0  # Инициализирует счетчик обработанных попаданий.
+        self.pair_tests = 0  # Инициализирует счетчик проверенных пар.
+        self.naive_pairs = 0  # Инициализирует счетчик пар полного перебора.
+        self.hits = 0  # Инициализирует счетчик попаданий.
+        self.fizzled = 0  # Инициализирует счетчик пуль без цели.
 
-    def is_position_inside(self, pos):  # Метод для проверки, находится ли позиция внутри игрового экрана.
+    def schedule(self, bullet):  # Метод для планирования попадания.
         """
-        Проверяет, находится ли позиция внутри игрового экрана.
+        Планирует попадание пули на ее шаг попадания.
 
         Args:
-            pos (Vector2): Координаты позиции.
+            bullet (Bullet): Пуля.
+        """
+        heapq.heappush(self.events, (bullet.impact_tick, self.sequence, bullet))  # Добавляет событие в кучу.
+        self.sequence += 1  # Увеличивает порядковый номер.
+
+    def resolve(self, tick, enemy_index):  # Метод для обработки наступивших попаданий.
+        """
+        Обрабатывает попадания, шаг которых наступил.
+
+        Args:
+            tick (int): Текущий шаг симуляции.
+            enemy_index (SpatialHash): Пространственный индекс врагов по позициям этого шага.
+        """
+        events = self.events  # Сохраняет кучу в локальной переменной.
+        while events and events[0][0] <= tick:  # Пока есть наступившие попадания.
+            hit, tested = heapq.heappop(events)[2].impact(enemy_index)  # Обрабатывает попадание пули.
+            self.impacts += 1  # Увеличивает счетчик обработанных попаданий.
+            self.pair_tests += tested  # Увеличивает счетчик проверенных пар.
+            self.naive_pairs += enemy_index.size  # Увеличивает счетчик пар полного перебора.
+            self.hits += hit  # Увеличивает счетчик попаданий.
+            if not hit:  # Проверяет, задела ли пуля врагов.
+                self.fizzled += 1  # Увеличивает счетчик пуль без цели.
+
+    def clear(self):  # Метод для удаления всех запланированных попаданий.
+        """
+        Удаляет все запланированные попадания (пули удаляются отдельно).
+        """
+        self.events.clear()  # Очищает кучу.
+
+    def stats(self):  # Метод для получения статистики попаданий.
+        """
+        Возвращает статистику попаданий.
+
+        Returns:
+            dict: Количество обработанных попаданий, проверенных пар, пар полного перебора, попаданий по врагам,
+            пуль без цели и ожидающих попаданий.
+        """
+        return {'impacts': self.impacts, 'pair_tests': self.pair_tests, 'naive_pairs': self.naive_pairs,
+                'hits': self.hits, 'fizzled': self.fizzled, 'pending': len(self.events)}  # Возвращает статистику.
+
+
+class BulletPool:  # Определяет класс BulletPool, который повторно использует объекты пуль.
+    """
+    Класс BulletPool хранит заранее созданные пули и выдает их башням вместо создания новых.
+
+    Удаленная пуля (kill) возвращается в пул. Если свободных пуль нет, создается новая
+    и учитывается как промах, чтобы по статистике можно было подобрать размер пула.
+
+    Атрибуты:
+        game (TowerDefenseGame): Ссылка на основной объект игры.
+        free (list): Свободные пули.
+        created (int): Количество созданных пуль.
+        active (int): Количество летящих пуль.
+        peak_active (int): Наибольшее количество одновременно летящих пуль.
+        misses (int): Количество запросов, для которых не нашлось свободной пули.
+    """
+
+    def __init__(self, game, capacity=256):  # Конструктор класса BulletPool.
+        """
+        Инициализация объекта BulletPool.
+
+        Args:
+            game (TowerDefenseGame): Основной объект игры.
+            capacity (int): Количество заранее созданных пуль.
+        """
+        self.game = game  # Сохраняет ссылку на основной объект игры.
+        self.created = 0  # Инициализирует счетчик созданных пуль.
+        self.active = 0  # Инициализирует счетчик летящих пуль.
+        self.peak_active = 0  # Инициализирует пиковое количество летящих пуль.
+        self.misses = 0  # Инициализирует счетчик промахов.
+        self.free = []  # Инициализирует список свободных пуль.
+        for _ in range(capacity):  # Создает пули заранее.
+            bullet = self._create((0, 0), (0, 0), 0)  # Создает пулю (точки и цель будут заданы при выдаче).
+            bullet.in_use = False  # Отмечает пулю как свободную.
+            self.free.append(bullet)  # Добавляет пулю в список свободных.
+
+    def _create(self, start_pos, target_pos, damage, fire_tick=0, impact_tick=1):  # Метод для создания новой пули.
+        """
+        Создает новую пулю, принадлежащую пулу.
+
+        Returns:
+            Bullet: Новая пуля.
+        """
+        self.created += 1  # Увеличивает счетчик созданных пуль.
+        return Bullet(start_pos, target_pos, damage, self.game, self, fire_tick, impact_tick)  # Создает пулю.
+
+    def acquire(self, start_pos, target_pos, damage, fire_tick=0, impact_tick=1):  # Метод для получения пули.
+        """
+        Выдает свободную пулю, выпущенную из start_pos с попаданием в target_pos на шаге impact_tick.
+
+        Args:
+            start_pos (tuple): Точка выстрела.
+            target_pos (tuple): Точка попадания.
+            damage (int): Урон, наносимый пулей.
+            fire_tick (int): Шаг выстрела.
+            impact_tick (int): Шаг попадания.
+
+        Returns:
+            Bullet: Пуля.
+        """
+        if self.free:  # Проверяет, есть ли свободные пули.
+            bullet = self.free.pop()  # Получает свободную пулю.
+            bullet.reset(start_pos, target_pos, damage, fire_tick, impact_tick)  # Запускает пулю заново.
+        else:
+            self.misses += 1  # Увеличивает счетчик промахов.
+            bullet = self._create(start_pos, target_pos, damage, fire_tick, impact_tick)  # Создает новую пулю.
+        self.active += 1  # Увеличивает счетчик летящих пуль.
+        self.peak_active = max(self.peak_active, self.active)  # Обновляет пиковое количество летящих пуль.
+        return bullet  # Возвращает пулю.
+
+    def release(self, bullet):  # Метод для возврата пули в пул.
+        """
+        Возвращает удаленную пулю в пул.
+
+        Args:
+            bullet (Bullet): Пуля.
+        """
+        self.active -= 1  # Уменьшает счетчик летящих пуль.
+        self.free.append(bullet)  # Добавляет пулю в список свободных.
+
+    def stats(self):  # Метод для получения статистики пула.
+        """
+        Возвращает статистику пула.
 
         Returns:
-            bool: True, если позиция находится внутри экрана, иначе False.
+            dict: Количество созданных, свободных и летящих пуль, пик и промахи.
         """
-        return 0 <= pos.x <= self.game.settings.screen_width and 0 <= pos.y <= self.game.settings.screen_height  # Возвращает True, если позиция находится внутри экрана, иначе False.
+        return {'created': self.created, 'free': len(self.free), 'active': self.active,
+                'peak_active': self.peak_active, 'misses': self.misses}  # Возвращает статистику.
@@ -0,0 +1,37 @@
+class SimulationClock:  # Определяет класс SimulationClock, который отсчитывает время симуляции.
+    """
+    Класс SimulationClock отсчитывает время симуляции фиксированными шагами, независимо от реального времени.
+
+    Атрибуты:
+        step_ms (float): Длительность одного шага в миллисекундах.
+        time (float): Текущее время симуляции в миллисекундах.
+        ticks (int): Количество выполненных шагов.
+    """
+
+    def __init__(self, step_ms=1000 / 60, start=0):  # Конструктор класса SimulationClock.
+        """
+        Инициализация объекта SimulationClock.
+
+        Args:
+            step_ms (float): Длительность одного шага в миллисекундах.
+            start (float): Начальное время симуляции в миллисекундах.
+        """
+        self.step_ms = step_ms  # Сохраняет длительность шага.
+        self.time = start  # Устанавливает начальное время.
+        self.ticks = 0  # Инициализирует счетчик шагов.
+
+    def get_ticks(self):  # Метод для получения текущего времени.
+        """
+        Возвращает текущее время симуляции.
+
+        Returns:
+            float: Время симуляции в миллисекундах.
+        """
+        return self.time  # Возвращает время симуляции.
+
+    def advance(self):  # Метод для продвижения времени на один шаг.
+        """
+        Продвигает время симуляции на один шаг.
+        """
+        self.time += self.step_ms  # Увеличивает время на длительность шага.
+        self.ticks += 1  # Увеличивает счетчик шагов.
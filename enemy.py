@@ -1,6 +1,21 @@
+import collections  # Импортирует модуль collections для неизменяемых описаний типов врагов.
+
 import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
 from pygame.math import Vector2  # Импортирует класс Vector2 из модуля math библиотеки Pygame для работы с векторами.
 
+from path import compile_path  # Импортирует функцию compile_path из файла path.py.
+
+EnemyType = collections.namedtuple('EnemyType', ['name', 'speed', 'health', 'image_path',
+                                                 'reward'])  # Неизменяемое описание типа врага, общее для всех врагов этого типа.
+
+ENEMY_TYPES = {  # Типы врагов по имени.
+    'basic': EnemyType('basic', 1, 100, 'assets/enemies/basic_enemy.png', 10),
+    'fast': EnemyType('fast', 1.5, 50, 'assets/enemies/fast_enemy.png', 5),
+    'strong': EnemyType('strong', 0.75, 200, 'assets/enemies/strong_enemy.png', 20),
+    'very_fast': EnemyType('very_fast', 2, 30, 'assets/enemies/fast_enemy.png', 3),
+    'very_strong': EnemyType('very_strong', 0.5, 300, 'assets/enemies/strong_enemy.png', 30),
+}
+
 
 class Enemy(pygame.sprite.Sprite):  # Определяет класс Enemy, который наследуется от pygame.sprite.Sprite.
     """
@@ -11,13 +26,24 @@ class Enemy(pygame.sprite.Sprite):  # Определяет класс Enemy, к
         rect (pygame.Rect): Прямоугольник для обработки коллизий.
         game (TowerDefenseGame): Ссылка на основной объект игры.
         path (list): Список точек, по которым движется враг.
-        path_index (int): Индекс текущей точки пути.
+        track (CompiledPath): Скомпилированный путь с таблицей накопленных длин.
+        distance (float): Расстояние, пройденное врагом вдоль пути.
+        path_index (int): Индекс текущего отрезка пути.
         speed (float): Скорость движения врага.
         health (int): Здоровье врага.
+        image_path (str): Путь к изображению врага.
+        type_name (str): Имя типа врага из ENEMY_TYPES (враги не из пула считаются базовыми).
         position (Vector2): Текущая позиция врага.
+        previous_position (Vector2): Позиция врага до последнего шага симуляции (для плавной отрисовки).
+        radius (float): Радиус врага для проверки столкновений.
+        movement (MovementEngine): Движок перемещения, управляющий врагом (None - враг движется сам).
+        movement_slot (int): Слот врага в движке перемещения.
+        pool (EnemyPool): Пул, в который враг возвращается после удаления (None - враг не из пула).
+        in_use (bool): Флаг, указывающий, находится ли враг на уровне.
     """
 
-    def __init__(self, path, speed=2, health=10, image_path=None, game=None, reward=20):  # Конструктор класса Enemy.
+    def __init__(self, path, speed=2, health=10, image_path=None, game=None, reward=20,
+                 pool=None):  # Конструктор класса Enemy.
         """
         Инициализация объекта Enemy.
 
@@ -27,20 +53,47 @@ class Enemy(pygame.sprite.Sprite):  # Определяет класс Enemy, к
             health (int): Здоровье врага.
             image_path (str): Путь к изображению врага.
             game (TowerDefenseGame): Основной объект игры.
+            reward (int): Награда за уничтожение врага.
+            pool (EnemyPool): Пул, в который враг возвращается после удаления.
         """
         super().__init__()  # Вызывает конструктор родительского класса (pygame.sprite.Sprite).
-        self.image = pygame.Surface((30, 40))  # Создает пустое изображение врага размером 30x40.
-        self.image = pygame.image.load(
-            image_path).convert_alpha()  # Загружает изображение врага и конвертирует его с учетом прозрачности.
-        self.rect = self.image.get_rect()  # Создает прямоугольник для обработки коллизий на основе изображения.
         self.game = game  # Сохраняет ссылку на основной объект игры.
+        self.pool = pool  # Сохраняет пул врага.
+        self.image = game.assets.get_image(image_path)  # Получает общее изображение врага из кэша.
+        self.rect = self.image.get_rect()  # Создает прямоугольник для обработки коллизий на основе изображения.
+        self.position = Vector2()  # Создает вектор позиции врага.
+        self.previous_position = Vector2()  # Создает вектор позиции врага до последнего шага.
+        self.movement = None  # Инициализирует ссылку на движок перемещения как None.
+        self.movement_slot = -1  # Инициализирует слот в движке перемещения.
+        self.type_name = 'basic'  # Инициализирует имя типа врага.
+        self.reset(path, speed, health, image_path, reward)  # Устанавливает путь и характеристики врага.
+
+    def reset(self, path, speed, health, image_path, reward):  # Метод для повторного появления врага.
+        """
+        Ставит врага в начало пути с новыми характеристиками, не создавая новых объектов.
+
+        Args:
+            path (list): Список точек, по которым движется враг.
+            speed (float): Скорость движения врага.
+            health (int): Здоровье врага.
+            image_path (str): Путь к изображению врага.
+            reward (int): Награда за уничтожение врага.
+        """
+        self.image_path = image_path  # Сохраняет путь к изображению врага.
+        self.image = self.game.assets.get_image(image_path)  # Получает общее изображение врага из кэша.
+        self.rect.size = self.image.get_size()  # Подгоняет прямоугольник под изображение.
+        self.radius = self.rect.width / 2  # Устанавливает радиус врага для проверки столкновений.
         self.path = path  # Сохраняет список точек, по которым будет двигаться враг.
-        self.path_index = 0  # Устанавливает начальный индекс пути (первая точка).
+        self.track = compile_path(path)  # Получает скомпилированный путь.
+        self.distance = 0.0  # Устанавливает пройденное расстояние (начало пути).
+        self.path_index = 0  # Устанавливает начальный индекс отрезка пути (первый отрезок).
         self.speed = speed  # Устанавливает скорость движения врага.
         self.health = health  # Устанавливает здоровье врага.
-        self.position = Vector2(path[0])  # Устанавливает начальную позицию врага (первая точка пути).
+        self.position.update(path[0])  # Устанавливает начальную позицию врага (первая точка пути).
+        self.previous_position.update(self.position)  # Враг появляется без движения.
         self.rect.center = self.position  # Центрирует прямоугольник врага на его позиции.
         self.reward = reward  # Добавляем награду за уничтожение врага
+        self.in_use = True  # Отмечает врага как находящегося на уровне.
 
         self.play_spawn_sound()  # Воспроизводит звук появления врага.
 
@@ -56,29 +109,126 @@ class Enemy(pygame.sprite.Sprite):  # Определяет класс Enemy, к
             self.game.settings.starting_money += self.reward  # Увеличиваем деньги игрока
             self.kill()  # Удаляет врага из группы спрайтов.
 
+    def kill(self):  # Переопределяет метод удаления врага.
+        """
+        Удаляет врага из всех групп спрайтов, освобождает его слот в движке перемещения и возвращает его в пул.
+        """
+        if self.movement is not None:  # Проверяет, управляется ли враг движком перемещения.
+            self.movement.remove(self)  # Освобождает слот врага.
+        super().kill()  # Удаляет врага из всех групп спрайтов.
+        if self.in_use:  # Проверяет, не был ли враг уже удален.
+            self.in_use = False  # Отмечает врага как удаленного.
+            if self.pool is not None:  # Проверяет, принадлежит ли враг пулу.
+                self.pool.release(self)  # Возвращает врага в пул.
+
     def update(self):  # Метод для обновления состояния врага.
         """
         Обновляет позицию врага и проверяет, достиг ли он конца пути.
+
+        Если враг управляется движком перемещения, позицию обновляет движок.
+        """
+        if self.movement is not None:  # Проверяет, управляется ли враг движком перемещения.
+            return  # Позицию обновляет движок.
+        self.distance += self.speed  # Продвигает врага вдоль пути на величину скорости.
+        if self.distance >= self.track.total_length:  # Проверяет, достиг ли враг конца пути.
+            self.game.game_over()  # Вызывает метод game_over у игры.
+            self.kill()  # Удаляет врага из группы спрайтов.
+            return  # Прекращает обновление.
+        self.path_index = self.track.advance_segment(self.path_index, self.distance)  # Находит текущий отрезок пути.
+        self.position.update(self.track.position_at(self.distance, self.path_index))  # Обновляет позицию врага.
+        self.rect.center = self.position  # Обновляет прямоугольник врага, чтобы он соответствовал новой позиции.
+
+    def interpolate(self, alpha):  # Метод для вычисления позиции врага для отрисовки.
         """
-        if self.path_index < len(self.path) - 1:  # Проверяет, есть ли еще точки в пути.
-            start_point = Vector2(self.path[self.path_index])  # Получает текущую точку пути.
-            end_point = Vector2(self.path[self.path_index + 1])  # Получает следующую точку пути.
-            direction = (
-                    end_point - start_point).normalize()  # Вычисляет направление к следующей точке и нормализует его.
+        Перемещает прямоугольник врага между позицией до последнего шага и текущей позицией.
 
-            self.position += direction * self.speed  # Обновляет позицию врага на основе его скорости.
-            self.rect.center = self.position  # Обновляет прямоугольник врага, чтобы он соответствовал новой позиции.
+        Args:
+            alpha (float): Доля следующего шага, накопленная к кадру (от 0 до 1).
+        """
+        self.rect.center = self.previous_position.lerp(self.position, alpha)  # Центрирует прямоугольник врага.
 
-            if self.position.distance_to(end_point) < self.speed:  # Проверяет, достиг ли враг следующей точки.
-                self.path_index += 1  # Переходит к следующей точке пути.
+    def progress(self):  # Метод для получения доли пройденного пути.
+        """
+        Возвращает долю пройденного пути (для выбора первого или последнего врага).
 
-            if self.path_index >= len(self.path) - 1:  # Проверяет, достиг ли враг конца пути.
-                self.game.game_over()  # Вызывает метод game_over у игры.
-                self.kill()  # Удаляет врага из группы спрайтов.
+        Returns:
+            float: Доля пройденного пути от 0 до 1.
+        """
+        return self.track.progress(self.distance)  # Возвращает долю пройденного пути.
 
     def play_spawn_sound(self):  # Метод для воспроизведения звука появления врага.
         """
         Воспроизведение звука появления врага.
         """
-        spawn_sound = pygame.mixer.Sound(self.game.settings.enemy_spawn_sound)  # Загружает звук появления врага.
-        spawn_sound.play()  # Воспроизводит звук.
+        self.game.audio.play('enemy_spawn')  # Воспроизводит заранее загруженный звук появления врага.
+
+
+class EnemyPool:  # Определяет класс EnemyPool, который повторно использует объекты врагов.
+    """
+    Класс EnemyPool выдает врагов заданного типа, повторно используя удаленных врагов вместо создания новых.
+
+    Атрибуты:
+        game (TowerDefenseGame): Ссылка на основной объект игры.
+        free (list): Свободные враги.
+        created (int): Количество созданных врагов.
+        active (int): Количество врагов на уровне.
+        peak_active (int): Наибольшее количество врагов на уровне одновременно.
+    """
+
+    def __init__(self, game):  # Конструктор класса EnemyPool.
+        """
+        Инициализация объекта EnemyPool.
+
+        Args:
+            game (TowerDefenseGame): Основной объект игры.
+        """
+        self.game = game  # Сохраняет ссылку на основной объект игры.
+        self.free = []  # Инициализирует список свободных врагов.
+        self.created = 0  # Инициализирует счетчик созданных врагов.
+        self.active = 0  # Инициализирует счетчик врагов на уровне.
+        self.peak_active = 0  # Инициализирует пиковое количество врагов на уровне.
+
+    def acquire(self, enemy_type, path):  # Метод для получения врага.
+        """
+        Выдает врага заданного типа в начале пути.
+
+        Args:
+            enemy_type (EnemyType): Тип врага.
+            path (list): Список точек пути.
+
+        Returns:
+            Enemy: Враг.
+        """
+        health = enemy_type.health * self.game.settings.enemy_health_scale  # Применяет множитель здоровья из настроек.
+        if self.free:  # Проверяет, есть ли свободные враги.
+            enemy = self.free.pop()  # Получает свободного врага.
+            enemy.reset(path, enemy_type.speed, health, enemy_type.image_path,
+                        enemy_type.reward)  # Ставит врага в начало пути.
+        else:
+            self.created += 1  # Увеличивает счетчик созданных врагов.
+            enemy = Enemy(path, enemy_type.speed, health, enemy_type.image_path, self.game,
+                          enemy_type.reward, self)  # Создает нового врага.
+        enemy.type_name = enemy_type.name  # Запоминает имя типа врага.
+        self.active += 1  # Увеличивает счетчик врагов на уровне.
+        self.peak_active = max(self.peak_active, self.active)  # Обновляет пиковое количество врагов.
+        return enemy  # Возвращает врага.
+
+    def release(self, enemy):  # Метод для возврата врага в пул.
+        """
+        Возвращает удаленного врага в пул.
+
+        Args:
+            enemy (Enemy): Враг.
+        """
+        self.active -= 1  # Уменьшает счетчик врагов на уровне.
+        self.free.append(enemy)  # Добавляет врага в список свободных.
+
+    def stats(self):  # Метод для получения статистики пула.
+        """
+        Возвращает статистику пула.
+
+        Returns:
+            dict: Количество созданных, свободных врагов, врагов на уровне и пик.
+        """
+        return {'created': self.created, 'free': len(self.free), 'active': self.active,
+                'peak_active': self.peak_active}  # Возвращает статистику.
@@ -5,11 +5,18 @@ class Grid:  # Определяет класс Grid, который управл
     """
     Класс Grid управляет сеткой, на которой игрок может размещать башни.
 
+    Занятость хранится по клеткам: для каждой клетки известно, можно ли на ней строить и какая башня
+    на ней стоит, поэтому проверка места и поиск башни под мышью выполняются за O(1).
+
     Атрибуты:
         game (TowerDefenseGame): Ссылка на основной объект игры.
         settings (Settings): Настройки игры.
         screen (pygame.Surface): Поверхность для отрисовки.
+        cell_width (int): Ширина клетки сетки.
+        cell_height (int): Высота клетки сетки.
         available_spots (list): Список доступных позиций для размещения башен.
+        buildable (list): Флаги клеток, на которых можно строить, по строкам и столбцам.
+        cells (list): Башни в клетках по строкам и столбцам (None - клетка свободна).
         towers (list): Список размещённых башен.
         show_spots (bool): Флаг для отображения позиций на сетке.
     """
@@ -24,7 +31,14 @@ class Grid:  # Определяет класс Grid, который управл
         self.game = game  # Сохраняет ссылку на основной объект игры.
         self.settings = game.settings  # Сохраняет настройки игры.
         self.screen = game.screen  # Сохраняет поверхность для отрисовки.
+        self.cell_width, self.cell_height = self.settings.grid_size  # Сохраняет размер клетки сетки.
         self.available_spots = self.settings.tower_positions  # Загружает список доступных позиций для размещения башен из настроек.
+        self.buildable = [[False] * self.settings.cols for _ in range(self.settings.rows)]  # Создает флаги клеток для строительства.
+        for spot in self.available_spots:  # Перебирает все доступные позиции.
+            cell = self.cell_at(spot)  # Получает клетку позиции.
+            if cell is not None:  # Проверяет, лежит ли позиция внутри сетки.
+                self.buildable[cell[1]][cell[0]] = True  # Отмечает клетку как доступную для строительства.
+        self.cells = [[None] * self.settings.cols for _ in range(self.settings.rows)]  # Создает пустую карту занятости клеток.
         self.towers = []  # Инициализирует пустой список для хранения размещённых башен.
         self.show_spots = False  # Инициализирует флаг для отображения позиций на сетке (по умолчанию выключен).
 
@@ -34,17 +48,52 @@ class Grid:  # Определяет класс Grid, который управл
         """
         pass  # Просто пропускает выполнение, так как метод пока не используется.
 
-    def draw(self):  # Метод для отрисовки сетки на экране.
+    def draw(self, surface=None):  # Метод для отрисовки сетки на экране.
         """
         Отрисовка сетки на экране.
 
         Если флаг show_spots установлен в True, отображаются доступные позиции для размещения башен.
+
+        Args:
+            surface (pygame.Surface): Поверхность для отрисовки (None - экран игры).
         """
+        surface = surface if surface is not None else self.screen  # Выбирает поверхность для отрисовки.
         if self.show_spots:  # Проверяет, нужно ли отображать доступные позиции.
             for spot in self.available_spots:  # Перебирает все доступные позиции.
-                pygame.draw.circle(self.screen, (0, 255, 0), spot, 15,
+                pygame.draw.circle(surface, (0, 255, 0), spot, 15,
                                    2)  # Рисует круг (позицию) на экране зеленым цветом.
 
+    def cell_at(self, pos):  # Метод для получения клетки по координатам.
+        """
+        Возвращает столбец и строку клетки, в которую попадает точка.
+
+        Args:
+            pos (tuple): Координаты (x, y).
+
+        Returns:
+            tuple: (столбец, строка) или None, если точка вне сетки.
+        """
+        col = int(pos[0] // self.cell_width)  # Вычисляет столбец клетки.
+        row = int(pos[1] // self.cell_height)  # Вычисляет строку клетки.
+        if 0 <= col < self.settings.cols and 0 <= row < self.settings.rows:  # Проверяет, лежит ли клетка внутри сетки.
+            return col, row  # Возвращает клетку.
+        return None  # Точка вне сетки.
+
+    def tower_at(self, pos):  # Метод для поиска башни по координатам.
+        """
+        Возвращает башню, стоящую в клетке под точкой.
+
+        Args:
+            pos (tuple): Координаты (x, y), например позиция мыши.
+
+        Returns:
+            Tower: Башня в клетке или None, если клетка свободна или точка вне сетки.
+        """
+        cell = self.cell_at(pos)  # Получает клетку точки.
+        if cell is None:  # Проверяет, лежит ли точка внутри сетки.
+            return None  # Башни нет.
+        return self.cells[cell[1]][cell[0]]  # Возвращает башню в клетке.
+
     def place_tower(self, tower=None):  # Метод для размещения башни на сетке.
         """
         Размещение башни на сетке.
@@ -55,13 +104,12 @@ class Grid:  # Определяет класс Grid, который управл
         Returns:
             bool: True, если башня успешно размещена, иначе False.
         """
-        grid_pos = Grid.get_grid_position(
-            tower.position)  # Получает координаты клетки сетки, на которую указывает башня.
-        if grid_pos in self.available_spots and not any(tower.rect.collidepoint(grid_pos) for tower in
-                                                        self.towers):  # Проверяет, доступна ли позиция и не занята ли она другой башней.
-            self.towers.append(tower)  # Добавляет башню в список размещённых башен.
-            return True  # Возвращает True, если башня успешно размещена.
-        return False  # Возвращает False, если башня не может быть размещена.
+        if not self.is_spot_available(tower.position):  # Проверяет, доступна ли позиция и не занята ли она другой башней.
+            return False  # Возвращает False, если башня не может быть размещена.
+        col, row = self.cell_at(tower.position)  # Получает клетку башни.
+        self.cells[row][col] = tower  # Отмечает клетку как занятую башней.
+        self.towers.append(tower)  # Добавляет башню в список размещённых башен.
+        return True  # Возвращает True, если башня успешно размещена.
 
     def remove_tower(self, tower):  # Метод для удаления башни с сетки.
         """
@@ -70,11 +118,12 @@ class Grid:  # Определяет класс Grid, который управл
         Args:
             tower (Tower): Башня для удаления.
         """
-        if tower in self.towers:  # Проверяет, есть ли башня в списке размещённых башен.
+        cell = self.cell_at(tower.position)  # Получает клетку башни.
+        if cell is not None and self.cells[cell[1]][cell[0]] is tower:  # Проверяет, стоит ли башня в своей клетке.
+            self.cells[cell[1]][cell[0]] = None  # Освобождает клетку.
             self.towers.remove(tower)  # Удаляет башню из списка.
 
-    @staticmethod
-    def get_grid_position(mouse_pos):  # Статический метод для получения координат клетки сетки по положению мыши.
+    def get_grid_position(self, mouse_pos):  # Метод для получения координат клетки сетки по положению мыши.
         """
         Получаем координаты клетки сетки по положению мыши.
 
@@ -84,8 +133,8 @@ class Grid:  # Определяет класс Grid, который управл
         Returns:
             tuple: Центр нажатой клетки сетки.
         """
-        grid_x = mouse_pos[0] // 64 * 64 + 32  # Вычисляет координату x клетки сетки.
-        grid_y = mouse_pos[1] // 64 * 64 + 32  # Вычисляет координату y клетки сетки.
+        grid_x = mouse_pos[0] // self.cell_width * self.cell_width + self.cell_width // 2  # Вычисляет координату x клетки сетки.
+        grid_y = mouse_pos[1] // self.cell_height * self.cell_height + self.cell_height // 2  # Вычисляет координату y клетки сетки.
         return grid_x, grid_y  # Возвращает координаты центра клетки сетки.
 
     def is_spot_available(self, grid_pos):  # Метод для проверки доступности позиции на сетке.
@@ -98,5 +147,6 @@ class Grid:  # Определяет класс Grid, который управл
         Returns:
             bool: True, если место доступно, иначе False.
         """
-        return grid_pos in self.available_spots and all(not tower.rect.collidepoint(grid_pos) for tower in
-                                                        self.towers)  # Возвращает True, если позиция доступна и не занята другой башней.
+        cell = self.cell_at(grid_pos)  # Получает клетку позиции.
+        return (cell is not None and self.buildable[cell[1]][cell[0]]
+                and self.cells[cell[1]][cell[0]] is None)  # Возвращает True, если на клетке можно строить и она свободна.
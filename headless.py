@@ -0,0 +1,100 @@
+import contextlib  # Импортирует модуль contextlib для перенаправления вывода.
+import io  # Импортирует модуль io для буфера вывода.
+import time  # Импортирует модуль time для измерения реального времени.
+
+from clock import SimulationClock  # Импортирует класс SimulationClock из файла clock.py.
+from main import TowerDefenseGame  # Импортирует класс TowerDefenseGame из файла main.py.
+from settings import Settings  # Импортирует класс Settings из файла settings.py.
+
+
+def create_headless_game(path_number=None, step_ms=1000 / 60, overrides=None,
+                         assets=None):  # Функция для создания игры без окна.
+    """
+    Создает игру без окна и звука с часами симуляции.
+
+    Args:
+        path_number (int): Номер пути врагов (None - случайный путь).
+        step_ms (float): Длительность шага симуляции в миллисекундах.
+        overrides (dict): Значения атрибутов Settings, заменяющие значения по умолчанию.
+        assets (AssetManager): Уже загруженный кэш изображений (None - загрузить новый).
+
+    Returns:
+        TowerDefenseGame: Игра, готовая к пошаговой симуляции.
+    """
+    settings = Settings()  # Создает настройки игры.
+    for name, value in (overrides or {}).items():  # Перебирает заменяемые значения настроек.
+        setattr(settings, name, value)  # Заменяет значение настройки.
+    settings.path_number = path_number  # Устанавливает номер пути врагов.
+    return TowerDefenseGame(headless=True, clock=SimulationClock(step_ms), settings=settings,
+                            assets=assets)  # Создает игру без окна.
+
+
+def place_layout(game, layout, tick):  # Функция для размещения башен из сценария.
+    """
+    Размещает башни сценария, запланированные на заданный шаг.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+        layout (list): Список башен (тип, позиция) или (шаг, тип, позиция).
+        tick (int): Текущий шаг симуляции.
+    """
+    for entry in layout:  # Перебирает башни сценария.
+        place_tick, tower_type, position = entry if len(entry) == 3 else (0,) + tuple(entry)  # Получает шаг, тип и позицию башни.
+        if place_tick == tick:  # Проверяет, запланирована ли башня на этот шаг.
+            game.level.attempt_place_tower(position, tower_type)  # Пытается разместить башню.
+
+
+def run_headless(layout, path_number=None, max_ticks=200000, step_ms=1000 / 60, overrides=None,
+                 quiet=True, assets=None):  # Функция для запуска симуляции без окна.
+    """
+    Запускает уровень без окна, звука и ограничения FPS до победы, поражения или лимита шагов.
+
+    Args:
+        layout (list): Список башен (тип, позиция) или (шаг, тип, позиция).
+        path_number (int): Номер пути врагов (None - случайный путь).
+        max_ticks (int): Максимальное количество шагов симуляции.
+        step_ms (float): Длительность шага симуляции в миллисекундах.
+        overrides (dict): Значения атрибутов Settings, заменяющие значения по умолчанию.
+        quiet (bool): Подавлять ли вывод сообщений игры.
+        assets (AssetManager): Уже загруженный кэш изображений (None - загрузить новый).
+
+    Returns:
+        dict: Итоги симуляции (победа, пройденные волны, утечки, деньги по волнам, шаги, реальное время).
+    """
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()  # Выбирает вывод сообщений.
+    with output:
+        start = time.perf_counter()  # Запоминает реальное время начала.
+        game = create_headless_game(path_number, step_ms, overrides, assets)  # Создает игру без окна.
+        level = game.level  # Получает уровень.
+        ticks = 0  # Инициализирует счетчик шагов.
+        money_curve = []  # Инициализирует список денег в начале каждой волны.
+        wave = -1  # Волна, для которой уже записаны деньги.
+        while not game.is_game_over and not level.all_waves_complete and ticks < max_ticks:  # Пока игра продолжается.
+            place_layout(game, layout, ticks)  # Размещает башни, запланированные на этот шаг.
+            if level.current_wave != wave:  # Проверяет, началась ли новая волна.
+                wave = level.current_wave  # Запоминает текущую волну.
+                money_curve.append(game.settings.starting_money)  # Записывает деньги в начале волны.
+            game.sim_clock.advance()  # Продвигает время симуляции.
+            game.step()  # Выполняет шаг симуляции.
+            ticks += 1  # Увеличивает счетчик шагов.
+        wall_time = time.perf_counter() - start  # Вычисляет затраченное реальное время.
+
+    return {  # Возвращает итоги симуляции.
+        'win': level.all_waves_complete and not game.is_game_over,  # Победа.
+        'game_over': game.is_game_over,  # Поражение.
+        'path': level.current_path['number'],  # Номер пути.
+        'waves_cleared': level.current_wave + (1 if level.all_waves_complete else 0),  # Количество пройденных волн.
+        'leaks': game.leaks,  # Количество врагов, дошедших до конца пути.
+        'money': game.settings.starting_money,  # Деньги в конце симуляции.
+        'money_curve': money_curve,  # Деньги в начале каждой волны.
+        'towers': len(level.towers),  # Количество башен.
+        'ticks': ticks,  # Количество шагов.
+        'sim_time_ms': game.sim_clock.get_ticks(),  # Время симуляции.
+        'wall_time': wall_time,  # Реальное время.
+    }
+
+
+if __name__ == '__main__':  # Проверяет, запущен ли файл напрямую.
+    demo_layout = [('basic', (288, 352)), ('basic', (416, 416)), ('sniper', (672, 480)),
+                   ('basic', (224, 288))]  # Пример расстановки башен.
+    print(run_headless(demo_layout, path_number=1))  # Запускает симуляцию и выводит итоги.
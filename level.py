@@ -1,9 +1,12 @@
-import random  # Импортирует модуль random для работы со случайными числами.
-
 import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
 
-from enemy import Enemy  # Импортирует класс Enemy из файла enemy.py.
+from bullet import BulletPool, ImpactQueue  # Импортирует классы BulletPool и ImpactQueue из файла bullet.py.
+from enemy import EnemyPool  # Импортирует класс EnemyPool из файла enemy.py.
+from movement import MovementEngine  # Импортирует класс MovementEngine из файла movement.py.
+from spatial import SpatialHash  # Импортирует класс SpatialHash из файла spatial.py.
+from targeting import BatchTargeting  # Импортирует класс BatchTargeting из файла targeting.py.
 from tower import BasicTower, SniperTower, MoneyTower  # Импортирует классы башен из файла tower.py.
+from waves import create_wave_source  # Импортирует функцию create_wave_source из файла waves.py.
 
 
 class Level:  # Определяет класс Level, который управляет уровнем игры.
@@ -15,7 +18,15 @@ class Level:  # Определяет класс Level, который управ
         enemies (pygame.sprite.Group): Группа врагов.
         towers (pygame.sprite.Group): Группа башен.
         bullets (pygame.sprite.Group): Группа пуль.
-        waves (list): Список волн врагов.
+        bullet_pool (BulletPool): Пул повторно используемых пуль.
+        enemy_index (SpatialHash): Пространственный индекс врагов для поиска целей.
+        batch_targeting (BatchTargeting): Пакетный выбор целей на NumPy (None - скалярный выбор).
+        impacts (ImpactQueue): Запланированные попадания пуль.
+        movement (MovementEngine): Векторный движок перемещения врагов (None - враги движутся сами).
+        enemy_pool (EnemyPool): Пул повторно используемых врагов.
+        wave_seed (int): Начальное значение генератора бесконечных волн.
+        wave_source (WaveSource): Источник волн, выдающий их по одной.
+        wave (list): Серии текущей волны (тип врага, количество) или None, если волн больше нет.
         current_wave (int): Индекс текущей волны.
         spawned_enemies (int): Количество заспавненных врагов в текущей волне.
         spawn_delay (int): Задержка между спавном врагов.
@@ -36,70 +47,41 @@ class Level:  # Определяет класс Level, который управ
         self.enemies = pygame.sprite.Group()  # Инициализирует группу для хранения врагов.
         self.towers = pygame.sprite.Group()  # Инициализирует группу для хранения башен.
         self.bullets = pygame.sprite.Group()  # Инициализирует группу для хранения пуль.
-
-        # Выбираем случайный путь для врагов
-        self.current_path = random.choice(
+        self.bullet_pool = BulletPool(self.game, self.game.settings.bullet_pool_size)  # Создает пул пуль.
+        self.enemy_pool = EnemyPool(self.game)  # Создает пул врагов.
+        self.enemy_index = SpatialHash(self.game.settings.spatial_cell_size)  # Создает пространственный индекс врагов.
+        self.impacts = ImpactQueue()  # Создает очередь попаданий пуль.
+        self.movement = None  # По умолчанию враги движутся сами.
+        if self.game.settings.movement_mode == 'numpy':  # Проверяет, выбран ли векторный движок перемещения.
+            try:
+                self.movement = MovementEngine(self.game)  # Создает векторный движок перемещения.
+            except ImportError:  # Если NumPy не установлен.
+                print("NumPy is not installed, enemies move individually.")  # Выводит сообщение о переходе на перемещение по одному.
+        self.batch_targeting = None  # По умолчанию цели выбираются каждой башней отдельно.
+        if self.game.settings.targeting_mode == 'numpy':  # Проверяет, выбран ли пакетный выбор целей.
+            try:
+                self.batch_targeting = BatchTargeting()  # Создает пакетный выбор целей.
+            except ImportError:  # Если NumPy не установлен.
+                print("NumPy is not installed, using scalar targeting.")  # Выводит сообщение о переходе на скалярный выбор.
+
+        # Выбираем путь для врагов: заданный в настройках или случайный.
+        # Случайный путь выбирается всегда, чтобы последовательность генератора игры не зависела от настроек.
+        self.current_path = self.game.rng.choice(
             self.game.settings.enemy_paths)  # Выбирает случайный путь для врагов из настроек игры.
-
-        self.waves = [  # Определяет список волн врагов.
-            # Волна 1: 5 базовых врагов
-            [{'path': self.current_path['path'], 'speed': 1, 'health': 100,
-              'image_path': 'assets/enemies/basic_enemy.png', 'reward': 10}] * 5,
-
-            # Волна 2: 7 быстрых врагов
-            [{'path': self.current_path['path'], 'speed': 1.5, 'health': 50,
-              'image_path': 'assets/enemies/fast_enemy.png', 'reward': 5}] * 7,
-
-            # Волна 3: 4 сильных врага
-            [{'path': self.current_path['path'], 'speed': 0.75, 'health': 200,
-              'image_path': 'assets/enemies/strong_enemy.png', 'reward': 20}] * 4,
-
-            # Волна 4: 10 очень быстрых врагов
-            [{'path': self.current_path['path'], 'speed': 2, 'health': 30,
-              'image_path': 'assets/enemies/very_fast_enemy.png', 'reward': 3}] * 10,
-
-            # Волна 5: 3 очень сильных врага
-            [{'path': self.current_path['path'], 'speed': 0.5, 'health': 300,
-              'image_path': 'assets/enemies/very_strong_enemy.png', 'reward': 30}] * 3,
-
-            # Волна 6: Смесь быстрых и сильных врагов
-            [{'path': self.current_path['path'], 'speed': 1.5, 'health': 50,
-              'image_path': 'assets/enemies/fast_enemy.png', 'reward': 5}] * 5 +
-            [{'path': self.current_path['path'], 'speed': 0.75, 'health': 200,
-              'image_path': 'assets/enemies/strong_enemy.png', 'reward': 20}] * 3,
-
-            # Волна 7: Очень быстрые и очень сильные враги
-            [{'path': self.current_path['path'], 'speed': 2, 'health': 30,
-              'image_path': 'assets/enemies/very_fast_enemy.png', 'reward': 3}] * 8 +
-            [{'path': self.current_path['path'], 'speed': 0.5, 'health': 300,
-              'image_path': 'assets/enemies/very_strong_enemy.png', 'reward': 30}] * 2,
-
-            # Волна 8: Большое количество базовых врагов
-            [{'path': self.current_path['path'], 'speed': 1, 'health': 100,
-              'image_path': 'assets/enemies/basic_enemy.png', 'reward': 10}] * 15,
-
-            # Волна 9: Смесь всех типов врагов
-            [{'path': self.current_path['path'], 'speed': 1, 'health': 100,
-              'image_path': 'assets/enemies/basic_enemy.png', 'reward': 10}] * 5 +
-            [{'path': self.current_path['path'], 'speed': 1.5, 'health': 50,
-              'image_path': 'assets/enemies/fast_enemy.png', 'reward': 5}] * 5 +
-            [{'path': self.current_path['path'], 'speed': 0.75, 'health': 200,
-              'image_path': 'assets/enemies/strong_enemy.png', 'reward': 20}] * 3 +
-            [{'path': self.current_path['path'], 'speed': 2, 'health': 30,
-              'image_path': 'assets/enemies/very_fast_enemy.png', 'reward': 3}] * 5 +
-            [{'path': self.current_path['path'], 'speed': 0.5, 'health': 300,
-              'image_path': 'assets/enemies/very_strong_enemy.png', 'reward': 30}] * 2,
-
-            # Волна 10: Финальная волна с большим количеством сильных врагов
-            [{'path': self.current_path['path'], 'speed': 0.75, 'health': 200,
-              'image_path': 'assets/enemies/strong_enemy.png', 'reward': 20}] * 10 +
-            [{'path': self.current_path['path'], 'speed': 0.5, 'health': 300,
-              'image_path': 'assets/enemies/very_strong_enemy.png', 'reward': 30}] * 5,
-        ]
+        if self.game.settings.path_number is not None:  # Проверяет, задан ли номер пути в настройках.
+            self.current_path = next(enemy_path for enemy_path in self.game.settings.enemy_paths if
+                                     enemy_path['number'] == self.game.settings.path_number)  # Выбирает заданный путь.
+
+        self.wave_seed = self.game.settings.wave_seed  # Получает начальное значение бесконечных волн из настроек.
+        if self.wave_seed is None:  # Проверяет, задано ли начальное значение.
+            self.wave_seed = self.game.rng.randrange(2 ** 32)  # Получает начальное значение из генератора игры.
+        self.wave_source = create_wave_source(self.game.settings.wave_mode,
+                                              self.wave_seed)  # Создает источник волн.
+        self.wave = self.wave_source.next_wave()  # Получает первую волну.
         self.current_wave = 0  # Устанавливает индекс текущей волны на 0.
         self.spawned_enemies = 0  # Устанавливает количество заспавненных врагов на 0.
         self.spawn_delay = 1000  # Устанавливает задержку между спавном врагов (в миллисекундах).
-        self.last_spawn_time = pygame.time.get_ticks()  # Записывает время последнего спавна врага.
+        self.last_spawn_time = self.game.sim_clock.get_ticks()  # Записывает время последнего спавна врага.
         self.all_waves_complete = False  # Устанавливает флаг завершения всех волн в False.
         self.start_next_wave()  # Запускает первую волну.
         self.font = pygame.font.SysFont("Arial", 24)  # Загружает шрифт для отображения текста.
@@ -108,20 +90,83 @@ class Level:  # Определяет класс Level, который управ
         """
         Запускает следующую волну врагов.
         """
-        if self.current_wave < len(self.waves):  # Проверяет, есть ли еще волны.
+        if self.wave is not None:  # Проверяет, есть ли еще волны.
             self.spawned_enemies = 0  # Сбрасывает количество заспавненных врагов.
             self.spawn_next_enemy()  # Спавнит первого врага в новой волне.
 
+    def advance_wave(self):  # Метод для перехода к следующей волне.
+        """
+        Получает следующую волну из источника волн.
+        """
+        self.current_wave += 1  # Увеличивает индекс текущей волны.
+        self.wave = self.wave_source.next_wave()  # Получает следующую волну.
+
+    def waves_left(self):  # Метод для получения количества оставшихся волн.
+        """
+        Возвращает количество оставшихся волн, включая текущую.
+
+        Returns:
+            int: Количество оставшихся волн или None, если волны не заканчиваются.
+        """
+        if self.wave_source.total is None:  # Проверяет, известно ли количество волн.
+            return None  # Волны не заканчиваются.
+        return self.wave_source.total - self.current_wave  # Возвращает количество оставшихся волн.
+
+    def wave_size(self):  # Метод для получения количества врагов в текущей волне.
+        """
+        Возвращает количество врагов в текущей волне.
+
+        Returns:
+            int: Количество врагов.
+        """
+        return sum(count for _, count in self.wave)  # Складывает количество врагов во всех сериях.
+
+    def enemy_type_at(self, enemy_number):  # Метод для получения типа врага по его номеру в текущей волне.
+        """
+        Возвращает тип врага с заданным номером в текущей волне.
+
+        Args:
+            enemy_number (int): Номер врага в волне.
+
+        Returns:
+            EnemyType: Тип врага.
+        """
+        for enemy_type, count in self.wave:  # Перебирает серии волны.
+            if enemy_number < count:  # Проверяет, попадает ли номер в серию.
+                return enemy_type  # Возвращает тип врага серии.
+            enemy_number -= count  # Переходит к следующей серии.
+        raise IndexError(enemy_number)  # Номер больше количества врагов в волне.
+
     def spawn_next_enemy(self):  # Метод для спавна следующего врага.
         """
         Спавнит следующего врага в текущей волне.
         """
-        if self.spawned_enemies < len(self.waves[self.current_wave]):  # Проверяет, есть ли еще враги в текущей волне.
-            enemy_info = self.waves[self.current_wave][self.spawned_enemies]  # Получает информацию о следующем враге.
-            new_enemy = Enemy(**enemy_info, game=self.game)  # Создает нового врага.
-            self.enemies.add(new_enemy)  # Добавляет врага в группу врагов.
+        if self.spawned_enemies < self.wave_size():  # Проверяет, есть ли еще враги в текущей волне.
+            enemy_type = self.enemy_type_at(self.spawned_enemies)  # Получает тип следующего врага.
+            new_enemy = self.enemy_pool.acquire(enemy_type, self.current_path['path'])  # Получает врага из пула.
+            self.add_enemy(new_enemy)  # Добавляет врага на уровень.
             self.spawned_enemies += 1  # Увеличивает счетчик заспавненных врагов.
 
+    def add_enemy(self, enemy):  # Метод для добавления врага на уровень.
+        """
+        Добавляет врага в группу врагов и в движок перемещения, если он используется.
+
+        Args:
+            enemy (Enemy): Новый враг.
+        """
+        self.enemies.add(enemy)  # Добавляет врага в группу врагов.
+        if self.movement is not None:  # Проверяет, используется ли движок перемещения.
+            self.movement.add(enemy)  # Добавляет врага в движок перемещения.
+
+    def store_previous_positions(self):  # Метод для запоминания позиций врагов перед шагом.
+        """
+        Запоминает текущие позиции врагов, чтобы отрисовка могла сгладить движение между двумя шагами.
+
+        Вызывается один раз за кадр, перед последним шагом симуляции этого кадра.
+        """
+        for enemy in self.enemies:  # Перебирает всех врагов.
+            enemy.previous_position.update(enemy.position)  # Запоминает позицию врага.
+
     def attempt_place_tower(self, mouse_pos, tower_type):  # Метод для попытки размещения башни.
         tower_classes = {  # Словарь с типами башен и их классами.
             'basic': BasicTower,
@@ -133,6 +178,7 @@ class Level:  # Определяет класс Level, который управ
             if self.game.grid.is_spot_available(grid_pos):  # Проверяет, доступна ли позиция для размещения башни.
                 self.game.settings.starting_money -= self.game.settings.tower_cost  # Уменьшает количество денег на стоимость башни.
                 new_tower = tower_classes[tower_type](grid_pos, self.game)  # Создает новую башню.
+                self.game.grid.place_tower(new_tower)  # Отмечает клетку как занятую башней.
                 self.towers.add(new_tower)  # Добавляет башню в группу башен.
                 print("Tower placed.")  # Выводит сообщение о размещении башни.
             else:
@@ -145,41 +191,49 @@ class Level:  # Определяет класс Level, который управ
         """
         Обновляет состояние уровня, включая врагов, башни и пули.
         """
-        current_time = pygame.time.get_ticks()  # Получает текущее время.
-
-        if self.current_wave < len(self.waves) and self.spawned_enemies < len(
-                self.waves[self.current_wave]):  # Проверяет, есть ли еще враги для спавна.
-            if current_time - self.last_spawn_time > self.spawn_delay:  # Проверяет, прошла ли задержка для спавна следующего врага.
-                enemy_info = self.waves[self.current_wave][
-                    self.spawned_enemies].copy()  # Копирует информацию о следующем враге.
-                enemy_info['game'] = self.game  # Добавляет ссылку на игру в информацию о враге.
-                new_enemy = Enemy(**enemy_info)  # Создает нового врага.
-                self.enemies.add(new_enemy)  # Добавляет врага в группу врагов.
-                self.spawned_enemies += 1  # Увеличивает счетчик заспавненных врагов.
-                self.last_spawn_time = current_time  # Обновляет время последнего спавна.
-
-        collisions = pygame.sprite.groupcollide(self.bullets, self.enemies, True,
-                                                False)  # Проверяет столкновения между пулями и врагами.
-        for bullet in collisions:  # Перебирает все столкнувшиеся пули.
-            for enemy in collisions[bullet]:  # Перебирает всех столкнувшихся врагов.
-                enemy.take_damage(bullet.damage)  # Наносит урон врагу.
-
-        self.enemies.update()  # Обновляет состояние всех врагов.
-        for tower in self.towers:  # Перебирает все башни.
-            tower.update(self.enemies, current_time, self.bullets)  # Обновляет состояние башни.
-        self.bullets.update()  # Обновляет состояние всех пуль.
-
-        if len(self.enemies) == 0 and self.current_wave < len(
-                self.waves) - 1:  # Проверяет, закончилась ли текущая волна.
-            self.current_wave += 1  # Переходит к следующей волне.
+        current_time = self.game.sim_clock.get_ticks()  # Получает текущее игровое время.
+        profiler = self.game.profiler  # Получает профилировщик фаз кадра.
+
+        with profiler.scope('spawn'):  # Измеряет время спавна врагов.
+            if self.wave is not None and self.spawned_enemies < self.wave_size():  # Проверяет, есть ли еще враги для спавна.
+                if current_time - self.last_spawn_time > self.spawn_delay:  # Проверяет, прошла ли задержка для спавна следующего врага.
+                    self.spawn_next_enemy()  # Спавнит следующего врага.
+                    self.last_spawn_time = current_time  # Обновляет время последнего спавна.
+
+        with profiler.scope('movement'):  # Измеряет время перемещения врагов.
+            if self.movement is not None:  # Проверяет, используется ли движок перемещения.
+                self.movement.step()  # Перемещает всех врагов одним векторным шагом.
+            self.enemies.update()  # Обновляет состояние всех врагов.
+
+        with profiler.scope('targeting'):  # Измеряет время выбора целей и стрельбы башен.
+            self.enemy_index.rebuild(self.enemies)  # Перестраивает пространственный индекс по новым позициям врагов.
+            if self.batch_targeting is None:  # Проверяет, используется ли скалярный выбор целей.
+                for tower in self.towers:  # Перебирает все башни.
+                    tower.update(self.enemy_index, current_time, self.bullets)  # Обновляет состояние башни.
+            else:
+                for tower, target in self.batch_targeting.resolve(self.towers, self.enemies,
+                                                                  current_time):  # Перебирает башни с найденными целями.
+                    if not target.in_use:  # Проверяет, не уничтожена ли цель другой башней в этом шаге.
+                        target = tower.find_target(self.enemy_index)  # Выбирает новую цель среди живых врагов.
+                    if target:  # Если цель найдена.
+                        tower.fire(target, current_time, self.bullets)  # Стреляет по цели.
+                for tower in self.towers:  # Перебирает все башни.
+                    if tower.targeting is None:  # Проверяет, что башня не стреляет.
+                        tower.update(self.enemy_index, current_time, self.bullets)  # Обновляет состояние башни.
+
+        with profiler.scope('bullets'):  # Измеряет время обработки попаданий.
+            self.impacts.resolve(self.game.sim_clock.ticks, self.enemy_index)  # Обрабатывает попадания, шаг которых наступил.
+
+        if len(self.enemies) == 0 and self.wave_source.has_next():  # Проверяет, закончилась ли текущая волна.
+            self.advance_wave()  # Переходит к следующей волне.
             self.start_next_wave()  # Запускает следующую волну.
-        elif len(self.enemies) == 0 and self.current_wave == len(
-                self.waves) - 1:  # Проверяет, закончились ли все волны.
+            self.game.autosave()  # Сохраняет состояние на границе волн.
+        elif len(self.enemies) == 0:  # Проверяет, закончились ли все волны.
             self.all_waves_complete = True  # Устанавливает флаг завершения всех волн.
 
     def draw_path(self, screen):  # Метод для отрисовки пути врагов.
         """
-        Отрисовывает путь врагов на экране.
+        Отрисовывает путь врагов и места для башен (вызывается при перерисовке StaticLayer).
 
         Args:
             screen (pygame.Surface): Поверхность для отрисовки.
@@ -195,22 +249,31 @@ class Level:  # Определяет класс Level, который управ
         Args:
             screen (pygame.Surface): Поверхность для отрисовки.
         """
-        self.draw_path(screen)  # Отрисовывает путь врагов.
-        self.enemies.draw(screen)  # Отрисовывает всех врагов.
-        self.towers.draw(screen)  # Отрисовывает все башни.
-        self.bullets.draw(screen)  # Отрисовывает все пули.
-
-        # Отображаем номер выбранного пути
-        path_number_text = self.font.render(f"Path: {self.current_path['number']}", True,
-                                            (255, 255, 255))  # Создает текст с номером пути.
-        screen.blit(path_number_text, (10, 130))  # Рисует текст с номером пути на экране.
-
-        mouse_pos = pygame.mouse.get_pos()  # Получает текущую позицию мыши.
-        for tower in self.towers:  # Перебирает все башни.
-            tower.draw(screen)  # Отрисовывает башню.
-            if tower.is_hovered(mouse_pos):  # Проверяет, наведена ли мышь на башню.
-                tower_stats_text = self.font.render(f"Damage: {tower.damage}, Range: {tower.tower_range}", True,
-                                                    # Создает текст с характеристиками башни.
-                                                    (255, 255, 255))
+        profiler = self.game.profiler  # Получает профилировщик фаз кадра.
+        alpha = self.game.frame_alpha  # Получает долю следующего шага, накопленную к кадру.
+        with profiler.scope('draw_sprites'):  # Измеряет время отрисовки спрайтов.
+            if alpha < 1:  # Проверяет, нужно ли сглаживать движение врагов.
+                for enemy in self.enemies:  # Перебирает всех врагов.
+                    enemy.interpolate(alpha)  # Перемещает врага между двумя последними шагами.
+            self.enemies.draw(screen)  # Отрисовывает всех врагов.
+            self.towers.draw(screen)  # Отрисовывает все башни.
+            tick = self.game.sim_clock.ticks - 1 + alpha  # Получает шаг симуляции, соответствующий кадру.
+            for bullet in self.bullets:  # Перебирает все пули.
+                bullet.interpolate(tick)  # Перемещает пулю между точкой выстрела и точкой попадания.
+            self.bullets.draw(screen)  # Отрисовывает все пули.
+
+        with profiler.scope('draw_text'):  # Измеряет время отрисовки текста уровня.
+            # Отображаем номер выбранного пути
+            path_number_text = self.game.text.render(self.font, f"Path: {self.current_path['number']}",
+                                                     (255, 255, 255))  # Получает текст с номером пути.
+            screen.blit(path_number_text, (10, 130))  # Рисует текст с номером пути на экране.
+
+            tower = self.game.grid.tower_at(pygame.mouse.get_pos())  # Получает башню под мышью.
+            if tower is not None:  # Проверяет, наведена ли мышь на башню.
+                tower.draw(screen)  # Отрисовывает подсказку башни.
+                tower_stats_text = self.game.text.render(self.font,
+                                                         f"Damage: {tower.damage}, Range: {tower.tower_range}",
+                                                         # Получает текст с характеристиками башни.
+                                                         (255, 255, 255))
                 screen.blit(tower_stats_text,
                             (tower.rect.x, tower.rect.y - 20))  # Рисует текст с характеристиками башни над башней.
@@ -1,10 +1,23 @@
+import argparse  # Импортирует модуль argparse для разбора аргументов командной строки.
+import os  # Импортирует модуль os для работы с переменными окружения.
+import random  # Импортирует модуль random для генератора случайных чисел игры.
 import sys  # Импортирует модуль sys для работы с системными функциями.
+import time  # Импортирует модуль time для измерения времени кадра.
 
 import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
 
+from assets import AssetManager  # Импортирует класс AssetManager из файла assets.py.
+from audio import AudioManager  # Импортирует класс AudioManager из файла audio.py.
+from clock import SimulationClock  # Импортирует класс SimulationClock из файла clock.py.
 from grid import Grid  # Импортирует класс Grid из файла grid.py.
 from level import Level  # Импортирует класс Level из файла level.py.
+from profiler import FrameProfiler  # Импортирует класс FrameProfiler из файла profiler.py.
+from recording import InputRecorder, check_seed  # Импортирует запись действий из файла recording.py.
+from render import DirtyRectRenderer  # Импортирует класс DirtyRectRenderer из файла render.py.
 from settings import Settings  # Импортирует класс Settings из файла settings.py.
+from snapshot import SnapshotWriter, load_snapshot, read_snapshot, save_snapshot  # Импортирует снимки из файла snapshot.py.
+from static_layer import StaticLayer  # Импортирует класс StaticLayer из файла static_layer.py.
+from text import TextCache, TextWidget  # Импортирует классы TextCache и TextWidget из файла text.py.
 
 
 class TowerDefenseGame:  # Определяет основной класс игры TowerDefenseGame.
@@ -15,45 +28,117 @@ class TowerDefenseGame:  # Определяет основной класс иг
         settings (Settings): Настройки игры.
         screen (pygame.Surface): Поверхность для отрисовки.
         clock (pygame.time.Clock): Таймер для управления FPS.
+        sim_clock (SimulationClock): Источник игрового времени для спавна, перезарядки и дохода.
+        speed_multiplier (int): Выбранный игроком множитель скорости игры.
+        effective_speed (int): Фактический множитель скорости игры после адаптации.
+        sim_rate (float): Измеренная скорость симуляции (шагов в секунду).
+        tick_accumulator (float): Накопленное, но еще не выполненное количество шагов симуляции.
+        last_frame_time (float): Реальное время начала прошлого кадра.
+        frame_alpha (float): Доля следующего шага, накопленная к кадру (1 - отрисовка без сглаживания).
+        seed (int): Начальное значение генератора случайных чисел игры.
+        rng (random.Random): Генератор случайных чисел игры (выбор пути, бесконечные волны).
+        headless (bool): Флаг запуска без окна и звука.
+        assets (AssetManager): Общий кэш изображений.
+        text (TextCache): Общий кэш отрисованного текста.
+        profiler (FrameProfiler): Профилировщик фаз кадра.
         background (pygame.Surface): Фон игры.
         level (Level): Объект уровня.
         grid (Grid): Объект сетки для размещения башен.
+        static_layer (StaticLayer): Заранее нарисованный слой с фоном, путем и позициями башен.
+        renderer (DirtyRectRenderer): Отрисовка измененных прямоугольников (None - весь экран каждый кадр).
         font (pygame.font.Font): Шрифт для текста.
-        shoot_sound (pygame.mixer.Sound): Звук выстрела.
+        hud_widgets (dict): Строки интерфейса по имени.
+        audio (AudioManager): Менеджер воспроизведения звуков.
         selected_tower_type (str): Выбранный тип башни ('basic' или 'sniper').
         is_game_over (bool): Флаг окончания игры.
+        leaks (int): Количество врагов, дошедших до конца пути.
+        recorder (InputRecorder): Запись действий игрока (None - запись выключена).
+        replaying (bool): Флаг воспроизведения записи (ввод игрока не принимается).
+        snapshot_writer (SnapshotWriter): Фоновая запись снимков на диск (None - без окна снимки не пишутся).
     """
 
-    def __init__(self):  # Конструктор класса TowerDefenseGame.
+    def __init__(self, sound=True, headless=False, clock=None, settings=None,
+                 assets=None):  # Конструктор класса TowerDefenseGame.
         """
         Инициализация игры.
+
+        Args:
+            sound (bool): Включен ли звук (False - для запусков без звука).
+            headless (bool): Запуск без окна и звука через фиктивные драйверы SDL.
+            clock (SimulationClock): Источник игрового времени (None - шаги по 1/60 секунды).
+            settings (Settings): Настройки игры (None - настройки по умолчанию).
+            assets (AssetManager): Уже загруженный кэш изображений (None - загрузить новый).
         """
+        self.headless = headless  # Сохраняет флаг запуска без окна.
+        if headless:  # Проверяет, нужен ли запуск без окна.
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'  # Включает фиктивный видеодрайвер SDL.
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'  # Включает фиктивный аудиодрайвер SDL.
+            os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'  # Оставляет обработку SIGINT и SIGTERM процессу.
+            sound = False  # Отключает звук.
         pygame.init()  # Инициализирует библиотеку Pygame.
-        self.settings = Settings()  # Создает объект настроек игры.
+        self.settings = settings if settings is not None else Settings()  # Создает объект настроек игры.
         self.screen = pygame.display.set_mode(
             (self.settings.screen_width, self.settings.screen_height))  # Создает окно игры с заданными размерами.
         pygame.display.set_caption("Tower Defense Game")  # Устанавливает заголовок окна.
         self.clock = pygame.time.Clock()  # Создает объект таймера для управления FPS.
+        self.sim_clock = clock if clock is not None else SimulationClock()  # Устанавливает источник игрового времени.
+        self.speed_multiplier = 1  # Устанавливает обычную скорость игры.
+        self.effective_speed = 1  # Устанавливает фактическую скорость игры.
+        self.sim_rate = 0.0  # Инициализирует измеренную скорость симуляции.
+        self.sim_rate_ticks = 0  # Инициализирует счетчик шагов для измерения скорости симуляции.
+        self.sim_rate_start = time.perf_counter()  # Запоминает начало измерения скорости симуляции.
+        self.tick_accumulator = 0.0  # Инициализирует накопленное количество шагов.
+        self.last_frame_time = time.perf_counter()  # Запоминает время начала кадра.
+        self.frame_alpha = 1.0  # Отрисовывает текущее состояние без сглаживания.
+        self.seed = self.settings.random_seed  # Получает начальное значение из настроек.
+        if self.seed is None:  # Проверяет, задано ли начальное значение.
+            self.seed = random.randrange(2 ** 32)  # Выбирает случайное начальное значение.
+        self.rng = random.Random(self.seed)  # Создает генератор случайных чисел игры.
+
+        self.profiler = FrameProfiler()  # Создает профилировщик фаз кадра (выключен по умолчанию).
+        if assets is not None:  # Проверяет, передан ли уже загруженный кэш изображений.
+            self.assets = assets  # Использует переданный кэш изображений.
+        else:
+            self.assets = AssetManager(self.settings)  # Создает общий кэш изображений.
+            self.assets.preload()  # Загружает изображения башен, врага и пули заранее.
+        self.text = TextCache(self.settings.text_cache_size)  # Создает общий кэш отрисованного текста.
 
-        self.background = pygame.image.load(
-            self.settings.background_image).convert()  # Загружает изображение фона игры.
-        self.background = pygame.transform.scale(self.background,  # Масштабирует фон до размеров экрана.
-                                                 (self.settings.screen_width, self.settings.screen_height))
+        self.background = self.assets.get_image(  # Загружает фон игры, масштабированный до размеров экрана.
+            self.settings.background_image, (self.settings.screen_width, self.settings.screen_height), alpha=False)
+
+        self.audio = AudioManager(self.settings, enabled=sound)  # Загружает звуки и резервирует каналы микшера.
 
         self.level = Level(self)  # Создает объект уровня игры.
         self.grid = Grid(self)  # Создает объект сетки для размещения башен.
+        self.static_layer = StaticLayer(self)  # Создает неизменный слой карты.
+        self.renderer = None  # По умолчанию экран перерисовывается целиком.
+        if self.settings.render_mode == 'dirty':  # Проверяет, выбран ли режим измененных прямоугольников.
+            self.renderer = DirtyRectRenderer(self, self.settings.dirty_area_threshold)  # Создает отрисовку измененных прямоугольников.
 
         self.font = pygame.font.SysFont("Arial", 24)  # Загружает шрифт для отображения текста.
+        self.hud_widgets = {  # Создает строки интерфейса, отрисовываемые заново только при изменении значений.
+            'money': TextWidget(self.font, "Money: ${}", (10, 10)),
+            'tower': TextWidget(self.font, "Selected Tower: {}", (10, 40)),
+            'waves': TextWidget(self.font, "Waves Left: {}", (10, 70)),
+            'enemies': TextWidget(self.font, "Enemies Left: {}", (10, 100)),
+            'speed': TextWidget(self.font, "Speed: x{}/{} ({} ticks/s)", (10, 160)),
+        }
 
-        self.shoot_sound = pygame.mixer.Sound(self.settings.shoot_sound)  # Загружает звук выстрела.
         self.selected_tower_type = 'basic'  # Устанавливает выбранный тип башни по умолчанию.
         self.is_game_over = False  # Устанавливает флаг окончания игры в False.
+        self.leaks = 0  # Инициализирует счетчик врагов, дошедших до конца пути.
+        self.recorder = None  # По умолчанию действия игрока не записываются.
+        if self.settings.record_path:  # Проверяет, задан ли файл записи.
+            self.recorder = InputRecorder(self)  # Создает запись действий игрока.
+        self.replaying = False  # Устанавливает флаг воспроизведения записи.
+        self.snapshot_writer = None if headless else SnapshotWriter()  # Запускает фоновую запись снимков.
 
     def game_over(self):  # Метод для установки флага окончания игры.
         """
-        Устанавливает флаг окончания игры.
+        Устанавливает флаг окончания игры и учитывает врага, дошедшего до конца пути.
         """
         self.is_game_over = True  # Устанавливает флаг окончания игры в True.
+        self.leaks += 1  # Увеличивает счетчик врагов, дошедших до конца пути.
 
     def is_position_inside(self, pos):  # Метод для проверки, находится ли позиция внутри игрового экрана.
         """
@@ -74,18 +159,32 @@ class TowerDefenseGame:  # Определяет основной класс иг
         """
         for event in pygame.event.get():  # Перебирает все события в очереди.
             if event.type == pygame.QUIT:  # Проверяет, была ли нажата кнопка закрытия окна.
+                if self.recorder is not None:  # Проверяет, записываются ли действия игрока.
+                    self.recorder.save(self.settings.record_path)  # Сохраняет запись.
+                    print(f"Replay saved to {self.settings.record_path}.")  # Выводит сообщение в консоль.
+                if self.snapshot_writer is not None:  # Проверяет, запущена ли запись снимков.
+                    self.snapshot_writer.close()  # Дописывает снимки из очереди.
                 pygame.quit()  # Завершает работу Pygame.
                 sys.exit()  # Завершает выполнение программы.
             elif event.type == pygame.KEYDOWN:  # Проверяет, была ли нажата клавиша.
                 if event.key == pygame.K_1:  # Проверяет, была ли нажата клавиша '1'.
-                    self.selected_tower_type = 'basic'  # Устанавливает выбранный тип башни на 'basic'.
-                    print("Selected basic tower.")  # Выводит сообщение в консоль.
+                    self._player_action('select', 'basic')  # Выбирает тип башни 'basic'.
                 elif event.key == pygame.K_2:  # Проверяет, была ли нажата клавиша '2'.
-                    self.selected_tower_type = 'sniper'  # Устанавливает выбранный тип башни на 'sniper'.
-                    print("Selected sniper tower.")  # Выводит сообщение в консоль.
+                    self._player_action('select', 'sniper')  # Выбирает тип башни 'sniper'.
                 elif event.key == pygame.K_3:  # Проверяет, была ли нажата клавиша '3'.
-                    self.selected_tower_type = 'money'  # Устанавливает выбранный тип башни на 'money'.
-                    print("Selected money tower.")  # Выводит сообщение в консоль.
+                    self._player_action('select', 'money')  # Выбирает тип башни 'money'.
+                elif event.key == pygame.K_f:  # Проверяет, была ли нажата клавиша 'F'.
+                    self.cycle_speed()  # Переключает скорость игры.
+                elif event.key == pygame.K_F3:  # Проверяет, была ли нажата клавиша 'F3'.
+                    self.profiler.toggle()  # Включает или выключает профилировщик.
+                elif event.key == pygame.K_F4:  # Проверяет, была ли нажата клавиша 'F4'.
+                    self.profiler.dump_csv(self.settings.profile_csv)  # Сохраняет историю кадров в CSV.
+                    self.profiler.dump_chrome_trace(self.settings.profile_trace)  # Сохраняет трассу Chrome.
+                    print("Profile saved.")  # Выводит сообщение в консоль.
+                elif event.key == pygame.K_F5:  # Проверяет, была ли нажата клавиша 'F5'.
+                    self.save_snapshot(self.settings.quicksave_path)  # Сохраняет состояние игры.
+                elif event.key == pygame.K_F9:  # Проверяет, была ли нажата клавиша 'F9'.
+                    self.load_snapshot(self.settings.quicksave_path)  # Загружает состояние игры.
                 elif event.key == pygame.K_SPACE:  # Проверяет, была ли нажата клавиша 'Пробел'.
                     self.grid.show_spots = not self.grid.show_spots  # Переключает флаг отображения позиций на сетке.
                     print("Show spots:", self.grid.show_spots)  # Выводит сообщение в консоль.
@@ -93,15 +192,87 @@ class TowerDefenseGame:  # Определяет основной класс иг
                 if event.button == 1:  # Проверяет, была ли нажата левая кнопка мыши.
                     if self.selected_tower_type:  # Проверяет, выбран ли тип башни.
                         mouse_pos = pygame.mouse.get_pos()  # Получает текущую позицию мыши.
-                        self.level.attempt_place_tower(mouse_pos,
-                                                       self.selected_tower_type)  # Пытается разместить башню.
+                        self._player_action('place', self.selected_tower_type, mouse_pos)  # Пытается разместить башню.
                     else:
                         print("No tower type selected.")  # Выводит сообщение, если тип башни не выбран.
                 elif event.button == 3:  # Проверяет, была ли нажата правая кнопка мыши.
                     mouse_pos = pygame.mouse.get_pos()  # Получает текущую позицию мыши.
-                    for tower in self.level.towers:  # Перебирает все башни.
-                        if tower.is_hovered(mouse_pos):  # Проверяет, наведена ли мышь на башню.
-                            tower.upgrade()  # Улучшает башню.
+                    if self.grid.tower_at(mouse_pos) is not None:  # Проверяет, наведена ли мышь на башню.
+                        self._player_action('upgrade', position=mouse_pos)  # Улучшает башню.
+
+    def _player_action(self, action, tower_type=None, position=None):  # Метод для выполнения действия игрока из событий.
+        """
+        Выполняет действие игрока из событий; во время воспроизведения записи ввод игрока не принимается.
+
+        Args:
+            action (str): Действие: 'select', 'place' или 'upgrade'.
+            tower_type (str): Тип башни для 'select' и 'place'.
+            position (tuple): Позиция мыши для 'place' и 'upgrade'.
+        """
+        if not self.replaying:  # Проверяет, не воспроизводится ли запись.
+            self.perform_action(action, tower_type, position)  # Выполняет действие.
+
+    def perform_action(self, action, tower_type=None, position=None):  # Метод для выполнения действия игрока.
+        """
+        Выполняет действие игрока и записывает его с текущим шагом симуляции, если запись включена.
+
+        Все действия, влияющие на игру, проходят через этот метод, поэтому запись и воспроизведение
+        выполняют один и тот же код.
+
+        Args:
+            action (str): Действие: 'select' - выбор типа башни, 'place' - постройка, 'upgrade' - улучшение.
+            tower_type (str): Тип башни для 'select' и 'place'.
+            position (tuple): Позиция для 'place' и 'upgrade'.
+        """
+        if self.recorder is not None:  # Проверяет, записываются ли действия игрока.
+            self.recorder.record(self.sim_clock.ticks, action, tower_type, position)  # Записывает действие.
+        if action == 'select':  # Проверяет, выбран ли тип башни.
+            self.selected_tower_type = tower_type  # Устанавливает выбранный тип башни.
+            print(f"Selected {tower_type} tower.")  # Выводит сообщение в консоль.
+        elif action == 'place':  # Проверяет, строится ли башня.
+            self.level.attempt_place_tower(position, tower_type)  # Пытается разместить башню.
+        elif action == 'upgrade':  # Проверяет, улучшается ли башня.
+            tower = self.grid.tower_at(position)  # Получает башню в клетке.
+            if tower is not None:  # Проверяет, есть ли башня в клетке.
+                tower.upgrade()  # Улучшает башню.
+
+    def save_snapshot(self, path):  # Метод для сохранения снимка состояния игры.
+        """
+        Упаковывает состояние игры и передает его фоновой записи на диск.
+
+        Args:
+            path (str): Путь к файлу снимка.
+        """
+        if self.snapshot_writer is not None:  # Проверяет, запущена ли запись снимков.
+            self.snapshot_writer.submit(path, save_snapshot(self))  # Ставит снимок в очередь записи.
+            print(f"Snapshot saved to {path}.")  # Выводит сообщение в консоль.
+
+    def load_snapshot(self, path):  # Метод для загрузки снимка состояния игры.
+        """
+        Загружает состояние игры из файла снимка.
+
+        Во время записи или воспроизведения действий загрузка запрещена: она не записывается как действие
+        игрока, и запись перестала бы воспроизводиться.
+
+        Args:
+            path (str): Путь к файлу снимка.
+        """
+        if self.recorder is not None or self.replaying:  # Проверяет, записываются или воспроизводятся ли действия.
+            print("Snapshot not loaded: input is being recorded or replayed.")  # Выводит сообщение в консоль.
+            return  # Прерывает загрузку.
+        try:
+            load_snapshot(self, read_snapshot(path))  # Восстанавливает состояние игры.
+        except (OSError, ValueError) as error:  # Если файла нет или он поврежден.
+            print(f"Snapshot not loaded: {error}")  # Выводит сообщение об ошибке.
+        else:
+            print(f"Snapshot loaded from {path}.")  # Выводит сообщение в консоль.
+
+    def autosave(self):  # Метод для автосохранения.
+        """
+        Сохраняет снимок в файл автосохранения (вызывается уровнем на границе волн).
+        """
+        if self.settings.autosave_path:  # Проверяет, включено ли автосохранение.
+            self.save_snapshot(self.settings.autosave_path)  # Сохраняет снимок.
 
     def _update_game(self):  # Метод для обновления состояния игры.
         """
@@ -110,12 +281,78 @@ class TowerDefenseGame:  # Определяет основной класс иг
         self.level.update()  # Обновляет состояние уровня.
         self.grid.update()  # Обновляет состояние сетки.
 
+    def step(self):  # Метод для выполнения одного шага симуляции.
+        """
+        Выполняет один шаг симуляции: обновляет уровень и запускает следующую волну, если текущая закончилась.
+        """
+        self._update_game()  # Обновляет состояние игры.
+
+        if len(self.level.enemies) == 0 and not self.level.all_waves_complete:  # Проверяет, закончилась ли текущая волна.
+            self.level.start_next_wave()  # Запускает следующую волну.
+
+    def cycle_speed(self):  # Метод для переключения скорости игры.
+        """
+        Переключает скорость игры на следующую из Settings.speed_levels.
+        """
+        levels = self.settings.speed_levels  # Получает доступные скорости.
+        index = levels.index(self.speed_multiplier) if self.speed_multiplier in levels else -1  # Находит текущую скорость.
+        self.speed_multiplier = levels[(index + 1) % len(levels)]  # Выбирает следующую скорость.
+        self.effective_speed = self.speed_multiplier  # Сбрасывает фактическую скорость.
+        print(f"Game speed: x{self.speed_multiplier}")  # Выводит сообщение в консоль.
+
+    def _run_simulation(self):  # Метод для выполнения шагов симуляции за один кадр.
+        """
+        Выполняет шаги симуляции, накопившиеся за реальное время кадра, и подстраивает скорость под бюджет кадра.
+
+        Шаги идут с частотой часов симуляции (1000 / step_ms, скорости врагов и пуль заданы за шаг),
+        умноженной на фактическую скорость, независимо от частоты кадров:
+        медленный кадр выполняет несколько шагов, быстрый - ни одного. Доля следующего шага сохраняется
+        в frame_alpha, чтобы отрисовка сгладила движение между двумя последними шагами.
+
+        Если шаги не укладываются в бюджет, фактическая скорость уменьшается вдвое; если занимают
+        меньше половины бюджета, она увеличивается вдвое, но не выше выбранной игроком.
+        """
+        self.audio.new_tick()  # Начинает новый кадр для объединения одинаковых звуков.
+        now = time.perf_counter()  # Получает время начала кадра.
+        tick_rate = 1000 / self.sim_clock.step_ms  # Вычисляет частоту шагов симуляции при скорости x1.
+        self.tick_accumulator += (now - self.last_frame_time) * tick_rate * self.effective_speed  # Накапливает шаги.
+        self.last_frame_time = now  # Запоминает время начала кадра.
+        steps = int(self.tick_accumulator)  # Получает количество целых шагов.
+        max_steps = self.settings.max_frame_ticks * self.effective_speed  # Вычисляет наибольшее количество шагов за кадр.
+        if steps > max_steps:  # Проверяет, отстает ли симуляция слишком сильно.
+            steps = max_steps  # Ограничивает количество шагов.
+            self.tick_accumulator = float(steps)  # Отбрасывает шаги, которые не успеть догнать.
+        self.tick_accumulator -= steps  # Вычитает выполняемые шаги.
+        interpolate = self.settings.interpolate_rendering  # Получает флаг сглаживания движения.
+
+        start = time.perf_counter()  # Запоминает время начала шагов.
+        for index in range(steps):  # Выполняет шаги симуляции.
+            if interpolate and index == steps - 1:  # Проверяет, последний ли это шаг кадра.
+                self.level.store_previous_positions()  # Запоминает позиции врагов до последнего шага.
+            self.sim_clock.advance()  # Продвигает время симуляции.
+            self.step()  # Выполняет шаг симуляции.
+        elapsed_ms = (time.perf_counter() - start) * 1000  # Вычисляет время, затраченное на шаги.
+        self.frame_alpha = self.tick_accumulator if interpolate else 1.0  # Сохраняет долю следующего шага.
+
+        budget_ms = 1000 / self.settings.fps * self.settings.simulation_budget  # Вычисляет бюджет симуляции в кадре.
+        if elapsed_ms > budget_ms and self.effective_speed > 1:  # Проверяет, превышен ли бюджет.
+            self.effective_speed //= 2  # Уменьшает фактическую скорость.
+        elif elapsed_ms * 2 < budget_ms and self.effective_speed < self.speed_multiplier:  # Проверяет запас бюджета.
+            self.effective_speed = min(self.effective_speed * 2, self.speed_multiplier)  # Увеличивает фактическую скорость.
+
+        self.sim_rate_ticks += steps  # Увеличивает счетчик шагов.
+        now = time.perf_counter()  # Получает текущее время.
+        if now - self.sim_rate_start >= 1:  # Проверяет, прошла ли секунда измерения.
+            self.sim_rate = self.sim_rate_ticks / (now - self.sim_rate_start)  # Вычисляет скорость симуляции.
+            self.sim_rate_ticks = 0  # Сбрасывает счетчик шагов.
+            self.sim_rate_start = now  # Начинает новое измерение.
+
     def _draw_win_screen(self):  # Метод для отрисовки экрана победы.
         """
         Отрисовывает экран победы.
         """
         win_text = "You Win!"  # Текст для экрана победы.
-        win_render = self.font.render(win_text, True, (255, 215, 0))  # Создает изображение текста.
+        win_render = self.text.render(self.font, win_text, (255, 215, 0))  # Получает изображение текста.
         win_rect = win_render.get_rect(
             center=(self.settings.screen_width / 2, self.settings.screen_height / 2))  # Центрирует текст на экране.
         self.screen.blit(win_render, win_rect)  # Рисует текст на экране.
@@ -127,7 +364,7 @@ class TowerDefenseGame:  # Определяет основной класс иг
         self.screen.fill((0, 0, 0))  # Заполняет экран черным цветом.
 
         game_over_text = "Game Over!"  # Текст для экрана проигрыша.
-        game_over_render = self.font.render(game_over_text, True, (255, 0, 0))  # Создает изображение текста.
+        game_over_render = self.text.render(self.font, game_over_text, (255, 0, 0))  # Получает изображение текста.
         game_over_rect = game_over_render.get_rect(  # Центрирует текст на экране.
             center=(self.settings.screen_width / 2, self.settings.screen_height / 2))
 
@@ -140,46 +377,86 @@ class TowerDefenseGame:  # Определяет основной класс иг
         if self.is_game_over:  # Проверяет, закончилась ли игра.
             self._draw_game_over_screen()  # Отрисовывает экран проигрыша.
         else:
-            self.screen.blit(self.background, (0, 0))  # Рисует фон игры.
-            self.level.draw(self.screen)  # Отрисовывает уровень.
-            self.grid.draw()  # Отрисовывает сетку.
-
-            money_text = self.font.render(f"Money: ${self.settings.starting_money}", True,
-                                          (255, 255, 255))  # Создает текст с количеством денег.
-            tower_text = self.font.render(  # Создает текст с выбранным типом башни.
-                f"Selected Tower: {self.selected_tower_type if self.selected_tower_type else 'None'}", True,
-                (255, 255, 255))
-            waves_text = self.font.render(f"Waves Left: {len(self.level.waves) - self.level.current_wave}", True,
-                                          # Создает текст с количеством оставшихся волн.
-                                          (255, 255, 255))
-            enemies_text = self.font.render(f"Enemies Left: {len(self.level.enemies)}", True,
-                                            (255, 255, 255))  # Создает текст с количеством оставшихся врагов.
-
-            self.screen.blit(money_text, (10, 10))  # Рисует текст с количеством денег.
-            self.screen.blit(tower_text, (10, 40))  # Рисует текст с выбранным типом башни.
-            self.screen.blit(waves_text, (10, 70))  # Рисует текст с количеством оставшихся волн.
-            self.screen.blit(enemies_text, (10, 100))  # Рисует текст с количеством оставшихся врагов.
+            with self.profiler.scope('background'):  # Измеряет время отрисовки неизменного слоя карты.
+                if self.renderer is not None:  # Проверяет, включен ли режим измененных прямоугольников.
+                    screen = self.renderer.begin()  # Восстанавливает слой под прошлым кадром и начинает запись.
+                else:
+                    screen = self.screen  # Рисует прямо на экране.
+                    self.static_layer.draw(screen)  # Рисует фон, путь и позиции на сетке.
+            self.level.draw(screen)  # Отрисовывает уровень.
+            with self.profiler.scope('hud'):  # Измеряет время отрисовки интерфейса.
+                self._draw_hud(screen)  # Отрисовывает интерфейс.
 
             if self.level.all_waves_complete:  # Проверяет, завершены ли все волны.
                 self._draw_win_screen()  # Отрисовывает экран победы.
 
-        pygame.display.flip()  # Обновляет экран.
+        self.profiler.draw(self.screen, self.font)  # Отрисовывает оверлей профилировщика.
+        with self.profiler.scope('flip'):  # Измеряет время обновления экрана.
+            if self.renderer is not None:  # Проверяет, включен ли режим измененных прямоугольников.
+                self.renderer.present(full=self.is_game_over or self.level.all_waves_complete or
+                                      self.profiler.enabled)  # Обновляет измененные прямоугольники или весь экран.
+            else:
+                pygame.display.flip()  # Обновляет экран.
+
+    def _draw_hud(self, screen):  # Метод для отрисовки интерфейса.
+        """
+        Отрисовывает тексты с деньгами, выбранной башней, волнами, врагами и скоростью игры.
+
+        Args:
+            screen (pygame.Surface): Поверхность для отрисовки.
+        """
+        widgets = self.hud_widgets  # Получает строки интерфейса.
+        widgets['money'].draw(screen, self.settings.starting_money)  # Рисует текст с количеством денег.
+        widgets['tower'].draw(screen, self.selected_tower_type if self.selected_tower_type else 'None')  # Рисует текст с выбранным типом башни.
+        waves_left = self.level.waves_left()  # Получает количество оставшихся волн.
+        widgets['waves'].draw(screen, 'Endless' if waves_left is None else waves_left)  # Рисует текст с количеством оставшихся волн.
+        widgets['enemies'].draw(screen, len(self.level.enemies))  # Рисует текст с количеством оставшихся врагов.
+        widgets['speed'].draw(screen, self.effective_speed, self.speed_multiplier,
+                              round(self.sim_rate))  # Рисует текст со скоростью игры.
 
     def run_game(self):  # Метод для запуска основного игрового цикла.
         """
         Запускает основной игровой цикл.
         """
+        self.last_frame_time = time.perf_counter()  # Начинает отсчет шагов с первого кадра.
         while True:  # Бесконечный цикл игры.
-            self._check_events()  # Обрабатывает события.
-            self._update_game()  # Обновляет состояние игры.
+            with self.profiler.scope('events'):  # Измеряет время обработки событий.
+                self._check_events()  # Обрабатывает события.
+            with self.profiler.scope('simulation'):  # Измеряет время шагов симуляции.
+                self._run_simulation()  # Выполняет шаги симуляции для этого кадра.
+            with self.profiler.scope('draw'):  # Измеряет время отрисовки.
+                self._draw()  # Отрисовывает все элементы игры.
+            self.profiler.end_frame({'enemies': len(self.level.enemies), 'towers': len(self.level.towers),
+                                     'bullets': len(self.level.bullets)})  # Завершает кадр профилировщика.
+            self.clock.tick(self.settings.fps)  # Ограничивает FPS.
 
-            if len(self.level.enemies) == 0 and not self.level.all_waves_complete:  # Проверяет, закончилась ли текущая волна.
-                self.level.start_next_wave()  # Запускает следующую волну.
 
-            self._draw()  # Отрисовывает все элементы игры.
-            self.clock.tick(60)  # Ограничивает FPS до 60.
+def seed_argument(text):  # Функция для разбора начального значения из командной строки.
+    """
+    Разбирает начальное значение и проверяет, что оно помещается в запись.
+
+    Args:
+        text (str): Значение аргумента.
+
+    Returns:
+        int: Начальное значение.
+
+    Raises:
+        argparse.ArgumentTypeError: Если значение не целое или вне диапазона от 0 до 2**32 - 1.
+    """
+    try:
+        return check_seed(int(text))  # Возвращает проверенное начальное значение.
+    except ValueError as error:  # Если значение не подходит.
+        raise argparse.ArgumentTypeError(str(error)) from error  # Сообщает об ошибке разбора аргумента.
 
 
 if __name__ == '__main__':  # Проверяет, запущен ли файл напрямую.
-    td_game = TowerDefenseGame()  # Создает объект игры.
+    parser = argparse.ArgumentParser(description="Tower Defense game.")  # Создает разбор аргументов.
+    parser.add_argument('--record', metavar='FILE', help="record player input to this replay file")  # Файл записи.
+    parser.add_argument('--seed', type=seed_argument, help="random seed from 0 to 2**32 - 1 (default: random)")  # Начальное значение.
+    args = parser.parse_args()  # Разбирает аргументы.
+    game_settings = Settings()  # Создает настройки игры.
+    game_settings.record_path = args.record  # Устанавливает файл записи.
+    game_settings.random_seed = args.seed  # Устанавливает начальное значение.
+    td_game = TowerDefenseGame(settings=game_settings)  # Создает объект игры.
     td_game.run_game()  # Запускает игру.
@@ -0,0 +1,159 @@
+try:
+    import numpy  # Импортирует библиотеку NumPy для векторных вычислений (необязательная зависимость).
+except ImportError:  # Если NumPy не установлен.
+    numpy = None  # Движок перемещения будет недоступен.
+
+from path import compile_path  # Импортирует функцию compile_path из файла path.py.
+
+
+class MovementEngine:  # Определяет класс MovementEngine, который перемещает всех врагов одним векторным шагом.
+    """
+    Класс MovementEngine хранит состояние движения врагов в массивах и перемещает их всех за один шаг.
+
+    Отрезки всех путей из настроек (начальная точка, направление, накопленные длины) хранятся
+    в общих таблицах. Каждый враг занимает слот с пройденным расстоянием, индексом текущего
+    отрезка, индексом первого отрезка своего пути, длиной пути и скоростью. Спрайты врагов только считывают
+    из движка свою позицию.
+
+    Атрибуты:
+        game (TowerDefenseGame): Ссылка на основной объект игры.
+        path_ranges (dict): Диапазоны отрезков (первый, после последнего) по скомпилированному пути.
+        segment_starts (numpy.ndarray): Начальные точки всех отрезков, форма (S, 2).
+        segment_directions (numpy.ndarray): Единичные направления всех отрезков, форма (S, 2).
+        segment_offsets (numpy.ndarray): Расстояние от начала пути до начала каждого отрезка, форма (S,).
+        segment_limits (numpy.ndarray): Расстояние от начала пути до конца каждого отрезка, форма (S,).
+        distances (numpy.ndarray): Пройденные расстояния по слотам.
+        segments (numpy.ndarray): Индексы текущих отрезков по слотам.
+        path_firsts (numpy.ndarray): Индексы первых отрезков путей по слотам.
+        path_lengths (numpy.ndarray): Длины путей по слотам.
+        speeds (numpy.ndarray): Скорости врагов по слотам.
+        active (numpy.ndarray): Маска занятых слотов.
+        enemies (list): Враги по слотам (None - свободный слот).
+        free_slots (list): Список свободных слотов.
+    """
+
+    def __init__(self, game, capacity=64):  # Конструктор класса MovementEngine.
+        """
+        Инициализация объекта MovementEngine.
+
+        Args:
+            game (TowerDefenseGame): Основной объект игры.
+            capacity (int): Начальное количество слотов.
+
+        Raises:
+            ImportError: Если NumPy не установлен.
+        """
+        if numpy is None:  # Проверяет, доступен ли NumPy.
+            raise ImportError("NumPy is required for the movement engine.")  # Сообщает об отсутствии NumPy.
+        self.game = game  # Сохраняет ссылку на основной объект игры.
+        self.path_ranges = {}  # Инициализирует словарь диапазонов отрезков путей.
+        starts = []  # Инициализирует список начальных точек отрезков.
+        directions = []  # Инициализирует список направлений отрезков.
+        offsets = []  # Инициализирует список расстояний до начала отрезков.
+        limits = []  # Инициализирует список расстояний до конца отрезков.
+        for enemy_path in game.settings.enemy_paths:  # Перебирает пути из настроек.
+            track = compile_path(enemy_path['path'])  # Получает скомпилированный путь.
+            if track in self.path_ranges:  # Проверяет, не был ли путь уже обработан.
+                continue  # Пропускает одинаковые пути.
+            first = len(starts)  # Запоминает индекс первого отрезка пути.
+            starts.extend(track.points[:-1])  # Сохраняет начальные точки отрезков.
+            directions.extend(track.directions)  # Сохраняет направления отрезков.
+            offsets.extend(track.cumulative[:-1])  # Сохраняет расстояния до начала отрезков.
+            limits.extend(track.cumulative[1:])  # Сохраняет расстояния до конца отрезков.
+            self.path_ranges[track] = (first, len(starts))  # Сохраняет диапазон отрезков пути.
+        self.segment_starts = numpy.array(starts, dtype=float).reshape(-1, 2)  # Создает таблицу начальных точек.
+        self.segment_directions = numpy.array(directions, dtype=float).reshape(-1, 2)  # Создает таблицу направлений.
+        self.segment_offsets = numpy.array(offsets, dtype=float)  # Создает таблицу расстояний до начала отрезков.
+        self.segment_limits = numpy.array(limits, dtype=float)  # Создает таблицу расстояний до конца отрезков.
+
+        self.distances = numpy.zeros(capacity)  # Инициализирует массив пройденных расстояний.
+        self.segments = numpy.zeros(capacity, dtype=int)  # Инициализирует массив индексов отрезков.
+        self.path_firsts = numpy.zeros(capacity, dtype=int)  # Инициализирует массив первых отрезков путей.
+        self.path_lengths = numpy.zeros(capacity)  # Инициализирует массив длин путей.
+        self.speeds = numpy.zeros(capacity)  # Инициализирует массив скоростей.
+        self.active = numpy.zeros(capacity, dtype=bool)  # Инициализирует маску занятых слотов.
+        self.enemies = [None] * capacity  # Инициализирует список врагов по слотам.
+        self.free_slots = list(range(capacity - 1, -1, -1))  # Инициализирует список свободных слотов.
+
+    def _grow(self):  # Метод для увеличения количества слотов.
+        """
+        Удваивает количество слотов.
+        """
+        capacity = len(self.enemies)  # Получает текущее количество слотов.
+        self.distances = numpy.concatenate([self.distances, numpy.zeros(capacity)])  # Расширяет массив расстояний.
+        self.segments = numpy.concatenate([self.segments, numpy.zeros(capacity, dtype=int)])  # Расширяет массив отрезков.
+        self.path_firsts = numpy.concatenate([self.path_firsts, numpy.zeros(capacity, dtype=int)])  # Расширяет массив первых отрезков.
+        self.path_lengths = numpy.concatenate([self.path_lengths, numpy.zeros(capacity)])  # Расширяет массив длин путей.
+        self.speeds = numpy.concatenate([self.speeds, numpy.zeros(capacity)])  # Расширяет массив скоростей.
+        self.active = numpy.concatenate([self.active, numpy.zeros(capacity, dtype=bool)])  # Расширяет маску слотов.
+        self.enemies.extend([None] * capacity)  # Расширяет список врагов.
+        self.free_slots.extend(range(2 * capacity - 1, capacity - 1, -1))  # Добавляет новые свободные слоты.
+
+    def add(self, enemy):  # Метод для добавления врага в движок.
+        """
+        Добавляет врага в движок и связывает его со слотом.
+
+        Args:
+            enemy (Enemy): Враг с уже скомпилированным путем и пройденным расстоянием.
+        """
+        if not self.free_slots:  # Проверяет, есть ли свободные слоты.
+            self._grow()  # Увеличивает количество слотов.
+        slot = self.free_slots.pop()  # Получает свободный слот.
+        first, _ = self.path_ranges[enemy.track]  # Получает первый отрезок пути врага.
+        self.distances[slot] = enemy.distance  # Сохраняет пройденное расстояние.
+        self.segments[slot] = first + enemy.path_index  # Сохраняет индекс текущего отрезка.
+        self.path_firsts[slot] = first  # Сохраняет индекс первого отрезка пути.
+        self.path_lengths[slot] = enemy.track.total_length  # Сохраняет длину пути.
+        self.speeds[slot] = enemy.speed  # Сохраняет скорость врага.
+        self.active[slot] = True  # Отмечает слот как занятый.
+        self.enemies[slot] = enemy  # Связывает слот с врагом.
+        enemy.movement = self  # Сохраняет ссылку на движок у врага.
+        enemy.movement_slot = slot  # Сохраняет слот у врага.
+
+    def remove(self, enemy):  # Метод для удаления врага из движка.
+        """
+        Освобождает слот врага.
+
+        Args:
+            enemy (Enemy): Удаляемый враг.
+        """
+        slot = enemy.movement_slot  # Получает слот врага.
+        self.active[slot] = False  # Отмечает слот как свободный.
+        self.enemies[slot] = None  # Отвязывает врага от слота.
+        self.free_slots.append(slot)  # Возвращает слот в список свободных.
+        enemy.movement = None  # Удаляет ссылку на движок у врага.
+
+    def step(self):  # Метод для перемещения всех врагов.
+        """
+        Продвигает всех врагов вдоль путей на один шаг и обновляет их позиции.
+
+        Враги, прошедшие весь путь, вызывают game_over и удаляются, как и в Enemy.update.
+        """
+        slots = numpy.flatnonzero(self.active)  # Получает индексы занятых слотов.
+        if slots.size == 0:  # Проверяет, есть ли враги.
+            return  # Ничего не делает.
+        distances = self.distances[slots] + self.speeds[slots]  # Продвигает врагов вдоль путей.
+        finished = distances >= self.path_lengths[slots]  # Проверяет, дошли ли враги до конца пути.
+        segments = self.segments[slots]  # Получает индексы текущих отрезков.
+        passed = ~finished & (distances >= self.segment_limits[segments])  # Проверяет, пройден ли текущий отрезок.
+        while passed.any():  # Пока есть враги, прошедшие свой отрезок.
+            segments = segments + passed  # Переходит к следующему отрезку.
+            passed = ~finished & (distances >= self.segment_limits[segments])  # Проверяет следующий отрезок.
+        offsets = distances - self.segment_offsets[segments]  # Вычисляет расстояние от начала отрезка.
+        positions = self.segment_starts[segments] + self.segment_directions[segments] * offsets[:, None]  # Вычисляет позиции.
+        self.distances[slots] = distances  # Сохраняет пройденные расстояния.
+        self.segments[slots] = segments  # Сохраняет индексы отрезков.
+
+        path_indices = (segments - self.path_firsts[slots]).tolist()  # Вычисляет индексы отрезков внутри путей.
+        for slot, (x, y), distance, path_index in zip(slots.tolist(), positions.tolist(), distances.tolist(),
+                                                      path_indices):  # Перебирает врагов и их состояние.
+            enemy = self.enemies[slot]  # Получает врага.
+            enemy.distance = distance  # Обновляет пройденное расстояние врага.
+            enemy.path_index = path_index  # Обновляет индекс отрезка врага.
+            enemy.position.update(x, y)  # Обновляет позицию врага.
+            enemy.rect.center = (x, y)  # Обновляет прямоугольник врага.
+
+        for slot in slots[finished].tolist():  # Перебирает врагов, дошедших до конца пути.
+            enemy = self.enemies[slot]  # Получает врага.
+            enemy.game.game_over()  # Вызывает метод game_over у игры.
+            enemy.kill()  # Удаляет врага из группы спрайтов и из движка.
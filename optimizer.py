@@ -0,0 +1,320 @@
+import argparse  # Импортирует модуль argparse для разбора аргументов командной строки.
+import contextlib  # Импортирует модуль contextlib для перенаправления вывода.
+import io  # Импортирует модуль io для буфера вывода.
+import multiprocessing  # Импортирует модуль multiprocessing для параллельной оценки расстановок.
+import os  # Импортирует модуль os для получения количества ядер.
+import random  # Импортирует модуль random для случайного поиска.
+import time  # Импортирует модуль time для ограничения времени поиска.
+
+from headless import create_headless_game  # Импортирует функцию create_headless_game из файла headless.py.
+from path import compile_path  # Импортирует функцию compile_path из файла path.py.
+from sweep import load_worker_assets  # Импортирует функцию load_worker_assets из файла sweep.py.
+from tower import BasicTower, SniperTower, MoneyTower  # Импортирует классы башен из файла tower.py.
+
+TOWER_CLASSES = {  # Классы башен по типу.
+    'basic': BasicTower,
+    'sniper': SniperTower,
+    'money': MoneyTower,
+}
+
+
+def evaluate_order(task):  # Функция для оценки порядка постройки башен.
+    """
+    Выполняет симуляцию без окна, в которой башни строятся по порядку, как только хватает денег.
+
+    Args:
+        task (tuple): (порядок постройки, номер пути, стартовые деньги, максимум шагов).
+            Порядок постройки - кортеж (тип башни, клетка).
+
+    Returns:
+        tuple: (порядок постройки, итоги симуляции).
+    """
+    order, path_number, budget, max_ticks = task  # Получает параметры симуляции.
+    with contextlib.redirect_stdout(io.StringIO()):  # Подавляет вывод сообщений игры.
+        game = create_headless_game(path_number, overrides={'starting_money': budget, 'random_seed': 0},
+                                    assets=load_worker_assets())  # Создает игру без окна.
+        level = game.level  # Получает уровень.
+        ticks = 0  # Инициализирует счетчик шагов.
+        built = 0  # Инициализирует количество построенных башен из порядка.
+        while not game.is_game_over and not level.all_waves_complete and ticks < max_ticks:  # Пока игра продолжается.
+            while built < len(order) and game.settings.starting_money >= game.settings.tower_cost:  # Пока хватает денег.
+                tower_type, cell = order[built]  # Получает следующую башню.
+                level.attempt_place_tower(cell, tower_type)  # Строит башню.
+                built += 1  # Переходит к следующей башне.
+            game.sim_clock.advance()  # Продвигает время симуляции.
+            game.step()  # Выполняет шаг симуляции.
+            ticks += 1  # Увеличивает счетчик шагов.
+    return order, {  # Возвращает порядок постройки и итоги симуляции.
+        'win': level.all_waves_complete and not game.is_game_over,  # Победа.
+        'waves_cleared': level.current_wave + (1 if level.all_waves_complete else 0),  # Количество пройденных волн.
+        'money': game.settings.starting_money,  # Деньги в конце симуляции.
+        'towers': len(level.towers),  # Количество построенных башен.
+        'ticks': ticks,  # Количество шагов.
+    }
+
+
+def score(result):  # Функция для оценки итогов симуляции.
+    """
+    Оценивает итоги симуляции: сначала пройденные волны, затем победа, затем деньги
+    при победе или продолжительность обороны при поражении.
+
+    Args:
+        result (dict): Итоги симуляции из evaluate_order.
+
+    Returns:
+        tuple: Оценка (больше - лучше).
+    """
+    return result['waves_cleared'], result['win'], result['money'] if result['win'] else result['ticks']  # Возвращает оценку.
+
+
+class PlacementOptimizer:  # Определяет класс PlacementOptimizer, который ищет сильные расстановки башен.
+    """
+    Класс PlacementOptimizer ищет порядок постройки башен эволюционным поиском.
+
+    Расстановка описывается порядком постройки: башни строятся одна за другой, как только хватает
+    денег, поэтому башни, генерирующие деньги, окупаются постройкой следующих башен. Клетки, из
+    которых башня не достает ни до одного отрезка пути, заранее отбрасываются. Каждое поколение
+    оценивается пакетом в пуле процессов, а результаты уже оцененных расстановок запоминаются.
+
+    Атрибуты:
+        path_number (int): Номер пути врагов.
+        budget (int): Стартовые деньги.
+        population (int): Количество расстановок в поколении.
+        elite (int): Количество лучших расстановок, переходящих в следующее поколение.
+        max_length (int): Наибольшее количество башен в порядке постройки.
+        max_ticks (int): Максимальное количество шагов одной симуляции.
+        tower_cost (int): Стоимость башни.
+        candidates (dict): Допустимые клетки по типу башни.
+        memo (dict): Итоги симуляции по порядку постройки.
+        rng (random.Random): Генератор случайных чисел поиска.
+    """
+
+    def __init__(self, path_number, budget=None, population=16, elite=4, max_length=12, max_ticks=200000,
+                 seed=0):  # Конструктор класса PlacementOptimizer.
+        """
+        Инициализация объекта PlacementOptimizer.
+
+        Args:
+            path_number (int): Номер пути из Settings.enemy_paths.
+            budget (int): Стартовые деньги (None - Settings.starting_money).
+            population (int): Количество расстановок в поколении.
+            elite (int): Количество лучших расстановок, переходящих в следующее поколение.
+            max_length (int): Наибольшее количество башен в порядке постройки.
+            max_ticks (int): Максимальное количество шагов одной симуляции.
+            seed (int): Начальное значение генератора случайных чисел поиска.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):  # Подавляет вывод сообщений игры.
+            game = create_headless_game(path_number, assets=load_worker_assets())  # Создает игру для чтения настроек и башен.
+        settings = game.settings  # Получает настройки игры.
+        self.path_number = path_number  # Сохраняет номер пути.
+        self.budget = budget if budget is not None else settings.starting_money  # Сохраняет стартовые деньги.
+        self.population = population  # Сохраняет размер поколения.
+        self.elite = elite  # Сохраняет количество лучших расстановок.
+        self.max_length = max_length  # Сохраняет наибольшую длину порядка постройки.
+        self.max_ticks = max_ticks  # Сохраняет максимальное количество шагов симуляции.
+        self.tower_cost = settings.tower_cost  # Сохраняет стоимость башни.
+        self.candidates = self.prune_cells(game, compile_path(game.level.current_path['path']),
+                                           settings.tower_positions)  # Отбирает допустимые клетки.
+        self.memo = {}  # Инициализирует словарь оцененных расстановок.
+        self.rng = random.Random(seed)  # Создает генератор случайных чисел поиска.
+
+    @staticmethod
+    def prune_cells(game, track, cells):  # Статический метод для отбора допустимых клеток.
+        """
+        Отбирает для каждого типа башни клетки, из которых она достает до пути.
+
+        Башни, генерирующие деньги, не стреляют, поэтому им отдаются клетки, бесполезные хотя бы
+        для одного типа стреляющих башен (или все клетки, если таких нет).
+
+        Args:
+            game (TowerDefenseGame): Игра для создания образцов башен.
+            track (CompiledPath): Скомпилированный путь врагов.
+            cells (list): Клетки для башен.
+
+        Returns:
+            dict: Списки клеток по типу башни.
+        """
+        distances = {cell: track.distance_to(cell) for cell in cells}  # Вычисляет расстояние от клеток до пути.
+        candidates = {}  # Инициализирует словарь допустимых клеток.
+        for tower_type, tower_class in TOWER_CLASSES.items():  # Перебирает типы башен.
+            if tower_class.targeting is not None:  # Проверяет, стреляет ли башня.
+                tower_range = tower_class((0, 0), game).tower_range  # Получает дальность башни из образца.
+                candidates[tower_type] = [cell for cell in cells if distances[cell] <= tower_range]  # Отбирает клетки.
+        shooting_cells = set(cells).intersection(*candidates.values())  # Собирает клетки, полезные для всех стреляющих башен.
+        candidates['money'] = [cell for cell in cells if cell not in shooting_cells] or list(cells)  # Отдает остальные клетки.
+        return candidates  # Возвращает допустимые клетки.
+
+    def random_entry(self, used_cells, tower_type=None):  # Метод для выбора случайной башни.
+        """
+        Выбирает случайную башню на свободной допустимой клетке.
+
+        Args:
+            used_cells (set): Занятые клетки.
+            tower_type (str): Тип башни (None - случайный тип).
+
+        Returns:
+            tuple: (тип башни, клетка) или None, если свободных клеток нет.
+        """
+        tower_type = tower_type or self.rng.choice(list(TOWER_CLASSES))  # Выбирает тип башни.
+        free_cells = [cell for cell in self.candidates[tower_type] if cell not in used_cells]  # Получает свободные клетки.
+        return (tower_type, self.rng.choice(free_cells)) if free_cells else None  # Возвращает башню.
+
+    def random_order(self):  # Метод для создания случайного порядка постройки.
+        """
+        Создает случайный порядок постройки не короче, чем позволяют стартовые деньги.
+
+        Returns:
+            tuple: Порядок постройки.
+        """
+        length = self.rng.randint(max(self.budget // self.tower_cost, 1), self.max_length)  # Выбирает длину порядка.
+        order = []  # Инициализирует порядок постройки.
+        for _ in range(length):  # Добавляет башни.
+            entry = self.random_entry({cell for _, cell in order})  # Выбирает башню.
+            if entry:  # Проверяет, нашлась ли клетка.
+                order.append(entry)  # Добавляет башню.
+        return tuple(order)  # Возвращает порядок постройки.
+
+    def mutate(self, order):  # Метод для изменения порядка постройки.
+        """
+        Применяет к порядку постройки одно случайное изменение: смену клетки или типа башни,
+        перестановку, добавление или удаление башни.
+
+        Args:
+            order (tuple): Порядок постройки.
+
+        Returns:
+            tuple: Новый порядок постройки.
+        """
+        order = list(order)  # Копирует порядок постройки.
+        used_cells = {cell for _, cell in order}  # Собирает занятые клетки.
+        index = self.rng.randrange(len(order))  # Выбирает изменяемую башню.
+        operation = self.rng.choice(('cell', 'type', 'swap', 'insert', 'delete'))  # Выбирает изменение.
+        if operation in ('cell', 'type'):  # Смена клетки или типа башни.
+            tower_type, cell = order[index]  # Получает изменяемую башню.
+            used_cells.discard(cell)  # Освобождает ее клетку.
+            if operation == 'type':  # Смена типа башни.
+                tower_type = self.rng.choice([name for name in TOWER_CLASSES if name != tower_type])  # Выбирает другой тип.
+                if cell in self.candidates[tower_type] and self.rng.random() < 0.5:  # Проверяет, можно ли оставить клетку.
+                    order[index] = (tower_type, cell)  # Меняет только тип башни.
+                    return tuple(order)  # Возвращает новый порядок.
+            entry = self.random_entry(used_cells, tower_type)  # Выбирает новую клетку.
+            if entry:  # Проверяет, нашлась ли клетка.
+                order[index] = entry  # Заменяет башню.
+        elif operation == 'swap' and len(order) > 1:  # Перестановка двух башен.
+            other = self.rng.randrange(len(order))  # Выбирает вторую башню.
+            order[index], order[other] = order[other], order[index]  # Меняет башни местами.
+        elif operation == 'insert' and len(order) < self.max_length:  # Добавление башни.
+            entry = self.random_entry(used_cells)  # Выбирает башню.
+            if entry:  # Проверяет, нашлась ли клетка.
+                order.insert(index, entry)  # Добавляет башню.
+        elif operation == 'delete' and len(order) > 1:  # Удаление башни.
+            del order[index]  # Удаляет башню.
+        return tuple(order)  # Возвращает новый порядок.
+
+    def crossover(self, first, second):  # Метод для скрещивания двух порядков постройки.
+        """
+        Берет начало первого порядка и дополняет его башнями второго на свободных клетках.
+
+        Args:
+            first (tuple): Первый порядок постройки.
+            second (tuple): Второй порядок постройки.
+
+        Returns:
+            tuple: Новый порядок постройки.
+        """
+        order = list(first[:self.rng.randint(1, len(first))])  # Берет начало первого порядка.
+        used_cells = {cell for _, cell in order}  # Собирает занятые клетки.
+        for tower_type, cell in second:  # Перебирает башни второго порядка.
+            if cell not in used_cells and len(order) < self.max_length:  # Проверяет, свободна ли клетка.
+                order.append((tower_type, cell))  # Добавляет башню.
+                used_cells.add(cell)  # Занимает клетку.
+        return tuple(order)  # Возвращает новый порядок.
+
+    def ranked(self):  # Метод для получения оцененных расстановок по убыванию оценки.
+        """
+        Возвращает оцененные расстановки по убыванию оценки.
+
+        Returns:
+            list: Пары (порядок постройки, итоги симуляции).
+        """
+        return sorted(self.memo.items(), key=lambda item: score(item[1]), reverse=True)  # Сортирует расстановки.
+
+    def next_generation(self):  # Метод для создания нового поколения.
+        """
+        Создает новые, еще не оцененные порядки постройки из лучших оцененных.
+
+        Returns:
+            list: Новые порядки постройки.
+        """
+        if not self.memo:  # Проверяет, есть ли оцененные расстановки.
+            parents = []  # Родителей еще нет.
+        else:
+            parents = [order for order, _ in self.ranked()[:self.elite]]  # Получает лучшие расстановки.
+        children = set()  # Инициализирует множество новых расстановок.
+        attempts = 0  # Инициализирует счетчик попыток.
+        while len(children) < self.population and attempts < self.population * 20:  # Пока поколение не заполнено.
+            attempts += 1  # Увеличивает счетчик попыток.
+            roll = self.rng.random()  # Выбирает способ получения расстановки.
+            if not parents or roll < 0.2:  # Случайная расстановка.
+                child = self.random_order()  # Создает случайный порядок.
+            elif roll < 0.5 and len(parents) > 1:  # Скрещивание.
+                child = self.crossover(*self.rng.sample(parents, 2))  # Скрещивает двух родителей.
+            else:  # Изменение.
+                child = self.mutate(self.rng.choice(parents))  # Изменяет родителя.
+            if child and child not in self.memo:  # Проверяет, что расстановка новая.
+                children.add(child)  # Добавляет расстановку в поколение.
+        return list(children)  # Возвращает поколение.
+
+    def run(self, time_budget=60.0, processes=None):  # Метод для запуска поиска.
+        """
+        Ищет расстановки, пока не истечет время: оценивает поколения пакетами в пуле процессов.
+
+        Новое поколение не запускается после истечения времени, поэтому поиск может
+        превысить бюджет на время оценки одного поколения.
+
+        Args:
+            time_budget (float): Время поиска в секундах.
+            processes (int): Количество процессов (None - по количеству ядер).
+
+        Returns:
+            list: Пары (порядок постройки, итоги симуляции) по убыванию оценки.
+        """
+        start = time.perf_counter()  # Запоминает время начала.
+        generation = 0  # Инициализирует номер поколения.
+        with multiprocessing.Pool(processes or os.cpu_count()) as pool:  # Создает пул процессов.
+            while time.perf_counter() - start < time_budget:  # Пока не истекло время.
+                orders = self.next_generation()  # Создает новое поколение.
+                if not orders:  # Проверяет, остались ли неоцененные расстановки.
+                    break  # Заканчивает поиск.
+                tasks = [(order, self.path_number, self.budget, self.max_ticks) for order in orders]  # Составляет задачи.
+                for order, result in pool.map(evaluate_order, tasks):  # Оценивает поколение.
+                    self.memo[order] = result  # Запоминает итоги.
+                generation += 1  # Увеличивает номер поколения.
+                best_order, best_result = self.ranked()[0]  # Получает лучшую расстановку.
+                print(f"generation {generation}: {len(self.memo)} layouts, best waves {best_result['waves_cleared']} "
+                      f"win {best_result['win']} money {best_result['money']}")  # Выводит прогресс.
+        return self.ranked()  # Возвращает расстановки по убыванию оценки.
+
+
+def main():  # Функция для запуска поиска из командной строки.
+    """
+    Запускает поиск расстановок башен и выводит лучшие найденные.
+    """
+    parser = argparse.ArgumentParser(description="Tower Defense placement optimizer.")  # Создает разбор аргументов.
+    parser.add_argument('--path', type=int, default=1, help="enemy path number")  # Номер пути.
+    parser.add_argument('--budget', type=int, help="starting money (default: Settings.starting_money)")  # Стартовые деньги.
+    parser.add_argument('--time', type=float, default=60.0, help="search time budget in seconds")  # Время поиска.
+    parser.add_argument('--population', type=int, default=16, help="layouts per generation")  # Размер поколения.
+    parser.add_argument('--processes', type=int, help="worker processes (default: CPU count)")  # Количество процессов.
+    parser.add_argument('--seed', type=int, default=0, help="random seed of the search")  # Начальное значение поиска.
+    parser.add_argument('--top', type=int, default=5, help="number of layouts to report")  # Количество выводимых расстановок.
+    args = parser.parse_args()  # Разбирает аргументы.
+
+    optimizer = PlacementOptimizer(args.path, args.budget, population=args.population, seed=args.seed)  # Создает поиск.
+    for order, result in optimizer.run(args.time, args.processes)[:args.top]:  # Перебирает лучшие расстановки.
+        print(f"waves {result['waves_cleared']} win {result['win']} money {result['money']} "
+              f"towers {result['towers']} ticks {result['ticks']}: {list(order)}")  # Выводит расстановку.
+
+
+if __name__ == '__main__':  # Проверяет, запущен ли файл напрямую.
+    main()  # Запускает поиск.
@@ -0,0 +1,166 @@
+import math  # Импортирует модуль math для вычисления расстояний.
+from bisect import bisect_right  # Импортирует функцию bisect_right для двоичного поиска.
+
+
+class CompiledPath:  # Определяет класс CompiledPath, который описывает путь через длину дуги.
+    """
+    Класс CompiledPath хранит путь врагов в виде таблицы накопленных длин отрезков.
+
+    Положение врага на пути задается одним числом - пройденным расстоянием. Позиция, доля
+    пройденного пути и номер отрезка вычисляются из расстояния двоичным поиском или
+    продвижением от известного отрезка.
+
+    Атрибуты:
+        points (tuple): Точки пути.
+        cumulative (list): Расстояние от начала пути до каждой точки.
+        directions (list): Единичные направления отрезков.
+        total_length (float): Полная длина пути.
+    """
+
+    def __init__(self, points):  # Конструктор класса CompiledPath.
+        """
+        Инициализация объекта CompiledPath.
+
+        Args:
+            points (list): Точки пути (x, y).
+        """
+        self.points = tuple(tuple(point) for point in points)  # Сохраняет точки пути.
+        self.cumulative = [0.0]  # Инициализирует таблицу накопленных длин.
+        self.directions = []  # Инициализирует список направлений отрезков.
+        for start, end in zip(self.points, self.points[1:]):  # Перебирает отрезки пути.
+            dx = end[0] - start[0]  # Вычисляет длину отрезка по оси X.
+            dy = end[1] - start[1]  # Вычисляет длину отрезка по оси Y.
+            length = (dx * dx + dy * dy) ** 0.5  # Вычисляет длину отрезка.
+            self.directions.append((dx / length, dy / length))  # Сохраняет единичное направление отрезка.
+            self.cumulative.append(self.cumulative[-1] + length)  # Сохраняет накопленную длину.
+        self.total_length = self.cumulative[-1]  # Сохраняет полную длину пути.
+
+    def segment_at(self, distance):  # Метод для поиска отрезка по расстоянию.
+        """
+        Находит отрезок, на котором находится точка с заданным расстоянием от начала пути.
+
+        Args:
+            distance (float): Расстояние от начала пути.
+
+        Returns:
+            int: Индекс отрезка.
+        """
+        return min(max(bisect_right(self.cumulative, distance) - 1, 0),
+                   len(self.directions) - 1)  # Возвращает индекс отрезка в допустимых пределах.
+
+    def advance_segment(self, segment, distance):  # Метод для продвижения от известного отрезка.
+        """
+        Находит отрезок для расстояния, продвигаясь от ранее найденного отрезка.
+
+        Так как враги движутся только вперед, обычно это одно сравнение.
+
+        Args:
+            segment (int): Ранее найденный индекс отрезка.
+            distance (float): Новое расстояние от начала пути.
+
+        Returns:
+            int: Индекс отрезка.
+        """
+        last = len(self.directions) - 1  # Получает индекс последнего отрезка.
+        while segment < last and distance >= self.cumulative[segment + 1]:  # Проверяет, пройден ли отрезок.
+            segment += 1  # Переходит к следующему отрезку.
+        return segment  # Возвращает индекс отрезка.
+
+    def position_at(self, distance, segment=None):  # Метод для вычисления позиции по расстоянию.
+        """
+        Вычисляет позицию точки пути по расстоянию от начала.
+
+        Args:
+            distance (float): Расстояние от начала пути.
+            segment (int): Индекс отрезка, если он уже известен.
+
+        Returns:
+            tuple: Координаты (x, y).
+        """
+        if segment is None:  # Проверяет, известен ли отрезок.
+            segment = self.segment_at(distance)  # Находит отрезок двоичным поиском.
+        start = self.points[segment]  # Получает начальную точку отрезка.
+        direction = self.directions[segment]  # Получает направление отрезка.
+        offset = distance - self.cumulative[segment]  # Вычисляет расстояние от начала отрезка.
+        return start[0] + direction[0] * offset, start[1] + direction[1] * offset  # Возвращает позицию.
+
+    def progress(self, distance):  # Метод для вычисления доли пройденного пути.
+        """
+        Вычисляет долю пройденного пути.
+
+        Args:
+            distance (float): Расстояние от начала пути.
+
+        Returns:
+            float: Доля пройденного пути от 0 до 1.
+        """
+        return min(distance / self.total_length, 1.0)  # Возвращает долю пройденного пути.
+
+    def distance_to(self, point):  # Метод для вычисления расстояния от точки до пути.
+        """
+        Вычисляет кратчайшее расстояние от точки до ломаной пути.
+
+        Args:
+            point (tuple): Точка (x, y).
+
+        Returns:
+            float: Расстояние до ближайшей точки пути.
+        """
+        best = float('inf')  # Инициализирует наименьшее расстояние.
+        for index, (dx, dy) in enumerate(self.directions):  # Перебирает отрезки пути.
+            start_x, start_y = self.points[index]  # Получает начало отрезка.
+            length = self.cumulative[index + 1] - self.cumulative[index]  # Получает длину отрезка.
+            along = min(max((point[0] - start_x) * dx + (point[1] - start_y) * dy, 0.0), length)  # Проецирует точку на отрезок.
+            nearest_x = start_x + dx * along  # Вычисляет ближайшую точку отрезка по оси X.
+            nearest_y = start_y + dy * along  # Вычисляет ближайшую точку отрезка по оси Y.
+            best = min(best, ((point[0] - nearest_x) ** 2 + (point[1] - nearest_y) ** 2) ** 0.5)  # Обновляет наименьшее расстояние.
+        return best  # Возвращает наименьшее расстояние.
+
+    def intercept(self, origin, distance, speed, projectile_speed, max_ticks=600):  # Метод для расчета точки перехвата.
+        """
+        Находит, через сколько шагов снаряд из origin догонит врага, движущегося вдоль пути.
+
+        Враг проходит speed за шаг, снаряд - projectile_speed. Время полета уточняется итерациями
+        (сходятся, пока враг медленнее снаряда), затем округляется до целого шага, на котором
+        снаряд точно успевает к врагу.
+
+        Args:
+            origin (tuple): Точка выстрела (x, y).
+            distance (float): Пройденное врагом расстояние в момент выстрела.
+            speed (float): Скорость врага (расстояние за шаг).
+            projectile_speed (float): Скорость снаряда (расстояние за шаг).
+            max_ticks (int): Наибольшее время полета в шагах.
+
+        Returns:
+            tuple: (время полета в шагах, точка попадания (x, y)).
+        """
+        flight = 0.0  # Инициализирует оценку времени полета.
+        for _ in range(8):  # Уточняет время полета.
+            x, y = self.position_at(min(distance + speed * flight, self.total_length))  # Получает позицию врага.
+            flight = math.hypot(x - origin[0], y - origin[1]) / projectile_speed  # Вычисляет время полета до нее.
+        ticks = max(1, math.ceil(flight))  # Округляет время полета до целого шага.
+        while True:  # Пока снаряд не успевает к врагу.
+            x, y = self.position_at(min(distance + speed * ticks, self.total_length))  # Получает позицию врага.
+            if math.hypot(x - origin[0], y - origin[1]) <= projectile_speed * ticks or ticks >= max_ticks:  # Проверяет, успевает ли снаряд.
+                return ticks, (x, y)  # Возвращает время полета и точку попадания.
+            ticks += 1  # Переходит к следующему шагу.
+
+
+compiled_paths = {}  # Кэш скомпилированных путей по кортежу точек.
+
+
+def compile_path(points):  # Функция для получения скомпилированного пути.
+    """
+    Возвращает скомпилированный путь, создавая его при первом запросе.
+
+    Args:
+        points (list): Точки пути (x, y).
+
+    Returns:
+        CompiledPath: Скомпилированный путь.
+    """
+    key = tuple(tuple(point) for point in points)  # Формирует ключ пути.
+    path = compiled_paths.get(key)  # Ищет путь в кэше.
+    if path is None:  # Если путь еще не скомпилирован.
+        path = compiled_paths[key] = CompiledPath(key)  # Компилирует путь и сохраняет его в кэше.
+    return path  # Возвращает скомпилированный путь.
@@ -0,0 +1,199 @@
+import collections  # Импортирует модуль collections для кольцевых буферов.
+import contextlib  # Импортирует модуль contextlib для пустого контекстного менеджера.
+import csv  # Импортирует модуль csv для сохранения замеров в CSV.
+import json  # Импортирует модуль json для сохранения трассы в формате Chrome.
+import time  # Импортирует модуль time для измерения времени.
+
+import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
+
+NULL_SCOPE = contextlib.nullcontext()  # Общий пустой контекстный менеджер для выключенного профилировщика.
+
+
+class ProfileScope:  # Определяет класс ProfileScope, который измеряет время одной фазы кадра.
+    """
+    Класс ProfileScope - контекстный менеджер, добавляющий время выполнения блока к фазе кадра.
+
+    Атрибуты:
+        profiler (FrameProfiler): Профилировщик, которому принадлежит фаза.
+        name (str): Имя фазы.
+        start (float): Время входа в блок.
+    """
+
+    def __init__(self, profiler, name):  # Конструктор класса ProfileScope.
+        """
+        Инициализация объекта ProfileScope.
+
+        Args:
+            profiler (FrameProfiler): Профилировщик.
+            name (str): Имя фазы.
+        """
+        self.profiler = profiler  # Сохраняет профилировщик.
+        self.name = name  # Сохраняет имя фазы.
+        self.start = 0.0  # Инициализирует время входа в блок.
+
+    def __enter__(self):  # Метод входа в блок.
+        self.start = time.perf_counter()  # Запоминает время входа.
+        return self  # Возвращает фазу.
+
+    def __exit__(self, exc_type, exc_value, traceback):  # Метод выхода из блока.
+        self.profiler.record(self.name, self.start, time.perf_counter())  # Записывает время выполнения блока.
+        return False  # Не подавляет исключения.
+
+
+class FrameProfiler:  # Определяет класс FrameProfiler, который собирает время фаз кадра.
+    """
+    Класс FrameProfiler собирает время выполнения именованных фаз каждого кадра.
+
+    Пока профилировщик выключен, scope возвращает общий пустой контекстный менеджер, поэтому
+    замеры почти ничего не стоят. Включенный профилировщик хранит историю последних кадров
+    для оверлея и события для выгрузки в CSV или трассу Chrome.
+
+    Атрибуты:
+        enabled (bool): Флаг, указывающий, включен ли сбор замеров.
+        history (collections.deque): Последние кадры: (время кадра в мс, фазы в мс, количество объектов).
+        events (collections.deque): События для трассы Chrome: (фаза, начало, конец).
+        current (dict): Время фаз текущего кадра в миллисекундах.
+    """
+
+    def __init__(self, history_size=120, max_events=200000):  # Конструктор класса FrameProfiler.
+        """
+        Инициализация объекта FrameProfiler.
+
+        Args:
+            history_size (int): Количество кадров в истории.
+            max_events (int): Максимальное количество хранимых событий трассы.
+        """
+        self.enabled = False  # Выключает сбор замеров по умолчанию.
+        self.history = collections.deque(maxlen=history_size)  # Создает историю кадров.
+        self.events = collections.deque(maxlen=max_events)  # Создает буфер событий трассы.
+        self.current = {}  # Инициализирует время фаз текущего кадра.
+        self.scopes = {}  # Инициализирует словарь фаз по имени.
+        self.frame_start = 0.0  # Инициализирует время начала кадра.
+        self.origin = time.perf_counter()  # Запоминает начало отсчета для трассы.
+
+    def toggle(self):  # Метод для включения и выключения профилировщика.
+        """
+        Включает или выключает сбор замеров.
+        """
+        self.enabled = not self.enabled  # Переключает флаг.
+        self.history.clear()  # Очищает историю кадров.
+        self.current = {}  # Очищает замеры текущего кадра.
+        self.frame_start = time.perf_counter()  # Начинает новый кадр.
+        print("Profiler:", self.enabled)  # Выводит сообщение в консоль.
+
+    def scope(self, name):  # Метод для получения контекстного менеджера фазы.
+        """
+        Возвращает контекстный менеджер, измеряющий время фазы.
+
+        Args:
+            name (str): Имя фазы.
+
+        Returns:
+            ProfileScope | contextlib.nullcontext: Фаза или пустой контекстный менеджер, если профилировщик выключен.
+        """
+        if not self.enabled:  # Проверяет, включен ли профилировщик.
+            return NULL_SCOPE  # Возвращает пустой контекстный менеджер.
+        scope = self.scopes.get(name)  # Ищет фазу по имени.
+        if scope is None:  # Если фаза еще не создана.
+            scope = self.scopes[name] = ProfileScope(self, name)  # Создает фазу.
+        return scope  # Возвращает фазу.
+
+    def record(self, name, start, end):  # Метод для записи времени фазы.
+        """
+        Добавляет время выполнения фазы к текущему кадру и сохраняет событие трассы.
+
+        Args:
+            name (str): Имя фазы.
+            start (float): Время начала в секундах.
+            end (float): Время окончания в секундах.
+        """
+        self.current[name] = self.current.get(name, 0.0) + (end - start) * 1000  # Добавляет время фазы.
+        self.events.append((name, start, end))  # Сохраняет событие трассы.
+
+    def end_frame(self, counts=None):  # Метод для завершения кадра.
+        """
+        Завершает кадр: сохраняет время кадра, фаз и количество объектов в историю.
+
+        Args:
+            counts (dict): Количество объектов по имени (враги, башни, пули).
+        """
+        if not self.enabled:  # Проверяет, включен ли профилировщик.
+            return  # Ничего не делает.
+        now = time.perf_counter()  # Получает текущее время.
+        self.history.append(((now - self.frame_start) * 1000, self.current, counts or {}))  # Сохраняет кадр в историю.
+        self.events.append(('frame', self.frame_start, now))  # Сохраняет событие кадра.
+        self.current = {}  # Начинает замеры нового кадра.
+        self.frame_start = now  # Запоминает начало нового кадра.
+
+    def averages(self):  # Метод для вычисления среднего времени фаз.
+        """
+        Вычисляет среднее время фаз по истории кадров.
+
+        Returns:
+            dict: Среднее время каждой фазы в миллисекундах.
+        """
+        totals = {}  # Инициализирует суммы времени фаз.
+        for _, phases, _ in self.history:  # Перебирает кадры истории.
+            for name, value in phases.items():  # Перебирает фазы кадра.
+                totals[name] = totals.get(name, 0.0) + value  # Добавляет время фазы к сумме.
+        frames = len(self.history) or 1  # Получает количество кадров.
+        return {name: value / frames for name, value in totals.items()}  # Возвращает среднее время фаз.
+
+    def draw(self, screen, font):  # Метод для отрисовки оверлея.
+        """
+        Отрисовывает оверлей со средним временем фаз, графиком времени кадра и количеством объектов.
+
+        Args:
+            screen (pygame.Surface): Поверхность для отрисовки.
+            font (pygame.font.Font): Шрифт для текста.
+        """
+        if not self.enabled or not self.history:  # Проверяет, есть ли что отображать.
+            return  # Ничего не делает.
+        x = screen.get_width() - 330  # Вычисляет левую границу оверлея.
+        panel = pygame.Surface((320, 400), pygame.SRCALPHA)  # Создает полупрозрачную панель.
+        panel.fill((0, 0, 0, 170))  # Заливает панель полупрозрачным черным.
+        screen.blit(panel, (x, 10))  # Рисует панель.
+
+        frame_ms, _, counts = self.history[-1]  # Получает последний кадр.
+        lines = [f"Frame: {frame_ms:.2f} ms"]  # Начинает список строк с времени кадра.
+        lines += [f"{name}: {value:.2f} ms" for name, value in
+                  sorted(self.averages().items(), key=lambda item: -item[1])]  # Добавляет среднее время фаз.
+        lines += [f"{name}: {value}" for name, value in counts.items()]  # Добавляет количество объектов.
+        for index, line in enumerate(lines[:12]):  # Перебирает строки оверлея.
+            screen.blit(font.render(line, True, (255, 255, 255)), (x + 10, 15 + index * 24))  # Рисует строку.
+
+        graph_bottom = 400  # Нижняя граница графика.
+        for index, (value, _, _) in enumerate(self.history):  # Перебирает кадры истории.
+            height = min(int(value * 3), 90)  # Вычисляет высоту столбца (3 пикселя на миллисекунду).
+            color = (0, 255, 0) if value <= 1000 / 60 else (255, 80, 80)  # Выбирает цвет по бюджету 60 FPS.
+            pygame.draw.line(screen, color, (x + 10 + index * 2, graph_bottom),
+                             (x + 10 + index * 2, graph_bottom - height))  # Рисует столбец графика.
+
+    def dump_csv(self, path):  # Метод для сохранения истории в CSV.
+        """
+        Сохраняет историю кадров в CSV: по строке на кадр, по столбцу на фазу.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        names = sorted({name for _, phases, _ in self.history for name in phases})  # Собирает имена фаз.
+        count_names = sorted({name for _, _, counts in self.history for name in counts})  # Собирает имена счетчиков.
+        with open(path, 'w', newline='') as file:  # Открывает файл.
+            writer = csv.writer(file)  # Создает запись CSV.
+            writer.writerow(['frame_ms'] + names + count_names)  # Записывает заголовок.
+            for frame_ms, phases, counts in self.history:  # Перебирает кадры истории.
+                writer.writerow([f"{frame_ms:.4f}"] + [f"{phases.get(name, 0.0):.4f}" for name in names] +
+                                [counts.get(name, 0) for name in count_names])  # Записывает кадр.
+
+    def dump_chrome_trace(self, path):  # Метод для сохранения трассы в формате Chrome.
+        """
+        Сохраняет события в формате Chrome Trace Event (открывается в chrome://tracing или Perfetto).
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        trace = [{'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                  'ts': (start - self.origin) * 1e6, 'dur': (end - start) * 1e6}
+                 for name, start, end in self.events]  # Преобразует события в формат Chrome.
+        with open(path, 'w') as file:  # Открывает файл.
+            json.dump({'traceEvents': trace}, file)  # Сохраняет трассу.
@@ -0,0 +1,257 @@
+import collections  # Импортирует модуль collections для неизменяемого описания записи.
+import hashlib  # Импортирует модуль hashlib для хэша состояния игры.
+import struct  # Импортирует модуль struct для двоичного формата записи.
+
+MAGIC = b'TDRP'  # Сигнатура файла записи.
+VERSION = 2  # Версия формата записи.
+HEADER = struct.Struct('<4sBIBBI')  # Заголовок: сигнатура, версия, начальное значение, путь, режим волн, количество действий.
+SETTINGS = struct.Struct('<BIBBdBdddqq')  # Настройки симуляции: флаг и начальное значение волн, перемещение, выбор
+# целей, скорость пуль, мгновенное попадание, множители урона, перезарядки и здоровья, начальные деньги, цена башни.
+ACTION = struct.Struct('<IBBhh')  # Действие: шаг, код действия, код типа башни, x, y (10 байт).
+FOOTER = struct.Struct('<I32s')  # Окончание: последний шаг, хэш состояния.
+
+ACTIONS = ('select', 'place', 'upgrade')  # Действия игрока по коду.
+TOWER_TYPES = (None, 'basic', 'sniper', 'money')  # Типы башен по коду.
+WAVE_MODES = ('campaign', 'endless')  # Режимы волн по коду.
+ENGINE_MODES = ('scalar', 'numpy')  # Способы перемещения врагов и выбора целей по коду.
+SEED_LIMIT = 2 ** 32  # Начальные значения записываются 32-битными числами без знака.
+
+Replay = collections.namedtuple('Replay', ['seed', 'path_number', 'wave_mode', 'settings', 'actions', 'final_tick',
+                                           'state_hash'])  # Загруженная запись; settings - значения настроек симуляции,
+# действия - кортежи (шаг, действие, тип башни, позиция).
+
+
+def check_seed(seed, name='seed'):  # Функция для проверки начального значения.
+    """
+    Проверяет, что начальное значение помещается в запись.
+
+    Args:
+        seed (int): Начальное значение.
+        name (str): Имя значения для сообщения об ошибке.
+
+    Returns:
+        int: Начальное значение.
+
+    Raises:
+        ValueError: Если значение не целое или вне диапазона от 0 до 2**32 - 1.
+    """
+    if not isinstance(seed, int) or not 0 <= seed < SEED_LIMIT:  # Проверяет тип и диапазон значения.
+        raise ValueError(f"{name} must be an integer from 0 to {SEED_LIMIT - 1}, got {seed!r}")  # Сообщает об ошибке.
+    return seed  # Возвращает начальное значение.
+
+
+def simulation_settings(settings):  # Функция для получения настроек, влияющих на симуляцию.
+    """
+    Возвращает значения настроек, от которых зависит результат симуляции, кроме начального значения,
+    пути и режима волн (они хранятся в заголовке).
+
+    Args:
+        settings (Settings): Настройки игры в начале записи (до трат денег).
+
+    Returns:
+        dict: Значения атрибутов Settings.
+
+    Raises:
+        ValueError: Если начальное значение волн не помещается в запись.
+    """
+    if settings.wave_seed is not None:  # Проверяет, задано ли начальное значение волн.
+        check_seed(settings.wave_seed, 'wave_seed')  # Проверяет начальное значение волн.
+    return {
+        'wave_seed': settings.wave_seed,  # Начальное значение бесконечных волн.
+        'movement_mode': settings.movement_mode,  # Способ перемещения врагов.
+        'targeting_mode': settings.targeting_mode,  # Способ выбора целей.
+        'bullet_speed': settings.bullet_speed,  # Скорость пуль.
+        'sniper_hitscan': settings.sniper_hitscan,  # Мгновенное попадание снайперских башен.
+        'tower_damage_scale': settings.tower_damage_scale,  # Множитель урона башен.
+        'tower_rate_of_fire_scale': settings.tower_rate_of_fire_scale,  # Множитель перезарядки башен.
+        'enemy_health_scale': settings.enemy_health_scale,  # Множитель здоровья врагов.
+        'starting_money': settings.starting_money,  # Начальные деньги.
+        'tower_cost': settings.tower_cost,  # Цена башни.
+    }
+
+
+def state_hash(game):  # Функция для вычисления хэша состояния игры.
+    """
+    Вычисляет хэш состояния симуляции: деньги, волна, башни, враги и пули.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+
+    Returns:
+        bytes: Хэш SHA-256 (32 байта).
+    """
+    level = game.level  # Получает уровень.
+    digest = hashlib.sha256()  # Создает хэш.
+    digest.update(repr((game.sim_clock.ticks, game.settings.starting_money, level.current_wave, level.spawned_enemies,
+                        level.all_waves_complete, game.is_game_over, game.leaks)).encode())  # Добавляет общее состояние.
+    for tower in level.towers:  # Перебирает башни.
+        digest.update(repr((type(tower).__name__, tuple(tower.position), tower.level, tower.damage, tower.rate_of_fire,
+                            float(tower.last_shot_time))).encode())  # Добавляет состояние башни.
+    for enemy in level.enemies:  # Перебирает врагов.
+        digest.update(repr((enemy.distance, enemy.health, tuple(enemy.position))).encode())  # Добавляет состояние врага.
+    for bullet in level.bullets:  # Перебирает пули.
+        digest.update(repr((tuple(bullet.target), bullet.impact_tick, bullet.damage)).encode())  # Добавляет состояние пули.
+    return digest.digest()  # Возвращает хэш.
+
+
+class InputRecorder:  # Определяет класс InputRecorder, который записывает действия игрока.
+    """
+    Класс InputRecorder записывает начальное значение, путь и действия игрока с шагами симуляции.
+
+    Запись сохраняется в компактный двоичный файл (10 байт на действие), который воспроизводит replay.py.
+    Настройки симуляции запоминаются при создании, так как деньги в настройках меняются во время игры.
+
+    Атрибуты:
+        game (TowerDefenseGame): Ссылка на основной объект игры.
+        settings (dict): Настройки симуляции в начале записи.
+        actions (list): Записанные действия (шаг, действие, тип башни, позиция).
+    """
+
+    def __init__(self, game):  # Конструктор класса InputRecorder.
+        """
+        Инициализация объекта InputRecorder.
+
+        Args:
+            game (TowerDefenseGame): Основной объект игры (уровень уже создан).
+
+        Raises:
+            ValueError: Если начальные значения не помещаются в запись (ошибка видна сразу, а не при выходе).
+        """
+        self.game = game  # Сохраняет ссылку на основной объект игры.
+        check_seed(game.seed)  # Проверяет начальное значение игры.
+        self.settings = simulation_settings(game.settings)  # Запоминает настройки симуляции.
+        self.actions = []  # Инициализирует список действий.
+
+    def record(self, tick, action, tower_type=None, position=None):  # Метод для записи действия.
+        """
+        Записывает действие игрока.
+
+        Args:
+            tick (int): Шаг симуляции, перед которым выполнено действие.
+            action (str): Действие из ACTIONS.
+            tower_type (str): Тип башни (None - не нужен).
+            position (tuple): Позиция (x, y) (None - не нужна).
+        """
+        self.actions.append((tick, action, tower_type, position))  # Добавляет действие.
+
+    def to_bytes(self):  # Метод для получения записи в двоичном виде.
+        """
+        Упаковывает запись с хэшем текущего состояния игры.
+
+        Returns:
+            bytes: Двоичная запись.
+        """
+        game = self.game  # Получает игру.
+        data = bytearray(HEADER.pack(MAGIC, VERSION, game.seed, game.level.current_path['number'],
+                                     WAVE_MODES.index(game.settings.wave_mode), len(self.actions)))  # Упаковывает заголовок.
+        settings = self.settings  # Получает настройки симуляции.
+        data += SETTINGS.pack(settings['wave_seed'] is not None, settings['wave_seed'] or 0,
+                              ENGINE_MODES.index(settings['movement_mode']),
+                              ENGINE_MODES.index(settings['targeting_mode']), settings['bullet_speed'],
+                              settings['sniper_hitscan'], settings['tower_damage_scale'],
+                              settings['tower_rate_of_fire_scale'], settings['enemy_health_scale'],
+                              settings['starting_money'], settings['tower_cost'])  # Упаковывает настройки симуляции.
+        for tick, action, tower_type, position in self.actions:  # Перебирает действия.
+            x, y = position if position is not None else (0, 0)  # Получает позицию действия.
+            data += ACTION.pack(tick, ACTIONS.index(action), TOWER_TYPES.index(tower_type), int(x), int(y))  # Упаковывает действие.
+        data += FOOTER.pack(game.sim_clock.ticks, state_hash(game))  # Упаковывает последний шаг и хэш состояния.
+        return bytes(data)  # Возвращает запись.
+
+    def save(self, path):  # Метод для сохранения записи в файл.
+        """
+        Сохраняет запись в файл.
+
+        Args:
+            path (str): Путь к файлу записи.
+        """
+        with open(path, 'wb') as file:  # Открывает файл записи.
+            file.write(self.to_bytes())  # Записывает запись.
+
+
+def load_replay(path):  # Функция для загрузки записи.
+    """
+    Загружает запись из файла.
+
+    Args:
+        path (str): Путь к файлу записи.
+
+    Returns:
+        Replay: Запись.
+
+    Raises:
+        ValueError: Если файл не является записью или версия формата не поддерживается.
+    """
+    with open(path, 'rb') as file:  # Открывает файл записи.
+        data = file.read()  # Читает запись.
+    if len(data) < HEADER.size + SETTINGS.size + FOOTER.size:  # Проверяет размер записи.
+        raise ValueError(f"Not a replay file: {path}")  # Сообщает о неверном файле.
+    magic, version, seed, path_number, wave_mode, count = HEADER.unpack_from(data)  # Распаковывает заголовок.
+    if magic != MAGIC or version != VERSION:  # Проверяет сигнатуру и версию.
+        raise ValueError(f"Not a replay file or unsupported version: {path}")  # Сообщает о неверном файле.
+    (has_wave_seed, wave_seed, movement_mode, targeting_mode, bullet_speed, sniper_hitscan, damage_scale,
+     rate_of_fire_scale, health_scale, starting_money, tower_cost) = SETTINGS.unpack_from(data, HEADER.size)  # Распаковывает настройки.
+    settings = {
+        'wave_seed': wave_seed if has_wave_seed else None,  # Начальное значение бесконечных волн.
+        'movement_mode': ENGINE_MODES[movement_mode],  # Способ перемещения врагов.
+        'targeting_mode': ENGINE_MODES[targeting_mode],  # Способ выбора целей.
+        'bullet_speed': bullet_speed,  # Скорость пуль.
+        'sniper_hitscan': bool(sniper_hitscan),  # Мгновенное попадание снайперских башен.
+        'tower_damage_scale': damage_scale,  # Множитель урона башен.
+        'tower_rate_of_fire_scale': rate_of_fire_scale,  # Множитель перезарядки башен.
+        'enemy_health_scale': health_scale,  # Множитель здоровья врагов.
+        'starting_money': starting_money,  # Начальные деньги.
+        'tower_cost': tower_cost,  # Цена башни.
+    }
+    offset = HEADER.size + SETTINGS.size  # Вычисляет начало действий.
+    actions = []  # Инициализирует список действий.
+    for index in range(count):  # Перебирает действия.
+        tick, action, tower_type, x, y = ACTION.unpack_from(data, offset + index * ACTION.size)  # Распаковывает действие.
+        actions.append((tick, ACTIONS[action], TOWER_TYPES[tower_type], (x, y)))  # Добавляет действие.
+    final_tick, final_hash = FOOTER.unpack_from(data, offset + count * ACTION.size)  # Распаковывает окончание.
+    return Replay(seed, path_number, WAVE_MODES[wave_mode], settings, actions, final_tick,
+                  final_hash)  # Возвращает запись.
+
+
+class ReplayPlayer:  # Определяет класс ReplayPlayer, который выполняет действия записи.
+    """
+    Класс ReplayPlayer выполняет действия записи на тех же шагах симуляции, на которых они были сделаны.
+
+    Атрибуты:
+        replay (Replay): Запись.
+        next_action (int): Индекс следующего действия.
+    """
+
+    def __init__(self, replay):  # Конструктор класса ReplayPlayer.
+        """
+        Инициализация объекта ReplayPlayer.
+
+        Args:
+            replay (Replay): Запись.
+        """
+        self.replay = replay  # Сохраняет запись.
+        self.next_action = 0  # Начинает с первого действия.
+
+    def apply_due(self, game):  # Метод для выполнения действий текущего шага.
+        """
+        Выполняет действия, сделанные перед текущим шагом симуляции.
+
+        Args:
+            game (TowerDefenseGame): Игра.
+        """
+        actions = self.replay.actions  # Получает действия записи.
+        while self.next_action < len(actions) and actions[self.next_action][0] <= game.sim_clock.ticks:  # Пока есть действия этого шага.
+            _, action, tower_type, position = actions[self.next_action]  # Получает действие.
+            game.perform_action(action, tower_type, position)  # Выполняет действие.
+            self.next_action += 1  # Переходит к следующему действию.
+
+    def finished(self, game):  # Метод для проверки окончания записи.
+        """
+        Проверяет, дошла ли игра до последнего шага записи.
+
+        Args:
+            game (TowerDefenseGame): Игра.
+
+        Returns:
+            bool: True, если последний шаг достигнут.
+        """
+        return game.sim_clock.ticks >= self.replay.final_tick  # Возвращает True, если последний шаг достигнут.
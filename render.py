@@ -0,0 +1,141 @@
+import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
+
+
+class RecordingSurface:  # Определяет класс RecordingSurface, который запоминает все выводы изображений на экран.
+    """
+    Класс RecordingSurface передает вызовы blit и blits настоящему экрану и запоминает,
+    какое изображение и в какой прямоугольник было выведено. Остальные атрибуты берутся у экрана.
+
+    Атрибуты:
+        surface (pygame.Surface): Настоящий экран.
+        records (set): Выведенные изображения: (изображение, прямоугольник).
+    """
+
+    def __init__(self, surface):  # Конструктор класса RecordingSurface.
+        """
+        Инициализация объекта RecordingSurface.
+
+        Args:
+            surface (pygame.Surface): Настоящий экран.
+        """
+        self.surface = surface  # Сохраняет экран.
+        self.records = set()  # Инициализирует множество выведенных изображений.
+
+    def blit(self, source, dest, area=None, special_flags=0):  # Метод для вывода изображения.
+        """
+        Выводит изображение на экран и запоминает затронутый прямоугольник.
+
+        Returns:
+            pygame.Rect: Затронутый прямоугольник.
+        """
+        rect = self.surface.blit(source, dest, area, special_flags)  # Выводит изображение.
+        self.records.add((source, tuple(rect)))  # Запоминает изображение и прямоугольник.
+        return rect  # Возвращает затронутый прямоугольник.
+
+    def blits(self, blit_sequence, doreturn=1):  # Метод для вывода нескольких изображений.
+        """
+        Выводит несколько изображений на экран и запоминает затронутые прямоугольники.
+
+        Returns:
+            list: Затронутые прямоугольники.
+        """
+        return [self.blit(*entry) for entry in blit_sequence]  # Выводит изображения по одному.
+
+    def __getattr__(self, name):  # Метод для доступа к остальным атрибутам экрана.
+        return getattr(self.surface, name)  # Возвращает атрибут экрана.
+
+
+class DirtyRectRenderer:  # Определяет класс DirtyRectRenderer, который обновляет только измененные части экрана.
+    """
+    Класс DirtyRectRenderer обновляет на экране только прямоугольники, в которых что-то изменилось.
+
+    Каждый кадр неизменный слой карты восстанавливается под всем, что было нарисовано в прошлом
+    кадре, и все рисуется заново через RecordingSurface. На экран передаются только прямоугольники
+    изображений, которые появились или исчезли по сравнению с прошлым кадром: движущиеся враги
+    и пули, повернувшиеся башни, изменившиеся строки интерфейса. Если измененная площадь больше
+    порога, экран обновляется целиком.
+
+    Атрибуты:
+        game (TowerDefenseGame): Ссылка на основной объект игры.
+        threshold (float): Доля площади экрана, начиная с которой экран обновляется целиком.
+        recorder (RecordingSurface): Экран, запоминающий выводы изображений.
+        previous (set): Изображения, выведенные в прошлом кадре.
+        static_key (tuple): Ключ неизменного слоя, использованного в прошлом кадре.
+        full_redraw (bool): Флаг, требующий перерисовать и обновить весь экран.
+        full_frames (int): Количество кадров с полным обновлением экрана.
+        partial_frames (int): Количество кадров с обновлением части экрана.
+        last_dirty_area (int): Площадь прямоугольников, обновленных в последнем кадре.
+    """
+
+    def __init__(self, game, threshold=0.3):  # Конструктор класса DirtyRectRenderer.
+        """
+        Инициализация объекта DirtyRectRenderer.
+
+        Args:
+            game (TowerDefenseGame): Основной объект игры.
+            threshold (float): Доля площади экрана, начиная с которой экран обновляется целиком.
+        """
+        self.game = game  # Сохраняет ссылку на основной объект игры.
+        self.threshold = threshold  # Сохраняет порог полного обновления.
+        self.recorder = RecordingSurface(game.screen)  # Создает экран, запоминающий выводы изображений.
+        self.previous = set()  # Инициализирует изображения прошлого кадра.
+        self.static_key = None  # Неизменный слой еще не использовался.
+        self.full_redraw = True  # Первый кадр рисуется целиком.
+        self.full_frames = 0  # Инициализирует счетчик полных обновлений.
+        self.partial_frames = 0  # Инициализирует счетчик частичных обновлений.
+        self.last_dirty_area = 0  # Инициализирует площадь последнего обновления.
+
+    def invalidate(self):  # Метод для сброса состояния.
+        """
+        Требует перерисовать и обновить весь экран в следующем кадре.
+        """
+        self.full_redraw = True  # Устанавливает флаг полной перерисовки.
+
+    def begin(self):  # Метод для начала кадра.
+        """
+        Восстанавливает неизменный слой под изображениями прошлого кадра (или целиком) и начинает запись.
+
+        Returns:
+            RecordingSurface: Экран, на котором нужно рисовать кадр.
+        """
+        screen = self.game.screen  # Получает экран.
+        static = self.game.static_layer.get()  # Получает неизменный слой карты.
+        if self.full_redraw or self.game.static_layer.key != self.static_key:  # Проверяет, нужна ли полная перерисовка.
+            screen.blit(static, (0, 0))  # Рисует неизменный слой целиком.
+            self.full_redraw = True  # Отмечает кадр как полный.
+            self.static_key = self.game.static_layer.key  # Запоминает ключ неизменного слоя.
+        else:
+            for _, rect in self.previous:  # Перебирает изображения прошлого кадра.
+                screen.blit(static, rect, rect)  # Восстанавливает слой под изображением.
+        self.recorder.records = set()  # Начинает запись нового кадра.
+        return self.recorder  # Возвращает экран для рисования.
+
+    def present(self, full=False):  # Метод для вывода кадра на экран.
+        """
+        Передает на экран измененные прямоугольники или весь экран.
+
+        Args:
+            full (bool): Обновить весь экран (например, если рисовали мимо RecordingSurface).
+        """
+        current = self.recorder.records  # Получает изображения текущего кадра.
+        dirty = [pygame.Rect(rect) for _, rect in current ^ self.previous]  # Собирает появившиеся и исчезнувшие прямоугольники.
+        self.previous = current  # Запоминает изображения текущего кадра.
+        self.last_dirty_area = sum(rect.width * rect.height for rect in dirty)  # Вычисляет измененную площадь.
+        screen_area = self.game.screen.get_width() * self.game.screen.get_height()  # Вычисляет площадь экрана.
+        if full or self.full_redraw or self.last_dirty_area > self.threshold * screen_area:  # Проверяет, нужно ли полное обновление.
+            pygame.display.flip()  # Обновляет весь экран.
+            self.full_frames += 1  # Увеличивает счетчик полных обновлений.
+        else:
+            pygame.display.update(dirty)  # Обновляет только измененные прямоугольники.
+            self.partial_frames += 1  # Увеличивает счетчик частичных обновлений.
+        self.full_redraw = full  # Требует полную перерисовку, если кадр рисовали мимо RecordingSurface.
+
+    def stats(self):  # Метод для получения статистики.
+        """
+        Возвращает статистику обновлений экрана.
+
+        Returns:
+            dict: Количество полных и частичных обновлений и площадь последнего обновления.
+        """
+        return {'full_frames': self.full_frames, 'partial_frames': self.partial_frames,
+                'last_dirty_area': self.last_dirty_area}  # Возвращает статистику.
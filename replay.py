@@ -0,0 +1,142 @@
+import argparse  # Импортирует модуль argparse для разбора аргументов командной строки.
+import contextlib  # Импортирует модуль contextlib для перенаправления вывода.
+import io  # Импортирует модуль io для буфера вывода.
+import time  # Импортирует модуль time для измерения реального времени.
+
+import pygame  # Импортирует библиотеку Pygame для обработки событий окна.
+
+from headless import create_headless_game  # Импортирует функцию create_headless_game из файла headless.py.
+from main import TowerDefenseGame  # Импортирует класс TowerDefenseGame из файла main.py.
+from recording import ReplayPlayer, load_replay, state_hash  # Импортирует воспроизведение из файла recording.py.
+from settings import Settings  # Импортирует класс Settings из файла settings.py.
+
+
+def replay_overrides(replay):  # Функция для получения настроек записи.
+    """
+    Возвращает значения настроек, с которыми была сделана запись.
+
+    Args:
+        replay (Replay): Запись.
+
+    Returns:
+        dict: Значения атрибутов Settings.
+    """
+    overrides = {'random_seed': replay.seed, 'path_number': replay.path_number,
+                 'wave_mode': replay.wave_mode}  # Получает начальное значение, путь и режим волн.
+    overrides.update(replay.settings)  # Добавляет настройки симуляции.
+    return overrides  # Возвращает значения настроек.
+
+
+def finish_replay(game, replay, start):  # Функция для подведения итогов воспроизведения.
+    """
+    Сравнивает состояние игры с хэшем из записи.
+
+    Args:
+        game (TowerDefenseGame): Игра после воспроизведения.
+        replay (Replay): Запись.
+        start (float): Реальное время начала воспроизведения.
+
+    Returns:
+        dict: Итоги: совпадение хэша, хэши, шаги, реальное время.
+    """
+    final_hash = state_hash(game)  # Вычисляет хэш состояния игры.
+    return {
+        'match': final_hash == replay.state_hash,  # Совпадает ли состояние с записью.
+        'state_hash': final_hash.hex(),  # Хэш состояния после воспроизведения.
+        'recorded_hash': replay.state_hash.hex(),  # Хэш состояния из записи.
+        'ticks': game.sim_clock.ticks,  # Количество шагов.
+        'actions': len(replay.actions),  # Количество действий.
+        'wall_time': time.perf_counter() - start,  # Реальное время.
+    }
+
+
+def replay_headless(replay, quiet=True, assets=None):  # Функция для воспроизведения записи без окна.
+    """
+    Воспроизводит запись без окна, звука и ограничения FPS с максимальной скоростью.
+
+    Args:
+        replay (Replay): Запись.
+        quiet (bool): Подавлять ли вывод сообщений игры.
+        assets (AssetManager): Уже загруженный кэш изображений (None - загрузить новый).
+
+    Returns:
+        dict: Итоги воспроизведения.
+    """
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()  # Выбирает вывод сообщений.
+    with output:
+        start = time.perf_counter()  # Запоминает реальное время начала.
+        game = create_headless_game(replay.path_number, overrides=replay_overrides(replay),
+                                    assets=assets)  # Создает игру без окна.
+        game.replaying = True  # Отмечает игру как воспроизводимую.
+        player = ReplayPlayer(replay)  # Создает воспроизведение действий.
+        while True:  # Пока запись не закончилась.
+            player.apply_due(game)  # Выполняет действия этого шага.
+            if player.finished(game):  # Проверяет, достигнут ли последний шаг записи.
+                break  # Заканчивает воспроизведение.
+            game.sim_clock.advance()  # Продвигает время симуляции.
+            game.step()  # Выполняет шаг симуляции.
+    return finish_replay(game, replay, start)  # Возвращает итоги.
+
+
+def replay_rendered(replay, speed=1):  # Функция для воспроизведения записи в окне.
+    """
+    Воспроизводит запись в окне с заданным количеством шагов симуляции за кадр.
+
+    Ввод игрока во время воспроизведения не принимается; закрытие окна прерывает воспроизведение.
+
+    Args:
+        replay (Replay): Запись.
+        speed (int): Количество шагов симуляции за кадр.
+
+    Returns:
+        dict: Итоги воспроизведения или None, если окно закрыто раньше.
+    """
+    settings = Settings()  # Создает настройки игры.
+    for name, value in replay_overrides(replay).items():  # Перебирает настройки записи.
+        setattr(settings, name, value)  # Устанавливает значение настройки.
+    start = time.perf_counter()  # Запоминает реальное время начала.
+    game = TowerDefenseGame(settings=settings)  # Создает игру в окне.
+    game.replaying = True  # Отмечает игру как воспроизводимую.
+    game.speed_multiplier = game.effective_speed = speed  # Показывает скорость воспроизведения в интерфейсе.
+    player = ReplayPlayer(replay)  # Создает воспроизведение действий.
+    while True:  # Пока запись не закончилась.
+        for event in pygame.event.get(pygame.QUIT):  # Перебирает события закрытия окна.
+            pygame.quit()  # Завершает работу Pygame.
+            return None  # Прерывает воспроизведение.
+        pygame.event.pump()  # Обрабатывает остальные события окна.
+        for _ in range(speed):  # Выполняет шаги симуляции этого кадра.
+            player.apply_due(game)  # Выполняет действия этого шага.
+            if player.finished(game):  # Проверяет, достигнут ли последний шаг записи.
+                result = finish_replay(game, replay, start)  # Подводит итоги.
+                pygame.quit()  # Завершает работу Pygame.
+                return result  # Возвращает итоги.
+            game.sim_clock.advance()  # Продвигает время симуляции.
+            game.step()  # Выполняет шаг симуляции.
+        game._draw()  # Отрисовывает игру.
+        game.clock.tick(game.settings.fps)  # Ограничивает FPS.
+
+
+def main():  # Функция для воспроизведения записи из командной строки.
+    """
+    Воспроизводит запись и проверяет хэш конечного состояния.
+    """
+    parser = argparse.ArgumentParser(description="Tower Defense replay player.")  # Создает разбор аргументов.
+    parser.add_argument('replay', help="replay file recorded with main.py --record")  # Файл записи.
+    parser.add_argument('--render', action='store_true', help="show the replay in a window")  # Воспроизведение в окне.
+    parser.add_argument('--speed', type=int, default=1, help="simulation ticks per frame with --render")  # Скорость.
+    args = parser.parse_args()  # Разбирает аргументы.
+
+    replay = load_replay(args.replay)  # Загружает запись.
+    print(f"seed {replay.seed}, path {replay.path_number}, {replay.wave_mode}, {len(replay.actions)} actions, "
+          f"{replay.final_tick} ticks")  # Выводит параметры записи.
+    result = replay_rendered(replay, args.speed) if args.render else replay_headless(replay)  # Воспроизводит запись.
+    if result is None:  # Проверяет, было ли воспроизведение прервано.
+        print("Replay interrupted.")  # Выводит сообщение в консоль.
+        return  # Завершает работу.
+    print(f"{'OK' if result['match'] else 'MISMATCH'}: state {result['state_hash'][:16]}, "
+          f"recorded {result['recorded_hash'][:16]}, {result['wall_time']:.2f} s")  # Выводит итоги.
+    raise SystemExit(0 if result['match'] else 1)  # Возвращает код результата.
+
+
+if __name__ == '__main__':  # Проверяет, запущен ли файл напрямую.
+    main()  # Запускает воспроизведение.
@@ -26,6 +26,35 @@ class Settings:  # Определяет класс Settings, который со
         starting_money (int): Стартовая сумма денег у игрока.
         lives (int): Количество жизней игрока.
         tower_positions (list): Список координат, где можно размещать башни.
+        spatial_cell_size (int): Размер клетки пространственного индекса врагов.
+        targeting_mode (str): Способ выбора целей башнями ('scalar' или 'numpy').
+        rotation_steps (int): Количество заранее повернутых изображений башни на полный оборот.
+        prebuild_rotations (bool): Строить ли все повороты башен при загрузке.
+        movement_mode (str): Способ перемещения врагов ('numpy' - векторный движок, 'scalar' - каждый враг сам).
+        path_number (int): Номер пути врагов (None - случайный путь).
+        fps (int): Частота кадров отрисовки (не влияет на скорость симуляции).
+        speed_levels (tuple): Доступные множители скорости игры (множители частоты шагов симуляции).
+        simulation_budget (float): Доля времени кадра, которую могут занимать шаги симуляции.
+        profile_csv (str): Путь к файлу CSV с замерами профилировщика.
+        profile_trace (str): Путь к файлу трассы Chrome с замерами профилировщика.
+        text_cache_size (int): Максимальное количество строк в кэше отрисованного текста.
+        render_mode (str): Режим отрисовки: 'full' - весь экран каждый кадр, 'dirty' - только измененные прямоугольники.
+        dirty_area_threshold (float): Доля площади экрана, начиная с которой режим 'dirty' обновляет экран целиком.
+        bullet_pool_size (int): Количество заранее созданных пуль в пуле.
+        wave_mode (str): Режим волн: 'campaign' - десять волн кампании, 'endless' - бесконечные процедурные волны.
+        wave_seed (int): Начальное значение генератора бесконечных волн (None - из генератора игры).
+        tower_damage_scale (float): Множитель урона стреляющих башен (для подбора баланса).
+        tower_rate_of_fire_scale (float): Множитель перезарядки стреляющих башен (для подбора баланса).
+        enemy_health_scale (float): Множитель здоровья врагов из волн (для подбора баланса).
+        random_seed (int): Начальное значение генератора случайных чисел игры от 0 до 2**32 - 1 (None - случайное).
+        record_path (str): Файл для записи действий игрока (None - запись выключена).
+        autosave_path (str): Файл автосохранения на границе волн (None - автосохранение выключено).
+        quicksave_path (str): Файл быстрого сохранения (F5) и загрузки (F9).
+        bullet_speed (float): Скорость пуль (расстояние за шаг симуляции).
+        sniper_hitscan (bool): Флаг мгновенного попадания снайперских башен без пули.
+        max_frame_ticks (int): Наибольшее количество шагов за кадр при скорости x1 (остаток отбрасывается,
+            чтобы медленный кадр не вызывал еще более медленные).
+        interpolate_rendering (bool): Флаг сглаживания движения врагов и пуль между двумя шагами симуляции.
     """
 
     def __init__(self):  # Конструктор класса Settings.
@@ -106,3 +135,32 @@ class Settings:  # Определяет класс Settings, который со
             # Вычисляет координаты для каждой клетки сетки.
             for x in range(1, self.cols) for y in
             range(3, self.rows)]  # Перебирает строки и столбцы сетки, начиная с 1 и 3 соответственно.
+
+        self.spatial_cell_size = 128  # Устанавливает размер клетки пространственного индекса врагов.
+        self.targeting_mode = 'scalar'  # Устанавливает способ выбора целей ('scalar' или 'numpy').
+        self.rotation_steps = 180  # Устанавливает количество поворотов башни на полный оборот (шаг 2 градуса).
+        self.prebuild_rotations = False  # Строит повороты башен лениво, при первом запросе.
+        self.movement_mode = 'numpy'  # Устанавливает векторный движок перемещения врагов.
+        self.path_number = None  # Устанавливает выбор случайного пути врагов.
+        self.fps = 60  # Устанавливает частоту кадров отрисовки.
+        self.speed_levels = (1, 2, 4, 8)  # Устанавливает доступные множители скорости игры.
+        self.simulation_budget = 0.75  # Устанавливает долю времени кадра для шагов симуляции.
+        self.profile_csv = 'profile.csv'  # Путь к файлу CSV с замерами профилировщика.
+        self.profile_trace = 'profile_trace.json'  # Путь к файлу трассы Chrome с замерами профилировщика.
+        self.text_cache_size = 256  # Устанавливает максимальное количество строк в кэше текста.
+        self.render_mode = 'full'  # Устанавливает режим отрисовки.
+        self.dirty_area_threshold = 0.3  # Устанавливает порог полного обновления экрана в режиме 'dirty'.
+        self.bullet_pool_size = 256  # Устанавливает количество заранее созданных пуль.
+        self.wave_mode = 'campaign'  # Устанавливает режим волн.
+        self.wave_seed = None  # Устанавливает начальное значение генератора бесконечных волн.
+        self.tower_damage_scale = 1.0  # Устанавливает множитель урона башен.
+        self.tower_rate_of_fire_scale = 1.0  # Устанавливает множитель перезарядки башен.
+        self.enemy_health_scale = 1.0  # Устанавливает множитель здоровья врагов.
+        self.random_seed = None  # Устанавливает случайное начальное значение генератора игры.
+        self.record_path = None  # Выключает запись действий игрока.
+        self.autosave_path = 'autosave.snap'  # Путь к файлу автосохранения.
+        self.quicksave_path = 'quicksave.snap'  # Путь к файлу быстрого сохранения.
+        self.bullet_speed = 5  # Устанавливает скорость пуль.
+        self.sniper_hitscan = False  # Снайперские башни стреляют пулями.
+        self.max_frame_ticks = 8  # Устанавливает наибольшее количество шагов за кадр при скорости x1.
+        self.interpolate_rendering = True  # Включает сглаживание движения между шагами симуляции.
@@ -0,0 +1,240 @@
+import array  # Импортирует модуль array для упакованных массивов чисел.
+import os  # Импортирует модуль os для атомарной замены файла.
+import queue  # Импортирует модуль queue для очереди записи на диск.
+import struct  # Импортирует модуль struct для двоичного заголовка снимка.
+import threading  # Импортирует модуль threading для фоновой записи снимков.
+
+from enemy import ENEMY_TYPES  # Импортирует типы врагов из файла enemy.py.
+from tower import BasicTower, SniperTower, MoneyTower  # Импортирует классы башен из файла tower.py.
+from waves import create_wave_source  # Импортирует функцию create_wave_source из файла waves.py.
+
+MAGIC = b'TDSN'  # Сигнатура файла снимка.
+VERSION = 4  # Версия формата снимка.
+HEADER = struct.Struct('<4sBIdqIBBBQIIddBIII')  # Заголовок: сигнатура, версия, часы, деньги, утечки, флаги, путь, волны, счетчики.
+TOWER_CLASSES = (BasicTower, SniperTower, MoneyTower)  # Классы башен по коду.
+TOWER_STRIDE = 8  # Числа башни: тип, x, y, уровень, урон, перезарядка, последний выстрел, последний доход.
+ENEMY_TYPE_NAMES = tuple(ENEMY_TYPES)  # Имена типов врагов по коду.
+ENEMY_STRIDE = 6  # Числа врага: тип, скорость, здоровье, награда, расстояние, отрезок пути.
+BULLET_STRIDE = 7  # Числа пули: выстрел x, y, попадание x, y, урон, шаг выстрела, шаг попадания.
+WAVE_MODES = ('campaign', 'endless')  # Режимы волн по коду.
+
+
+def save_snapshot(game):  # Функция для снимка состояния симуляции.
+    """
+    Упаковывает состояние симуляции в байты: заголовок и массивы чисел башен, врагов и пуль.
+
+    Изображения и другие объекты pygame не сохраняются - они восстанавливаются из кэша изображений.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+
+    Returns:
+        bytes: Снимок.
+    """
+    level = game.level  # Получает уровень.
+    towers = array.array('d')  # Создает массив чисел башен.
+    for tower in level.towers:  # Перебирает башни.
+        towers.extend((TOWER_CLASSES.index(type(tower)), tower.position.x, tower.position.y, tower.level,
+                       tower.damage, tower.rate_of_fire, tower.last_shot_time,
+                       getattr(tower, 'last_money_time', 0)))  # Добавляет числа башни.
+    enemies = array.array('d')  # Создает массив чисел врагов.
+    for enemy in level.enemies:  # Перебирает врагов.
+        enemies.extend((ENEMY_TYPE_NAMES.index(enemy.type_name), enemy.speed, enemy.health, enemy.reward,
+                        enemy.distance, enemy.path_index))  # Добавляет числа врага.
+    bullets = array.array('d')  # Создает массив чисел пуль.
+    for bullet in level.bullets:  # Перебирает пули.
+        bullets.extend((bullet.start.x, bullet.start.y, bullet.target.x, bullet.target.y, bullet.damage,
+                        bullet.fire_tick, bullet.impact_tick))  # Добавляет числа пули.
+    header = HEADER.pack(MAGIC, VERSION, game.sim_clock.ticks, game.sim_clock.time, game.settings.starting_money,
+                         game.leaks, game.is_game_over, level.current_path['number'],
+                         WAVE_MODES.index(game.settings.wave_mode), level.wave_seed, level.current_wave,
+                         level.spawned_enemies, level.spawn_delay, level.last_spawn_time, level.all_waves_complete,
+                         len(level.towers), len(level.enemies), len(level.bullets))  # Упаковывает заголовок.
+    return header + towers.tobytes() + enemies.tobytes() + bullets.tobytes()  # Возвращает снимок.
+
+
+def unpack_rows(data, offset, count, stride):  # Функция для распаковки массива чисел по строкам.
+    """
+    Распаковывает count строк по stride чисел из байтов снимка.
+
+    Args:
+        data (bytes): Снимок.
+        offset (int): Смещение массива в байтах.
+        count (int): Количество строк.
+        stride (int): Количество чисел в строке.
+
+    Returns:
+        tuple: (строки чисел, смещение после массива).
+    """
+    values = array.array('d')  # Создает массив чисел.
+    end = offset + count * stride * values.itemsize  # Вычисляет конец массива.
+    values.frombytes(data[offset:end])  # Читает числа.
+    return zip(*(values[column::stride] for column in range(stride))), end  # Возвращает строки и смещение.
+
+
+def load_snapshot(game, data):  # Функция для восстановления состояния из снимка.
+    """
+    Заменяет состояние симуляции игры состоянием из снимка.
+
+    Башни, враги, пули и запланированные попадания текущего уровня удаляются (враги и пули
+    возвращаются в пулы), затем создаются заново из массивов снимка.
+
+    Args:
+        game (TowerDefenseGame): Игра.
+        data (bytes): Снимок.
+
+    Raises:
+        ValueError: Если данные не являются снимком или версия формата не поддерживается.
+    """
+    if len(data) < HEADER.size:  # Проверяет размер снимка.
+        raise ValueError("Not a snapshot")  # Сообщает о неверных данных.
+    (magic, version, ticks, time, money, leaks, is_game_over, path_number, wave_mode, wave_seed, current_wave,
+     spawned_enemies, spawn_delay, last_spawn_time, all_waves_complete, tower_count, enemy_count,
+     bullet_count) = HEADER.unpack_from(data)  # Распаковывает заголовок.
+    if magic != MAGIC or version != VERSION:  # Проверяет сигнатуру и версию.
+        raise ValueError("Not a snapshot or unsupported version")  # Сообщает о неверных данных.
+    level = game.level  # Получает уровень.
+
+    for sprite in list(level.enemies) + list(level.bullets):  # Перебирает врагов и пули.
+        sprite.kill()  # Удаляет спрайт и возвращает его в пул.
+    level.impacts.clear()  # Удаляет запланированные попадания.
+    for tower in list(level.towers):  # Перебирает башни.
+        game.grid.remove_tower(tower)  # Освобождает клетку башни.
+        tower.kill()  # Удаляет башню.
+
+    game.sim_clock.ticks = ticks  # Восстанавливает количество шагов.
+    game.sim_clock.time = time  # Восстанавливает время симуляции.
+    game.settings.starting_money = money  # Восстанавливает деньги.
+    game.leaks = leaks  # Восстанавливает количество утечек.
+    game.is_game_over = bool(is_game_over)  # Восстанавливает флаг окончания игры.
+    game.settings.wave_mode = WAVE_MODES[wave_mode]  # Восстанавливает режим волн.
+    level.current_path = next(enemy_path for enemy_path in game.settings.enemy_paths if
+                              enemy_path['number'] == path_number)  # Восстанавливает путь.
+    level.wave_seed = wave_seed  # Восстанавливает начальное значение волн.
+    level.wave_source = create_wave_source(game.settings.wave_mode, wave_seed)  # Создает источник волн заново.
+    level.wave = level.wave_source.next_wave()  # Получает первую волну.
+    level.current_wave = 0  # Начинает с первой волны.
+    while level.current_wave < current_wave:  # Пока не достигнута сохраненная волна.
+        level.advance_wave()  # Переходит к следующей волне.
+    level.spawned_enemies = spawned_enemies  # Восстанавливает количество заспавненных врагов.
+    level.spawn_delay = spawn_delay  # Восстанавливает задержку спавна.
+    level.last_spawn_time = last_spawn_time  # Восстанавливает время последнего спавна.
+    level.all_waves_complete = bool(all_waves_complete)  # Восстанавливает флаг завершения волн.
+
+    offset = HEADER.size  # Начинает чтение массивов после заголовка.
+    rows, offset = unpack_rows(data, offset, tower_count, TOWER_STRIDE)  # Распаковывает башни.
+    for type_code, x, y, tower_level, damage, rate_of_fire, last_shot_time, last_money_time in rows:  # Перебирает башни.
+        tower = TOWER_CLASSES[int(type_code)]((x, y), game)  # Создает башню.
+        tower.level = int(tower_level)  # Восстанавливает уровень.
+        tower.damage = int(damage)  # Восстанавливает урон.
+        tower.rate_of_fire = int(rate_of_fire)  # Восстанавливает перезарядку.
+        tower.last_shot_time = last_shot_time  # Восстанавливает время последнего выстрела.
+        if isinstance(tower, MoneyTower):  # Проверяет, приносит ли башня деньги.
+            tower.last_money_time = last_money_time  # Восстанавливает время последнего дохода.
+        game.grid.place_tower(tower)  # Отмечает клетку как занятую башней.
+        level.towers.add(tower)  # Добавляет башню на уровень.
+
+    path = level.current_path['path']  # Получает точки пути.
+    rows, offset = unpack_rows(data, offset, enemy_count, ENEMY_STRIDE)  # Распаковывает врагов.
+    for type_code, speed, health, reward, distance, path_index in rows:  # Перебирает врагов.
+        enemy_type = ENEMY_TYPES[ENEMY_TYPE_NAMES[int(type_code)]]  # Получает тип врага по имени.
+        enemy = level.enemy_pool.acquire(enemy_type._replace(speed=speed, reward=int(reward)),
+                                         path)  # Получает врага из пула.
+        enemy.health = health  # Восстанавливает здоровье (без повторного множителя здоровья).
+        enemy.distance = distance  # Восстанавливает пройденное расстояние.
+        enemy.path_index = int(path_index)  # Восстанавливает отрезок пути.
+        enemy.position.update(enemy.track.position_at(distance, enemy.path_index))  # Восстанавливает позицию.
+        enemy.previous_position.update(enemy.position)  # Отрисовывает врага без сглаживания до следующего шага.
+        enemy.rect.center = enemy.position  # Центрирует прямоугольник врага.
+        level.add_enemy(enemy)  # Добавляет врага на уровень.
+
+    rows, offset = unpack_rows(data, offset, bullet_count, BULLET_STRIDE)  # Распаковывает пули.
+    for x, y, target_x, target_y, damage, fire_tick, impact_tick in rows:  # Перебирает пули.
+        bullet = level.bullet_pool.acquire((x, y), (target_x, target_y), int(damage), int(fire_tick),
+                                           int(impact_tick))  # Получает пулю из пула.
+        level.bullets.add(bullet)  # Добавляет пулю на уровень.
+        level.impacts.schedule(bullet)  # Планирует попадание.
+
+
+def write_snapshot(path, data):  # Функция для записи снимка в файл.
+    """
+    Записывает снимок во временный файл и заменяет им прежний, чтобы файл не остался недописанным.
+
+    Args:
+        path (str): Путь к файлу снимка.
+        data (bytes): Снимок.
+    """
+    temporary = path + '.tmp'  # Получает путь к временному файлу.
+    with open(temporary, 'wb') as file:  # Открывает временный файл.
+        file.write(data)  # Записывает снимок.
+    os.replace(temporary, path)  # Заменяет прежний файл снимка.
+
+
+def read_snapshot(path):  # Функция для чтения снимка из файла.
+    """
+    Читает снимок из файла.
+
+    Args:
+        path (str): Путь к файлу снимка.
+
+    Returns:
+        bytes: Снимок.
+    """
+    with open(path, 'rb') as file:  # Открывает файл снимка.
+        return file.read()  # Возвращает снимок.
+
+
+class SnapshotWriter:  # Определяет класс SnapshotWriter, который записывает снимки в фоновом потоке.
+    """
+    Класс SnapshotWriter записывает снимки на диск в фоновом потоке, чтобы кадр не ждал диска.
+
+    Снимок упаковывается в основном потоке (миллисекунды), а в очередь передаются только готовые байты.
+
+    Атрибуты:
+        jobs (queue.Queue): Очередь снимков (путь, байты); None завершает поток.
+        thread (threading.Thread): Поток записи.
+        written (int): Количество записанных снимков.
+        errors (int): Количество неудачных записей.
+    """
+
+    def __init__(self):  # Конструктор класса SnapshotWriter.
+        """
+        Инициализация объекта SnapshotWriter и запуск потока записи.
+        """
+        self.jobs = queue.Queue()  # Создает очередь снимков.
+        self.written = 0  # Инициализирует счетчик записанных снимков.
+        self.errors = 0  # Инициализирует счетчик неудачных записей.
+        self.thread = threading.Thread(target=self._run, name='snapshot-writer', daemon=True)  # Создает поток записи.
+        self.thread.start()  # Запускает поток записи.
+
+    def submit(self, path, data):  # Метод для постановки снимка в очередь.
+        """
+        Ставит снимок в очередь записи и сразу возвращает управление.
+
+        Args:
+            path (str): Путь к файлу снимка.
+            data (bytes): Снимок.
+        """
+        self.jobs.put((path, data))  # Добавляет снимок в очередь.
+
+    def _run(self):  # Метод потока записи.
+        """
+        Записывает снимки из очереди, пока не получит None.
+        """
+        while True:  # Пока поток не завершен.
+            job = self.jobs.get()  # Ждет следующий снимок.
+            if job is None:  # Проверяет, нужно ли завершить поток.
+                break  # Завершает поток.
+            try:
+                write_snapshot(*job)  # Записывает снимок.
+                self.written += 1  # Увеличивает счетчик записанных снимков.
+            except OSError as error:  # Если запись не удалась.
+                self.errors += 1  # Увеличивает счетчик неудачных записей.
+                print(f"Snapshot write failed: {error}")  # Выводит сообщение об ошибке.
+
+    def close(self):  # Метод для завершения потока записи.
+        """
+        Дописывает снимки из очереди и завершает поток записи.
+        """
+        self.jobs.put(None)  # Просит поток завершиться после оставшихся снимков.
+        self.thread.join()  # Ждет завершения потока.
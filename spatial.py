@@ -0,0 +1,111 @@
+class SpatialHash:  # Определяет класс SpatialHash, который индексирует врагов по клеткам равномерной сетки.
+    """
+    Класс SpatialHash хранит врагов в клетках равномерной сетки для быстрого поиска в радиусе.
+
+    Индекс перестраивается один раз за обновление уровня, а запросы проверяют только клетки,
+    пересекающиеся с квадратом, описанным вокруг круга поиска. Расстояния сравниваются в квадрате.
+
+    Атрибуты:
+        cell_size (int): Размер клетки сетки в пикселях.
+        cells (dict): Словарь списков врагов по координатам клетки.
+        size (int): Количество врагов в индексе.
+        max_radius (float): Наибольший радиус врага в индексе (0 - индекс пуст).
+        queries (int): Количество запросов с последней перестройки.
+        cells_visited (int): Количество просмотренных непустых клеток с последней перестройки.
+        candidates (int): Количество проверенных врагов с последней перестройки.
+        matches (int): Количество врагов, попавших в радиус, с последней перестройки.
+    """
+
+    def __init__(self, cell_size=128):  # Конструктор класса SpatialHash.
+        """
+        Инициализация объекта SpatialHash.
+
+        Args:
+            cell_size (int): Размер клетки сетки в пикселях.
+        """
+        self.cell_size = cell_size  # Сохраняет размер клетки.
+        self.cells = {}  # Инициализирует пустой словарь клеток.
+        self.size = 0  # Инициализирует количество врагов в индексе.
+        self.max_radius = 0.0  # Инициализирует наибольший радиус врага.
+        self.queries = 0  # Инициализирует счетчик запросов.
+        self.cells_visited = 0  # Инициализирует счетчик просмотренных клеток.
+        self.candidates = 0  # Инициализирует счетчик проверенных врагов.
+        self.matches = 0  # Инициализирует счетчик найденных врагов.
+
+    def rebuild(self, enemies):  # Метод для перестройки индекса.
+        """
+        Перестраивает индекс по текущим позициям врагов и сбрасывает статистику запросов.
+
+        Args:
+            enemies (iterable): Враги с атрибутами position и radius.
+        """
+        cells = {}  # Создает новый словарь клеток.
+        cell_size = self.cell_size  # Сохраняет размер клетки в локальной переменной.
+        size = 0  # Инициализирует количество врагов.
+        max_radius = 0.0  # Инициализирует наибольший радиус врага.
+        for enemy in enemies:  # Перебирает всех врагов.
+            size += 1  # Увеличивает количество врагов.
+            if enemy.radius > max_radius:  # Проверяет, больше ли радиус врага наибольшего.
+                max_radius = enemy.radius  # Обновляет наибольший радиус врага.
+            key = (int(enemy.position.x // cell_size), int(enemy.position.y // cell_size))  # Вычисляет клетку врага.
+            bucket = cells.get(key)  # Получает список врагов в клетке.
+            if bucket is None:  # Если клетка еще пуста.
+                cells[key] = [enemy]  # Создает список с врагом.
+            else:
+                bucket.append(enemy)  # Добавляет врага в список клетки.
+        self.cells = cells  # Сохраняет новый словарь клеток.
+        self.size = size  # Сохраняет количество врагов.
+        self.max_radius = max_radius  # Сохраняет наибольший радиус врага.
+        self.queries = 0  # Сбрасывает счетчик запросов.
+        self.cells_visited = 0  # Сбрасывает счетчик просмотренных клеток.
+        self.candidates = 0  # Сбрасывает счетчик проверенных врагов.
+        self.matches = 0  # Сбрасывает счетчик найденных врагов.
+
+    def query_radius(self, position, radius):  # Метод для поиска врагов в радиусе.
+        """
+        Находит врагов, находящихся не дальше radius от позиции.
+
+        Args:
+            position (tuple): Центр поиска (x, y).
+            radius (float): Радиус поиска.
+
+        Returns:
+            list: Список пар (враг, квадрат расстояния до врага).
+        """
+        x, y = position  # Получает координаты центра поиска.
+        radius_sq = radius * radius  # Вычисляет квадрат радиуса.
+        cell_size = self.cell_size  # Сохраняет размер клетки в локальной переменной.
+        cells = self.cells  # Сохраняет словарь клеток в локальной переменной.
+        min_cy = int((y - radius) // cell_size)  # Вычисляет верхнюю строку клеток.
+        max_cy = int((y + radius) // cell_size)  # Вычисляет нижнюю строку клеток.
+        result = []  # Инициализирует список найденных врагов.
+        visited = 0  # Инициализирует счетчик просмотренных клеток.
+        candidates = 0  # Инициализирует счетчик проверенных врагов.
+        for cx in range(int((x - radius) // cell_size), int((x + radius) // cell_size) + 1):  # Перебирает столбцы клеток.
+            for cy in range(min_cy, max_cy + 1):  # Перебирает строки клеток.
+                bucket = cells.get((cx, cy))  # Получает список врагов в клетке.
+                if bucket is None:  # Если клетка пуста.
+                    continue  # Переходит к следующей клетке.
+                visited += 1  # Увеличивает счетчик просмотренных клеток.
+                candidates += len(bucket)  # Увеличивает счетчик проверенных врагов.
+                for enemy in bucket:  # Перебирает врагов в клетке.
+                    dx = enemy.position.x - x  # Вычисляет разницу по оси X.
+                    dy = enemy.position.y - y  # Вычисляет разницу по оси Y.
+                    distance_sq = dx * dx + dy * dy  # Вычисляет квадрат расстояния.
+                    if distance_sq <= radius_sq:  # Проверяет, находится ли враг в радиусе.
+                        result.append((enemy, distance_sq))  # Добавляет врага в результат.
+        self.queries += 1  # Увеличивает счетчик запросов.
+        self.cells_visited += visited  # Обновляет счетчик просмотренных клеток.
+        self.candidates += candidates  # Обновляет счетчик проверенных врагов.
+        self.matches += len(result)  # Обновляет счетчик найденных врагов.
+        return result  # Возвращает найденных врагов.
+
+    def stats(self):  # Метод для получения статистики запросов.
+        """
+        Возвращает статистику запросов с последней перестройки индекса.
+
+        Returns:
+            dict: Количество запросов, просмотренных клеток, проверенных и найденных врагов.
+        """
+        return {'queries': self.queries, 'cells_visited': self.cells_visited,
+                'candidates': self.candidates, 'matches': self.matches}  # Возвращает статистику.
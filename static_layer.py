@@ -0,0 +1,65 @@
+class StaticLayer:  # Определяет класс StaticLayer, который хранит заранее нарисованный неизменный слой карты.
+    """
+    Класс StaticLayer хранит поверхность с фоном, путем врагов и позициями башен.
+
+    Внутри уровня эти элементы не меняются, поэтому слой рисуется один раз и затем выводится
+    на экран одной операцией blit. Слой перерисовывается, только если сменился уровень, путь
+    или флаг отображения позиций на сетке.
+
+    Атрибуты:
+        game (TowerDefenseGame): Ссылка на основной объект игры.
+        surface (pygame.Surface): Нарисованный слой (None - слой еще не нарисован).
+        key (tuple): Уровень, номер пути и флаг отображения позиций, для которых нарисован слой.
+        rebuilds (int): Количество перерисовок слоя.
+    """
+
+    def __init__(self, game):  # Конструктор класса StaticLayer.
+        """
+        Инициализация объекта StaticLayer.
+
+        Args:
+            game (TowerDefenseGame): Основной объект игры.
+        """
+        self.game = game  # Сохраняет ссылку на основной объект игры.
+        self.surface = None  # Слой еще не нарисован.
+        self.key = None  # Слой еще не привязан к уровню.
+        self.rebuilds = 0  # Инициализирует счетчик перерисовок.
+
+    def invalidate(self):  # Метод для сброса слоя.
+        """
+        Сбрасывает слой, чтобы он был перерисован при следующем обращении.
+        """
+        self.surface = None  # Удаляет нарисованный слой.
+        self.key = None  # Отвязывает слой от уровня.
+
+    def _build(self):  # Метод для отрисовки слоя.
+        """
+        Рисует фон, путь врагов и, если нужно, позиции башен на новой поверхности.
+        """
+        self.surface = self.game.background.copy()  # Копирует фон игры.
+        self.game.level.draw_path(self.surface)  # Рисует путь врагов и места для башен.
+        self.game.grid.draw(self.surface)  # Рисует позиции на сетке, если они включены.
+        self.rebuilds += 1  # Увеличивает счетчик перерисовок.
+
+    def get(self):  # Метод для получения слоя.
+        """
+        Возвращает нарисованный слой, перерисовывая его при смене уровня, пути или флага show_spots.
+
+        Returns:
+            pygame.Surface: Слой с фоном, путем и позициями башен.
+        """
+        level = self.game.level  # Получает текущий уровень.
+        key = (level, level.current_path['number'], self.game.grid.show_spots)  # Составляет ключ слоя.
+        if self.surface is None or key != self.key:  # Проверяет, актуален ли слой.
+            self._build()  # Перерисовывает слой.
+            self.key = key  # Запоминает ключ слоя.
+        return self.surface  # Возвращает слой.
+
+    def draw(self, screen):  # Метод для отрисовки слоя.
+        """
+        Выводит слой на экран.
+
+        Args:
+            screen (pygame.Surface): Поверхность для отрисовки.
+        """
+        screen.blit(self.get(), (0, 0))  # Рисует слой одной операцией.
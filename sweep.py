@@ -0,0 +1,181 @@
+import argparse  # Импортирует модуль argparse для разбора аргументов командной строки.
+import ast  # Импортирует модуль ast для разбора значений параметров.
+import contextlib  # Импортирует модуль contextlib для перенаправления вывода.
+import csv  # Импортирует модуль csv для сохранения результатов.
+import io  # Импортирует модуль io для буфера вывода.
+import itertools  # Импортирует модуль itertools для перебора сочетаний параметров.
+import multiprocessing  # Импортирует модуль multiprocessing для параллельного запуска симуляций.
+import os  # Импортирует модуль os для получения количества ядер.
+import time  # Импортирует модуль time для измерения времени.
+
+from headless import create_headless_game, run_headless  # Импортирует функции из файла headless.py.
+from settings import Settings  # Импортирует класс Settings из файла settings.py.
+
+LAYOUTS = {  # Расстановки башен по имени: списки (тип, позиция) или (шаг, тип, позиция).
+    'demo': [('basic', (288, 352)), ('basic', (416, 416)), ('sniper', (672, 480)), ('basic', (224, 288))],
+    'entrance': [('basic', (160, 352)), ('basic', (160, 480)), ('basic', (288, 352)), ('basic', (288, 480)),
+                 ('sniper', (224, 416))],
+    'staged': [('basic', (288, 352)), ('basic', (416, 416)), ('basic', (544, 352)),
+               (3000, 'sniper', (672, 480)), (6000, 'basic', (800, 352)), (9000, 'basic', (800, 480))],
+}
+
+RESULT_FIELDS = ['run_id', 'path', 'layout', 'seed', 'win', 'game_over', 'waves_cleared', 'leaks', 'money', 'towers',
+                 'ticks', 'sim_time_ms', 'wall_time', 'money_curve']  # Столбцы результатов симуляции.
+
+worker_assets = None  # Кэш изображений процесса-исполнителя (загружается один раз на процесс).
+
+
+def expand_grid(grid):  # Функция для перебора сочетаний параметров.
+    """
+    Перебирает все сочетания значений параметров.
+
+    Args:
+        grid (dict): Списки значений по имени атрибута Settings.
+
+    Returns:
+        list: Словари замен настроек, по одному на сочетание.
+    """
+    names = sorted(grid)  # Получает имена параметров в постоянном порядке.
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]  # Возвращает сочетания.
+
+
+def build_tasks(grid, path_numbers, layout_names, seeds):  # Функция для составления списка симуляций.
+    """
+    Составляет список симуляций: сочетания параметров × пути × расстановки × начальные значения.
+
+    Args:
+        grid (dict): Списки значений по имени атрибута Settings.
+        path_numbers (list): Номера путей.
+        layout_names (list): Имена расстановок из LAYOUTS.
+        seeds (list): Начальные значения генератора случайных чисел.
+
+    Returns:
+        list: Симуляции: (номер, замены настроек, номер пути, имя расстановки, начальное значение).
+    """
+    combinations = itertools.product(expand_grid(grid), path_numbers, layout_names, seeds)  # Перебирает сочетания.
+    return [(run_id,) + combination for run_id, combination in enumerate(combinations)]  # Нумерует симуляции.
+
+
+def load_worker_assets():  # Функция для загрузки изображений процесса-исполнителя.
+    """
+    Загружает изображения один раз на процесс, чтобы симуляции процесса использовали общий кэш.
+
+    Вызывается из run_task, а не как initializer пула: ошибка загрузки тогда доходит до основного
+    процесса, а не перезапускает процессы-исполнители бесконечно.
+
+    Returns:
+        AssetManager: Кэш изображений процесса.
+    """
+    global worker_assets  # Изменяет кэш изображений процесса.
+    if worker_assets is None:  # Проверяет, загружены ли изображения.
+        with contextlib.redirect_stdout(io.StringIO()):  # Подавляет вывод сообщений игры.
+            worker_assets = create_headless_game().assets  # Создает игру без окна и сохраняет ее кэш изображений.
+    return worker_assets  # Возвращает кэш изображений.
+
+
+def run_task(task, max_ticks=200000):  # Функция для выполнения одной симуляции.
+    """
+    Выполняет одну симуляцию без окна.
+
+    Начальное значение передается в Settings.random_seed, как при воспроизведении записи: от него зависят
+    волны бесконечного режима (если wave_seed не задан перебором). Волны кампании на заданном пути
+    от начального значения не зависят.
+
+    Args:
+        task (tuple): (номер, замены настроек, номер пути, имя расстановки, начальное значение).
+        max_ticks (int): Максимальное количество шагов симуляции.
+
+    Returns:
+        dict: Строка результатов: параметры симуляции и ее итоги.
+    """
+    run_id, overrides, path_number, layout_name, seed = task  # Получает параметры симуляции.
+    result = run_headless(LAYOUTS[layout_name], path_number, max_ticks=max_ticks,
+                          overrides=dict({'random_seed': seed}, **overrides),
+                          assets=load_worker_assets())  # Выполняет симуляцию с начальным значением игры.
+    result.update(overrides)  # Добавляет значения параметров.
+    result.update({'run_id': run_id, 'layout': layout_name, 'seed': seed})  # Добавляет параметры симуляции.
+    result['money_curve'] = ' '.join(str(money) for money in result['money_curve'])  # Записывает деньги по волнам строкой.
+    return result  # Возвращает строку результатов.
+
+
+def run_sweep(tasks, output, processes=None):  # Функция для параллельного выполнения симуляций.
+    """
+    Выполняет симуляции в пуле процессов и записывает результаты в CSV по мере готовности.
+
+    Args:
+        tasks (list): Симуляции из build_tasks.
+        output (str): Путь к файлу CSV.
+        processes (int): Количество процессов (None - по количеству ядер).
+
+    Returns:
+        float: Затраченное время в секундах.
+    """
+    parameter_names = sorted({name for task in tasks for name in task[1]})  # Собирает имена параметров.
+    start = time.perf_counter()  # Запоминает время начала.
+    with open(output, 'w', newline='') as file:  # Открывает файл результатов.
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS[:4] + parameter_names + RESULT_FIELDS[4:])  # Создает запись CSV.
+        writer.writeheader()  # Записывает заголовок.
+        with multiprocessing.Pool(processes or os.cpu_count()) as pool:  # Создает пул процессов.
+            for done, result in enumerate(pool.imap_unordered(run_task, tasks), 1):  # Получает результаты по мере готовности.
+                writer.writerow(result)  # Записывает строку результатов.
+                file.flush()  # Сразу сохраняет строку на диск.
+                print(f"{done}/{len(tasks)} run {result['run_id']}: path {result['path']} {result['layout']} "
+                      f"{'win' if result['win'] else 'loss'} wave {result['waves_cleared']}")  # Выводит прогресс.
+    return time.perf_counter() - start  # Возвращает затраченное время.
+
+
+def parse_grid(entries):  # Функция для разбора параметров командной строки.
+    """
+    Разбирает параметры вида name=value1,value2 в словарь списков значений.
+
+    Args:
+        entries (list): Строки параметров.
+
+    Returns:
+        dict: Списки значений по имени атрибута Settings.
+
+    Raises:
+        ValueError: Если атрибута нет в Settings.
+    """
+    settings = Settings()  # Создает настройки для проверки имен параметров.
+    grid = {}  # Инициализирует словарь параметров.
+    for entry in entries:  # Перебирает строки параметров.
+        name, _, values = entry.partition('=')  # Разделяет имя и значения.
+        if not hasattr(settings, name):  # Проверяет, есть ли такой атрибут в настройках.
+            raise ValueError(f"Unknown setting: {name}")  # Сообщает о неизвестном параметре.
+        grid[name] = []  # Инициализирует список значений.
+        for value in values.split(','):  # Перебирает значения.
+            try:
+                grid[name].append(ast.literal_eval(value))  # Разбирает число или другое значение Python.
+            except (ValueError, SyntaxError):  # Если значение не является выражением Python.
+                grid[name].append(value)  # Сохраняет значение как строку.
+    return grid  # Возвращает словарь параметров.
+
+
+def main():  # Функция для запуска перебора из командной строки.
+    """
+    Запускает перебор параметров баланса по путям и расстановкам башен и сохраняет результаты в CSV.
+    """
+    path_count = len(Settings().enemy_paths)  # Получает количество путей.
+    parser = argparse.ArgumentParser(description="Tower Defense balance sweep.")  # Создает разбор аргументов.
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=V1,V2',
+                        help="Settings attribute and the values to sweep (repeatable)")  # Параметры перебора.
+    parser.add_argument('--paths', default=','.join(str(number) for number in range(1, path_count + 1)),
+                        help="comma-separated path numbers (default: all)")  # Номера путей.
+    parser.add_argument('--layouts', default=','.join(LAYOUTS),
+                        help="comma-separated layout names (default: all)")  # Имена расстановок.
+    parser.add_argument('--seeds', type=int, default=1,
+                        help="random seeds per combination (they change endless-mode waves; campaign runs "
+                             "on a fixed path are deterministic)")  # Количество начальных значений.
+    parser.add_argument('--processes', type=int, help="worker processes (default: CPU count)")  # Количество процессов.
+    parser.add_argument('--output', default='sweep.csv', help="CSV file for the results")  # Файл результатов.
+    args = parser.parse_args()  # Разбирает аргументы.
+
+    tasks = build_tasks(parse_grid(args.set), [int(number) for number in args.paths.split(',')],
+                        args.layouts.split(','), list(range(args.seeds)))  # Составляет список симуляций.
+    elapsed = run_sweep(tasks, args.output, args.processes)  # Выполняет симуляции.
+    print(f"{len(tasks)} runs in {elapsed:.1f} s ({len(tasks) / elapsed:.2f} runs/s), results in {args.output}")  # Выводит итоги.
+
+
+if __name__ == '__main__':  # Проверяет, запущен ли файл напрямую.
+    main()  # Запускает перебор.
@@ -0,0 +1,133 @@
+try:
+    import numpy  # Импортирует библиотеку NumPy для векторных вычислений (необязательная зависимость).
+except ImportError:  # Если NumPy не установлен.
+    numpy = None  # Пакетный выбор целей будет недоступен.
+
+
+class BatchTargeting:  # Определяет класс BatchTargeting, который выбирает цели для всех башен за один проход.
+    """
+    Класс BatchTargeting выбирает цели для всех готовых к выстрелу башен с помощью NumPy.
+
+    Позиции и здоровье врагов, а также позиции, дальности и перезарядка башен собираются в массивы,
+    после чего строится матрица расстояний башня-враг. Стратегия выбора задается атрибутом
+    targeting класса башни: 'nearest' - ближайший враг, 'healthiest' - враг с наибольшим здоровьем.
+
+    Атрибуты:
+        enemy_positions (numpy.ndarray): Позиции врагов, форма (m, 2).
+        enemy_health (numpy.ndarray): Здоровье врагов, форма (m,).
+        tower_positions (numpy.ndarray): Позиции башен, форма (k, 2).
+        tower_ranges (numpy.ndarray): Дальности башен, форма (k,).
+        tower_ready (numpy.ndarray): Готовность башен к выстрелу, форма (k,).
+    """
+
+    def __init__(self):  # Конструктор класса BatchTargeting.
+        """
+        Инициализация объекта BatchTargeting.
+
+        Raises:
+            ImportError: Если NumPy не установлен.
+        """
+        if numpy is None:  # Проверяет, доступен ли NumPy.
+            raise ImportError("NumPy is required for batch targeting.")  # Сообщает об отсутствии NumPy.
+        self.enemy_positions = numpy.empty((0, 2))  # Инициализирует массив позиций врагов.
+        self.enemy_health = numpy.empty(0)  # Инициализирует массив здоровья врагов.
+        self.tower_positions = numpy.empty((0, 2))  # Инициализирует массив позиций башен.
+        self.tower_ranges = numpy.empty(0)  # Инициализирует массив дальностей башен.
+        self.tower_ready = numpy.empty(0, dtype=bool)  # Инициализирует массив готовности башен.
+
+    def load(self, towers, enemies, current_time):  # Метод для заполнения массивов.
+        """
+        Заполняет массивы состоянием башен, которые умеют стрелять, и врагов.
+
+        Args:
+            towers (list): Башни с атрибутом targeting, отличным от None.
+            enemies (list): Враги.
+            current_time (int): Текущее время в миллисекундах.
+        """
+        self.enemy_positions = numpy.array([(enemy.position.x, enemy.position.y) for enemy in enemies],
+                                           dtype=float).reshape(-1, 2)  # Заполняет позиции врагов.
+        self.enemy_health = numpy.array([enemy.health for enemy in enemies], dtype=float)  # Заполняет здоровье врагов.
+        self.tower_positions = numpy.array([(tower.position.x, tower.position.y) for tower in towers],
+                                           dtype=float).reshape(-1, 2)  # Заполняет позиции башен.
+        self.tower_ranges = numpy.array([tower.tower_range for tower in towers], dtype=float)  # Заполняет дальности башен.
+        self.tower_ready = numpy.array([current_time - tower.last_shot_time > tower.rate_of_fire for tower in towers],
+                                       dtype=bool)  # Заполняет готовность башен к выстрелу.
+
+    def resolve(self, towers, enemies, current_time):  # Метод для выбора целей.
+        """
+        Выбирает цели для всех готовых к выстрелу башен.
+
+        Args:
+            towers (iterable): Башни уровня.
+            enemies (iterable): Враги уровня.
+            current_time (int): Текущее время в миллисекундах.
+
+        Returns:
+            list: Список пар (башня, цель) для башен, нашедших цель.
+        """
+        towers = [tower for tower in towers if tower.targeting is not None]  # Оставляет только стреляющие башни.
+        enemies = [enemy for enemy in enemies if enemy.in_use]  # Фиксирует порядок живых врагов.
+        if not towers or not enemies:  # Проверяет, есть ли башни и враги.
+            return []  # Возвращает пустой список.
+        self.load(towers, enemies, current_time)  # Заполняет массивы.
+
+        ready = numpy.flatnonzero(self.tower_ready)  # Получает индексы готовых башен.
+        if ready.size == 0:  # Проверяет, есть ли готовые башни.
+            return []  # Возвращает пустой список.
+        delta = self.tower_positions[ready, None, :] - self.enemy_positions[None, :, :]  # Вычисляет разности координат.
+        distance_sq = numpy.einsum('ijk,ijk->ij', delta, delta)  # Вычисляет матрицу квадратов расстояний.
+        in_range = distance_sq <= (self.tower_ranges[ready] ** 2)[:, None]  # Строит маску врагов в радиусе.
+
+        nearest_key = numpy.where(in_range, distance_sq, numpy.inf)  # Заменяет врагов вне радиуса бесконечностью.
+        nearest = numpy.argmin(nearest_key, axis=1)  # Находит ближайшего врага для каждой башни.
+        health_key = numpy.where(in_range, self.enemy_health[None, :], 0.0)  # Обнуляет здоровье врагов вне радиуса.
+        healthiest = numpy.argmax(health_key, axis=1)  # Находит самого здорового врага для каждой башни.
+
+        rows = numpy.arange(ready.size)  # Получает номера строк матрицы.
+        has_nearest = numpy.isfinite(nearest_key[rows, nearest])  # Проверяет, нашелся ли ближайший враг.
+        has_healthiest = health_key[rows, healthiest] > 0  # Проверяет, нашелся ли враг с положительным здоровьем.
+
+        result = []  # Инициализирует список результатов.
+        for row, tower_index in enumerate(ready.tolist()):  # Перебирает готовые башни.
+            tower = towers[tower_index]  # Получает башню.
+            if tower.targeting == 'healthiest':  # Проверяет стратегию башни.
+                if has_healthiest[row]:  # Если цель найдена.
+                    result.append((tower, enemies[healthiest[row]]))  # Добавляет пару башня-цель.
+            elif has_nearest[row]:  # Если ближайшая цель найдена.
+                result.append((tower, enemies[nearest[row]]))  # Добавляет пару башня-цель.
+        return result  # Возвращает список пар.
+
+
+def parity_mismatches(towers, enemies, enemy_index, current_time):  # Функция для сравнения пакетного и скалярного выбора целей.
+    """
+    Сравнивает цели, выбранные BatchTargeting, с целями скалярного метода find_target.
+
+    Цели считаются совпадающими, если это один и тот же враг или враги с одинаковым ключом
+    выбора (квадрат расстояния или здоровье), так как при равенстве ключей порядок перебора различается.
+
+    Args:
+        towers (iterable): Башни уровня.
+        enemies (iterable): Враги уровня.
+        enemy_index (SpatialHash): Пространственный индекс, перестроенный по тем же врагам.
+        current_time (int): Текущее время в миллисекундах.
+
+    Returns:
+        list: Список троек (башня, цель пакетного метода, цель скалярного метода) для несовпадений.
+    """
+    batch = dict(BatchTargeting().resolve(towers, enemies, current_time))  # Получает цели пакетного метода.
+    mismatches = []  # Инициализирует список несовпадений.
+    for tower in towers:  # Перебирает башни.
+        if tower.targeting is None or current_time - tower.last_shot_time <= tower.rate_of_fire:  # Пропускает неготовые башни.
+            continue  # Переходит к следующей башне.
+        expected = tower.find_target(enemy_index)  # Получает цель скалярного метода.
+        actual = batch.get(tower)  # Получает цель пакетного метода.
+        if actual is expected:  # Проверяет, совпадают ли цели.
+            continue  # Переходит к следующей башне.
+        if actual is not None and expected is not None:  # Проверяет равенство ключей выбора.
+            if tower.targeting == 'healthiest' and actual.health == expected.health:  # Сравнивает здоровье.
+                continue  # Цели равноценны.
+            if tower.targeting == 'nearest' and tower.position.distance_squared_to(
+                    actual.position) == tower.position.distance_squared_to(expected.position):  # Сравнивает расстояния.
+                continue  # Цели равноценны.
+        mismatches.append((tower, actual, expected))  # Добавляет несовпадение.
+    return mismatches  # Возвращает список несовпадений.
@@ -0,0 +1,104 @@
+import collections  # Импортирует модуль collections для упорядоченного словаря.
+
+
+class TextCache:  # Определяет класс TextCache, который хранит отрисованные строки текста.
+    """
+    Класс TextCache хранит отрисованные строки по ключу (шрифт, строка, цвет) и вытесняет
+    давно не использованные строки, когда их становится больше max_entries.
+
+    Атрибуты:
+        max_entries (int): Максимальное количество хранимых строк.
+        entries (collections.OrderedDict): Отрисованные строки от давно использованных к недавним.
+        hits (int): Количество обращений, найденных в кэше.
+        misses (int): Количество обращений, потребовавших отрисовки.
+    """
+
+    def __init__(self, max_entries=256):  # Конструктор класса TextCache.
+        """
+        Инициализация объекта TextCache.
+
+        Args:
+            max_entries (int): Максимальное количество хранимых строк.
+        """
+        self.max_entries = max_entries  # Сохраняет максимальное количество строк.
+        self.entries = collections.OrderedDict()  # Инициализирует словарь отрисованных строк.
+        self.hits = 0  # Инициализирует счетчик попаданий.
+        self.misses = 0  # Инициализирует счетчик промахов.
+
+    def render(self, font, text, color=(255, 255, 255)):  # Метод для получения отрисованной строки.
+        """
+        Возвращает отрисованную строку, отрисовывая ее только при первом обращении.
+
+        Args:
+            font (pygame.font.Font): Шрифт.
+            text (str): Строка.
+            color (tuple): Цвет текста.
+
+        Returns:
+            pygame.Surface: Отрисованная строка.
+        """
+        key = (font, text, color)  # Составляет ключ строки.
+        surface = self.entries.get(key)  # Ищет строку в кэше.
+        if surface is not None:  # Если строка уже отрисована.
+            self.hits += 1  # Увеличивает счетчик попаданий.
+            self.entries.move_to_end(key)  # Отмечает строку как недавно использованную.
+            return surface  # Возвращает строку из кэша.
+        self.misses += 1  # Увеличивает счетчик промахов.
+        surface = font.render(text, True, color)  # Отрисовывает строку.
+        self.entries[key] = surface  # Сохраняет строку в кэш.
+        if len(self.entries) > self.max_entries:  # Проверяет, не переполнен ли кэш.
+            self.entries.popitem(last=False)  # Вытесняет давно не использованную строку.
+        return surface  # Возвращает строку.
+
+    def stats(self):  # Метод для получения статистики кэша.
+        """
+        Возвращает статистику кэша.
+
+        Returns:
+            dict: Количество строк, попаданий и промахов.
+        """
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}  # Возвращает статистику.
+
+
+class TextWidget:  # Определяет класс TextWidget, который показывает строку интерфейса с привязанным значением.
+    """
+    Класс TextWidget показывает строку по шаблону и заново отрисовывает ее только при изменении значений.
+
+    Атрибуты:
+        font (pygame.font.Font): Шрифт.
+        template (str): Шаблон строки для str.format.
+        position (tuple): Позиция строки на экране.
+        color (tuple): Цвет текста.
+        values (tuple): Значения, для которых отрисована строка.
+        surface (pygame.Surface): Отрисованная строка (None - еще не отрисована).
+    """
+
+    def __init__(self, font, template, position, color=(255, 255, 255)):  # Конструктор класса TextWidget.
+        """
+        Инициализация объекта TextWidget.
+
+        Args:
+            font (pygame.font.Font): Шрифт.
+            template (str): Шаблон строки для str.format.
+            position (tuple): Позиция строки на экране.
+            color (tuple): Цвет текста.
+        """
+        self.font = font  # Сохраняет шрифт.
+        self.template = template  # Сохраняет шаблон строки.
+        self.position = position  # Сохраняет позицию строки.
+        self.color = color  # Сохраняет цвет текста.
+        self.values = None  # Строка еще не отрисована.
+        self.surface = None  # Строка еще не отрисована.
+
+    def draw(self, screen, *values):  # Метод для отрисовки строки.
+        """
+        Рисует строку, заново отрисовывая ее только если значения изменились.
+
+        Args:
+            screen (pygame.Surface): Поверхность для отрисовки.
+            *values: Значения для подстановки в шаблон.
+        """
+        if values != self.values:  # Проверяет, изменились ли значения.
+            self.surface = self.font.render(self.template.format(*values), True, self.color)  # Отрисовывает строку.
+            self.values = values  # Запоминает значения.
+        screen.blit(self.surface, self.position)  # Рисует строку.
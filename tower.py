@@ -2,8 +2,6 @@ import math  # Импортирует модуль math для работы с 
 
 import pygame  # Импортирует библиотеку Pygame для работы с графикой и игровыми объектами.
 
-from bullet import Bullet  # Импортирует класс Bullet из файла bullet.py.
-
 
 class Tower(pygame.sprite.Sprite):  # Определяет базовый класс Tower, который наследуется от pygame.sprite.Sprite.
     """
@@ -20,8 +18,12 @@ class Tower(pygame.sprite.Sprite):  # Определяет базовый кла
         last_shot_time (int): Время последнего выстрела.
         level (int): Уровень башни.
         original_image (pygame.Surface): Оригинальное изображение башни (без поворота).
+        rotations (RotationCache): Общий для типа башни кэш повернутых изображений.
+        targeting (str): Стратегия выбора цели ('nearest', 'healthiest' или None, если башня не стреляет).
     """
 
+    targeting = 'nearest'  # Башня атакует ближайшего врага.
+
     def __init__(self, position, game):  # Конструктор класса Tower.
         """
         Инициализация объекта Tower.
@@ -39,9 +41,10 @@ class Tower(pygame.sprite.Sprite):  # Определяет базовый кла
         self.tower_range = 0  # Инициализирует дальность действия башни.
         self.damage = 0  # Инициализирует урон башни.
         self.rate_of_fire = 0  # Инициализирует скорострельность башни.
-        self.last_shot_time = pygame.time.get_ticks()  # Записывает время последнего выстрела.
+        self.last_shot_time = game.sim_clock.get_ticks()  # Записывает время последнего выстрела.
         self.level = 1  # Устанавливает уровень башни на 1.
         self.original_image = self.image  # Сохраняет оригинальное изображение башни.
+        self.rotations = None  # Инициализирует кэш повернутых изображений как None.
 
     def upgrade_cost(self):  # Метод для расчета стоимости улучшения башни.
         """
@@ -52,42 +55,53 @@ class Tower(pygame.sprite.Sprite):  # Определяет базовый кла
         """
         return 50 * self.level  # Возвращает стоимость улучшения, зависящую от текущего уровня башни.
 
-    def draw(self, screen):  # Метод для отрисовки башни на экране.
+    def draw(self, screen):  # Метод для отрисовки подсказки башни на экране.
         """
-        Отрисовывает башню на экране.
+        Отрисовывает подсказку башни: уровень и цену улучшения.
+
+        Вызывается уровнем только для башни под мышью (см. Grid.tower_at).
 
         Args:
             screen (pygame.Surface): Поверхность для отрисовки.
         """
-        mouse_pos = pygame.mouse.get_pos()  # Получает текущую позицию мыши.
-        if self.is_hovered(mouse_pos):  # Проверяет, наведена ли мышь на башню.
-            level_text = self.game.font.render(f"Level: {self.level}", True,
-                                               (255, 255, 255))  # Создает текст с уровнем башни.
-            upgrade_cost_text = self.game.font.render(f"Upgrade: ${self.upgrade_cost()}", True,
-                                                      (255, 255, 255))  # Создает текст с ценой улучшения.
+        level_text = self.game.text.render(self.game.font, f"Level: {self.level}",
+                                           (255, 255, 255))  # Получает текст с уровнем башни.
+        upgrade_cost_text = self.game.text.render(self.game.font, f"Upgrade: ${self.upgrade_cost()}",
+                                                  (255, 255, 255))  # Получает текст с ценой улучшения.
 
-            level_text_pos = (self.position.x, self.position.y + 20)  # Устанавливает позицию текста с уровнем.
-            upgrade_cost_pos = (
-            self.position.x, self.position.y + 40)  # Устанавливает позицию текста с ценой улучшения.
+        level_text_pos = (self.position.x, self.position.y + 20)  # Устанавливает позицию текста с уровнем.
+        upgrade_cost_pos = (
+        self.position.x, self.position.y + 40)  # Устанавливает позицию текста с ценой улучшения.
 
-            screen.blit(level_text, level_text_pos)  # Рисует текст с уровнем на экране.
-            screen.blit(upgrade_cost_text, upgrade_cost_pos)  # Рисует текст с ценой улучшения на экране.
+        screen.blit(level_text, level_text_pos)  # Рисует текст с уровнем на экране.
+        screen.blit(upgrade_cost_text, upgrade_cost_pos)  # Рисует текст с ценой улучшения на экране.
 
-    def update(self, enemies, current_time, bullets_group):  # Метод для обновления состояния башни.
+    def update(self, enemy_index, current_time, bullets_group):  # Метод для обновления состояния башни.
         """
         Обновляет состояние башни.
 
         Args:
-            enemies (pygame.sprite.Group): Группа врагов.
+            enemy_index (SpatialHash): Пространственный индекс врагов.
             current_time (int): Текущее время в миллисекундах.
             bullets_group (pygame.sprite.Group): Группа пуль.
         """
         if current_time - self.last_shot_time > self.rate_of_fire:  # Проверяет, прошло ли достаточно времени для выстрела.
-            target = self.find_target(enemies)  # Находит цель для атаки.
+            target = self.find_target(enemy_index)  # Находит цель для атаки.
             if target:  # Если цель найдена.
-                self.rotate_towards_target(target)  # Поворачивает башню в сторону цели.
-                self.shoot(target, bullets_group)  # Выполняет выстрел.
-                self.last_shot_time = current_time  # Обновляет время последнего выстрела.
+                self.fire(target, current_time, bullets_group)  # Стреляет по цели.
+
+    def fire(self, target, current_time, bullets_group):  # Метод для выстрела по выбранной цели.
+        """
+        Поворачивает башню к цели, выполняет выстрел и запускает перезарядку.
+
+        Args:
+            target (Enemy): Цель для выстрела.
+            current_time (int): Текущее время в миллисекундах.
+            bullets_group (pygame.sprite.Group): Группа пуль.
+        """
+        self.rotate_towards_target(target)  # Поворачивает башню в сторону цели.
+        self.shoot(target, bullets_group)  # Выполняет выстрел.
+        self.last_shot_time = current_time  # Обновляет время последнего выстрела.
 
     def is_hovered(self, mouse_pos):  # Метод для проверки, наведена ли мышь на башню.
         """
@@ -105,19 +119,25 @@ class Tower(pygame.sprite.Sprite):  # Определяет базовый кла
         """
         Выстрел башни по цели.
 
+        Точка и шаг попадания рассчитываются сразу по движению цели вдоль пути, а попадание
+        планируется в очереди попаданий уровня.
+
         Args:
             target (Enemy): Цель для выстрела.
             bullets_group (pygame.sprite.Group): Группа пуль.
         """
-        # Преобразуем Vector2 в кортеж
-        start_pos = (self.position.x, self.position.y)  # Получает начальную позицию башни.
-        target_pos = (target.position.x, target.position.y)  # Получает позицию цели.
+        level = self.game.level  # Получает уровень.
+        fire_tick = self.game.sim_clock.ticks  # Получает шаг выстрела.
+        flight_ticks, impact_pos = target.track.intercept(self.position, target.distance, target.speed,
+                                                          self.game.settings.bullet_speed)  # Рассчитывает перехват.
 
-        # Создаем новую пулю
-        new_bullet = Bullet(start_pos, target_pos, self.damage, self.game)  # Создает новую пулю.
+        # Берем пулю из пула
+        new_bullet = level.bullet_pool.acquire((self.position.x, self.position.y), impact_pos, self.damage, fire_tick,
+                                               fire_tick + flight_ticks)  # Получает пулю из пула.
 
         # Добавляем пулю в группу
         bullets_group.add(new_bullet)  # Добавляет пулю в группу пуль.
+        level.impacts.schedule(new_bullet)  # Планирует попадание.
 
         # Воспроизводим звук выстрела
         self.play_shoot_sound()  # Воспроизводит звук выстрела.
@@ -126,8 +146,7 @@ class Tower(pygame.sprite.Sprite):  # Определяет базовый кла
         """
         Воспроизведение звука выстрела.
         """
-        shoot_sound = pygame.mixer.Sound(self.game.settings.shoot_sound)  # Загружает звук выстрела.
-        shoot_sound.play()  # Воспроизводит звук.
+        self.game.audio.play('shoot')  # Воспроизводит заранее загруженный звук выстрела.
 
     def rotate_towards_target(self, target):  # Метод для поворота башни в сторону цели.
         """
@@ -143,28 +162,38 @@ class Tower(pygame.sprite.Sprite):  # Определяет базовый кла
         # Преобразуем радианы в градусы
         angle_deg = math.degrees(angle_rad)  # Преобразует угол в градусы.
         angle_deg = -angle_deg - 90  # Корректирует угол для правильного отображения.
-        self.image = pygame.transform.rotate(self.original_image, angle_deg)  # Поворачивает изображение башни.
-        self.rect = self.image.get_rect(center=self.position)  # Обновляет прямоугольник башни.
+        self.image = self.rotations.get(angle_deg)  # Получает повернутое изображение башни из кэша.
+        self.rect.size = self.image.get_size()  # Обновляет размер прямоугольника башни.
+        self.rect.center = self.position  # Центрирует прямоугольник башни на ее позиции.
 
-    def find_target(self, enemies):  # Метод для поиска цели для атаки.
+    def find_target(self, enemy_index):  # Метод для поиска цели для атаки.
         """
         Находит ближайшую цель для атаки.
 
+        Враги, уничтоженные в этом шаге, остаются в индексе до его перестройки и пропускаются.
+
         Args:
-            enemies (pygame.sprite.Group): Группа врагов.
+            enemy_index (SpatialHash): Пространственный индекс врагов.
 
         Returns:
             Enemy: Ближайший враг, находящийся в радиусе действия башни.
         """
         nearest_enemy = None  # Инициализирует переменную для ближайшего врага.
-        min_distance = float('inf')  # Инициализирует минимальное расстояние как бесконечность.
-        for enemy in enemies:  # Перебирает всех врагов.
-            distance = self.position.distance_to(enemy.position)  # Вычисляет расстояние до врага.
-            if distance < min_distance and distance <= self.tower_range:  # Проверяет, ближе ли враг и в радиусе действия башни.
+        min_distance_sq = float('inf')  # Инициализирует минимальный квадрат расстояния как бесконечность.
+        for enemy, distance_sq in enemy_index.query_radius(self.position,
+                                                           self.tower_range):  # Перебирает врагов в радиусе действия башни.
+            if enemy.in_use and distance_sq < min_distance_sq:  # Проверяет, жив ли враг и ближе ли он.
                 nearest_enemy = enemy  # Обновляет ближайшего врага.
-                min_distance = distance  # Обновляет минимальное расстояние.
+                min_distance_sq = distance_sq  # Обновляет минимальный квадрат расстояния.
         return nearest_enemy  # Возвращает ближайшего врага.
 
+    def apply_balance(self):  # Метод для применения множителей баланса из настроек.
+        """
+        Умножает урон и перезарядку башни на множители tower_damage_scale и tower_rate_of_fire_scale из настроек.
+        """
+        self.damage = int(self.damage * self.game.settings.tower_damage_scale)  # Применяет множитель урона.
+        self.rate_of_fire = int(self.rate_of_fire * self.game.settings.tower_rate_of_fire_scale)  # Применяет множитель перезарядки.
+
     def upgrade(self):  # Метод для улучшения башни.
         """
         Улучшает башню, увеличивая её уровень, урон и скорострельность.
@@ -198,13 +227,14 @@ class BasicTower(Tower):  # Определяет класс BasicTower, кото
             game (TowerDefenseGame): Основной объект игры.
         """
         super().__init__(position, game)  # Вызывает конструктор родительского класса.
-        self.image = pygame.image.load(
-            'assets/towers/basic_tower.png').convert_alpha()  # Загружает изображение базовой башни.
+        self.image = game.assets.get_image(game.settings.tower_sprites['basic'])  # Получает изображение базовой башни из кэша.
         self.original_image = self.image  # Сохраняет оригинальное изображение башни.
+        self.rotations = game.assets.get_rotations(game.settings.tower_sprites['basic'])  # Получает кэш поворотов.
         self.rect = self.image.get_rect(center=self.position)  # Создает прямоугольник для башни.
         self.tower_range = 150  # Устанавливает дальность действия башни.
         self.damage = 20  # Устанавливает урон башни.
         self.rate_of_fire = 1000  # Устанавливает скорострельность башни.
+        self.apply_balance()  # Применяет множители баланса из настроек.
 
 
 class SniperTower(Tower):  # Определяет класс SniperTower, который наследуется от Tower.
@@ -217,6 +247,8 @@ class SniperTower(Tower):  # Определяет класс SniperTower, кот
         rate_of_fire (int): Скорострельность башни (в миллисекундах).
     """
 
+    targeting = 'healthiest'  # Башня атакует врага с наибольшим здоровьем.
+
     def __init__(self, position, game):  # Конструктор класса SniperTower.
         """
         Инициализация объекта SniperTower.
@@ -226,30 +258,47 @@ class SniperTower(Tower):  # Определяет класс SniperTower, кот
             game (TowerDefenseGame): Основной объект игры.
         """
         super().__init__(position, game)  # Вызывает конструктор родительского класса.
-        self.image = pygame.image.load(
-            'assets/towers/sniper_tower.png').convert_alpha()  # Загружает изображение снайперской башни.
-        self.image = pygame.transform.rotate(self.image, 90)  # Поворачивает изображение башни на 90 градусов.
+        self.image = game.assets.get_image(game.settings.tower_sprites['sniper'],
+                                           angle=90)  # Получает изображение снайперской башни, повернутое на 90 градусов.
         self.original_image = self.image  # Сохраняет оригинальное изображение башни.
+        self.rotations = game.assets.get_rotations(game.settings.tower_sprites['sniper'], 90)  # Получает кэш поворотов.
         self.rect = self.image.get_rect(center=self.position)  # Создает прямоугольник для башни.
         self.tower_range = 300  # Устанавливает дальность действия башни.
         self.damage = 40  # Устанавливает урон башни.
         self.rate_of_fire = 2000  # Устанавливает скорострельность башни.
+        self.apply_balance()  # Применяет множители баланса из настроек.
 
-    def find_target(self, enemies):  # Переопределяет метод поиска цели для снайперской башни.
+    def shoot(self, target, bullets_group):  # Переопределяет метод выстрела для снайперской башни.
+        """
+        Выстрел снайперской башни: мгновенное попадание без пули, если включен Settings.sniper_hitscan.
+
+        Args:
+            target (Enemy): Цель для выстрела.
+            bullets_group (pygame.sprite.Group): Группа пуль.
+        """
+        if not self.game.settings.sniper_hitscan:  # Проверяет, выключено ли мгновенное попадание.
+            super().shoot(target, bullets_group)  # Выпускает пулю.
+            return  # Завершает выстрел.
+        target.take_damage(self.damage)  # Наносит урон сразу.
+        self.play_shoot_sound()  # Воспроизводит звук выстрела.
+
+    def find_target(self, enemy_index):  # Переопределяет метод поиска цели для снайперской башни.
         """
         Находит цель с наибольшим здоровьем для атаки.
 
+        Враги, уничтоженные в этом шаге, остаются в индексе до его перестройки и пропускаются.
+
         Args:
-            enemies (pygame.sprite.Group): Группа врагов.
+            enemy_index (SpatialHash): Пространственный индекс врагов.
 
         Returns:
             Enemy: Враг с наибольшим здоровьем, находящийся в радиусе действия башни.
         """
         healthiest_enemy = None  # Инициализирует переменную для врага с наибольшим здоровьем.
         max_health = 0  # Инициализирует максимальное здоровье.
-        for enemy in enemies:  # Перебирает всех врагов.
-            if self.position.distance_to(
-                    enemy.position) <= self.tower_range and enemy.health > max_health:  # Проверяет, в радиусе ли враг и его здоровье больше максимального.
+        for enemy, _ in enemy_index.query_radius(self.position,
+                                                 self.tower_range):  # Перебирает врагов в радиусе действия башни.
+            if enemy.in_use and enemy.health > max_health:  # Проверяет, жив ли враг и больше ли его здоровье.
                 healthiest_enemy = enemy  # Обновляет врага с наибольшим здоровьем.
                 max_health = enemy.health  # Обновляет максимальное здоровье.
         return healthiest_enemy  # Возвращает врага с наибольшим здоровьем.
@@ -265,17 +314,18 @@ class MoneyTower(Tower):  # Определяет класс MoneyTower, кото
         last_money_time (int): Время последней генерации денег.
     """
 
+    targeting = None  # Башня не стреляет.
+
     def __init__(self, position, game):  # Конструктор класса MoneyTower.
         super().__init__(position, game)  # Вызывает конструктор родительского класса.
-        self.image = pygame.image.load(
-            'assets/towers/money_tower.png').convert_alpha()  # Загружает изображение башни, генерирующей деньги.
+        self.image = game.assets.get_image(game.settings.tower_sprites['money'])  # Получает изображение башни, генерирующей деньги, из кэша.
         self.original_image = self.image  # Сохраняет оригинальное изображение башни.
         self.rect = self.image.get_rect(center=self.position)  # Создает прямоугольник для башни.
         self.money_generation_rate = 3000  # Устанавливает частоту генерации денег (каждые 3 секунды).
         self.money_amount = 50  # Устанавливает количество денег, которое генерирует башня.
-        self.last_money_time = pygame.time.get_ticks()  # Записывает время последней генерации денег.
+        self.last_money_time = game.sim_clock.get_ticks()  # Записывает время последней генерации денег.
 
-    def update(self, enemies, current_time,
+    def update(self, enemy_index, current_time,
                bullets_group):  # Переопределяет метод обновления для башни, генерирующей деньги.
         """
         Обновляет состояние башни, проверяя, прошло ли достаточно времени для генерации денег.
@@ -0,0 +1,129 @@
+import random  # Импортирует модуль random для воспроизводимых случайных чисел.
+
+from enemy import ENEMY_TYPES  # Импортирует типы врагов из файла enemy.py.
+
+CAMPAIGN_WAVES = [  # Волны кампании: серии (имя типа врага, количество).
+    [('basic', 5)],  # Волна 1: 5 базовых врагов
+    [('fast', 7)],  # Волна 2: 7 быстрых врагов
+    [('strong', 4)],  # Волна 3: 4 сильных врага
+    [('very_fast', 10)],  # Волна 4: 10 очень быстрых врагов
+    [('very_strong', 3)],  # Волна 5: 3 очень сильных врага
+    [('fast', 5), ('strong', 3)],  # Волна 6: Смесь быстрых и сильных врагов
+    [('very_fast', 8), ('very_strong', 2)],  # Волна 7: Очень быстрые и очень сильные враги
+    [('basic', 15)],  # Волна 8: Большое количество базовых врагов
+    [('basic', 5), ('fast', 5), ('strong', 3), ('very_fast', 5),
+     ('very_strong', 2)],  # Волна 9: Смесь всех типов врагов
+    [('strong', 10), ('very_strong', 5)],  # Волна 10: Финальная волна с большим количеством сильных врагов
+]
+
+
+def campaign_waves():  # Генератор волн кампании.
+    """
+    Выдает волны кампании по одной.
+
+    Yields:
+        list: Серии волны (тип врага, количество).
+    """
+    for wave in CAMPAIGN_WAVES:  # Перебирает волны кампании.
+        yield [(ENEMY_TYPES[type_name], count) for type_name, count in wave]  # Выдает волну с типами врагов.
+
+
+def endless_waves(seed=None, base_count=5, count_step=2, health_step=0.15, speed_step=0.02,
+                  max_speed_scale=1.5):  # Генератор бесконечных волн.
+    """
+    Бесконечно выдает процедурные волны: с каждой волной растут количество врагов, их здоровье и скорость.
+
+    Args:
+        seed (int): Начальное значение генератора случайных чисел (None - случайные волны).
+        base_count (int): Количество врагов в первой волне.
+        count_step (int): Прирост количества врагов с каждой волной.
+        health_step (float): Прирост здоровья и награды с каждой волной (доля от исходного).
+        speed_step (float): Прирост скорости с каждой волной (доля от исходной).
+        max_speed_scale (float): Наибольший множитель скорости.
+
+    Yields:
+        list: Серии волны (тип врага, количество).
+    """
+    rng = random.Random(seed)  # Создает генератор случайных чисел волн.
+    type_names = sorted(ENEMY_TYPES)  # Получает имена типов врагов в постоянном порядке.
+    number = 0  # Инициализирует номер волны.
+    while True:  # Волны не заканчиваются.
+        health_scale = 1 + health_step * number  # Вычисляет множитель здоровья и награды.
+        speed_scale = min(1 + speed_step * number, max_speed_scale)  # Вычисляет множитель скорости.
+        remaining = base_count + count_step * number  # Вычисляет количество врагов в волне.
+        runs = []  # Инициализирует серии волны.
+        for type_name in rng.sample(type_names, rng.randint(1, 3)):  # Выбирает от одного до трех типов врагов.
+            count = remaining if len(runs) == 2 else rng.randint(1, remaining)  # Выбирает размер серии.
+            base = ENEMY_TYPES[type_name]  # Получает исходный тип врага.
+            runs.append((base._replace(speed=base.speed * speed_scale, health=int(base.health * health_scale),
+                                       reward=int(base.reward * health_scale)), count))  # Добавляет серию усиленных врагов.
+            remaining -= count  # Уменьшает количество оставшихся врагов.
+            if remaining == 0:  # Проверяет, распределены ли все враги.
+                break  # Заканчивает волну.
+        if remaining:  # Проверяет, остались ли нераспределенные враги.
+            enemy_type, count = runs[-1]  # Получает последнюю серию.
+            runs[-1] = (enemy_type, count + remaining)  # Добавляет оставшихся врагов в последнюю серию.
+        number += 1  # Переходит к следующей волне.
+        yield runs  # Выдает волну.
+
+
+class WaveSource:  # Определяет класс WaveSource, который выдает волны по требованию.
+    """
+    Класс WaveSource выдает волны из конечного или бесконечного итератора по одной.
+
+    Хранится только следующая волна, поэтому память не растет с количеством пройденных волн.
+
+    Атрибуты:
+        iterator (iterator): Итератор волн.
+        total (int): Общее количество волн (None - волны не заканчиваются или их количество неизвестно).
+        upcoming (list): Следующая волна (None - волн больше нет).
+    """
+
+    def __init__(self, waves, total=None):  # Конструктор класса WaveSource.
+        """
+        Инициализация объекта WaveSource.
+
+        Args:
+            waves (iterable): Волны: списки серий (тип врага, количество).
+            total (int): Общее количество волн (None - неизвестно или бесконечно).
+        """
+        self.iterator = iter(waves)  # Сохраняет итератор волн.
+        self.total = total  # Сохраняет общее количество волн.
+        self.upcoming = next(self.iterator, None)  # Получает первую волну.
+
+    def has_next(self):  # Метод для проверки наличия следующей волны.
+        """
+        Проверяет, есть ли еще волны.
+
+        Returns:
+            bool: True, если есть следующая волна.
+        """
+        return self.upcoming is not None  # Возвращает True, если следующая волна есть.
+
+    def next_wave(self):  # Метод для получения следующей волны.
+        """
+        Выдает следующую волну.
+
+        Returns:
+            list: Серии волны (тип врага, количество) или None, если волн больше нет.
+        """
+        wave = self.upcoming  # Получает следующую волну.
+        if wave is not None:  # Проверяет, есть ли волна.
+            self.upcoming = next(self.iterator, None)  # Получает волну после нее.
+        return wave  # Возвращает волну.
+
+
+def create_wave_source(mode='campaign', seed=None):  # Функция для создания источника волн.
+    """
+    Создает источник волн по режиму из настроек.
+
+    Args:
+        mode (str): Режим волн: 'campaign' - десять волн кампании, 'endless' - бесконечные процедурные волны.
+        seed (int): Начальное значение генератора бесконечных волн.
+
+    Returns:
+        WaveSource: Источник волн.
+    """
+    if mode == 'endless':  # Проверяет, выбран ли бесконечный режим.
+        return WaveSource(endless_waves(seed))  # Создает бесконечный источник волн.
+    return WaveSource(campaign_waves(), len(CAMPAIGN_WAVES))  # Создает источник волн кампании.